@@ -0,0 +1,198 @@
+"""
+An asyncio front-end for the inventory operations.
+
+Coroutines submit their requests to a queue. A single writer task drains the queue and applies the
+waiting requests in micro-batches, so all mutations run in one place in arrival order, and many
+concurrent requests are served per wake-up of the writer.
+"""
+import asyncio
+
+from inventory_manager import add_item, remove_item, update_item_price
+
+# Put on the queue by close() to stop the writer task
+_CLOSE = object()
+
+
+class AsyncInventory:
+    """
+    Awaitable versions of the inventory operations.
+
+    >>> async def demo():
+    ...     async with AsyncInventory() as inventory:
+    ...         await inventory.add_item("apple", 10, 0.5)
+    ...         await inventory.remove_item("apple", 4)
+    ...         return await inventory.search_item("apple")
+    >>> asyncio.run(demo())
+    {'quantity': 6, 'price': 0.5}
+    """
+
+    def __init__(self, inventory=None, max_batch=1024):
+        """
+        Wrap an inventory.
+
+        :param inventory: The inventory dictionary (or InventoryStore or IndexedInventory) to manage;
+                          a new dictionary is used if omitted.
+        :param max_batch: The most requests the writer applies before yielding to the event loop (integer).
+        """
+        self.inventory = {} if inventory is None else inventory
+        self.max_batch = max_batch
+        self._queue = None
+        self._writer = None
+        self._closed = False
+
+    def _start(self):
+        """
+        Start the writer task on the running event loop.
+
+        :return: None
+        """
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _submit(self, operation, *args):
+        """
+        Queue a request for the writer and wait for its result.
+
+        :param operation: The inventory function to call.
+        :param args: The arguments after the inventory.
+        :return: The result of the operation.
+        :raises RuntimeError: If the inventory has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("The inventory is closed.")
+        if self._writer is None:
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, args, future))
+        return await future
+
+    async def _drain(self):
+        """
+        Apply queued requests in micro-batches until the inventory is closed.
+
+        Every request queued before close() is applied, even those behind the close marker in the
+        same batch, so no caller is left waiting.
+
+        :return: None
+        """
+        queue = self._queue
+        closing = False
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            for request in batch:
+                if request is _CLOSE:
+                    closing = True
+                    continue
+                operation, args, future = request
+                # A request whose caller gave up is not applied
+                if not future.cancelled():
+                    _apply(future, operation, self.inventory, args)
+            if closing and queue.empty():
+                return
+            if not queue.empty():
+                # queue.get() only suspends on an empty queue, so yield to the other tasks here
+                await asyncio.sleep(0)
+
+    async def add_item(self, item_name, quantity, price):
+        """
+        Add an item, or increase its quantity and update its price.
+
+        :param item_name: The name of the item to add (string).
+        :param quantity: The number of items to add (integer).
+        :param price: The price of the item (float).
+        :return: None
+        """
+        return await self._submit(add_item, item_name, quantity, price)
+
+    async def remove_item(self, item_name, quantity):
+        """
+        Remove a quantity of an item, deleting it when none is left.
+
+        :param item_name: The name of the item to remove (string).
+        :param quantity: The number of items to remove (integer).
+        :return: None
+        :raises ValueError: If there is not enough quantity to remove.
+        :raises KeyError: If the item does not exist.
+        """
+        return await self._submit(remove_item, item_name, quantity)
+
+    async def update_item_price(self, item_name, new_price):
+        """
+        Update the price of an existing item.
+
+        :param item_name: The name of the item (string).
+        :param new_price: The new price of the item (float).
+        :return: None
+        :raises KeyError: If the item does not exist.
+        """
+        return await self._submit(update_item_price, item_name, new_price)
+
+    async def search_item(self, item_name):
+        """
+        Look up an item once every request queued before it has been applied.
+
+        :param item_name: The name of the item (string).
+        :return: A copy of the item's details, {'quantity': int, 'price': float}.
+        :raises KeyError: If the item does not exist.
+        """
+        return await self._submit(_copy_item, item_name)
+
+    async def close(self):
+        """
+        Apply every queued request, then stop the writer task.
+
+        Requests submitted after close() is called raise RuntimeError.
+
+        :return: None
+        """
+        if not self._closed:
+            self._closed = True
+            if self._writer is not None:
+                self._queue.put_nowait(_CLOSE)
+        if self._writer is not None:
+            await self._writer
+            self._writer = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def _apply(future, operation, inventory, args):
+    """
+    Run one request and pass its result or error to the waiting caller.
+
+    The error is caught here rather than in the writer task, so its traceback does not include the
+    writer's frame; a caller clearing that traceback would otherwise close the writer coroutine.
+
+    :param future: The future the caller is waiting on.
+    :param operation: The inventory function to call.
+    :param inventory: The inventory to apply it to.
+    :param args: The arguments after the inventory.
+    :return: None
+    """
+    try:
+        result = operation(inventory, *args)
+    except Exception as error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _copy_item(inventory, item_name):
+    """
+    Copy an item's details without printing them.
+
+    :param inventory: The inventory that stores all items.
+    :param item_name: The name of the item (string).
+    :return: The item's details, {'quantity': int, 'price': float}.
+    :raises KeyError: If the item does not exist.
+    """
+    if item_name not in inventory:
+        raise KeyError(f"{item_name} does not exist in the inventory.")
+    details = inventory[item_name]
+    return {'quantity': details['quantity'], 'price': details['price']}
@@ -0,0 +1,375 @@
+"""
+Benchmarks for the inventory system.
+
+Run a single benchmark by name, for example:
+
+    python benchmark_inventory.py memory 1000000 10000000
+"""
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from inventory_manager import (
+    BufferedSink, IndexedInventory, InventoryStore, add_item, apply_batch, print_sink, remove_item,
+    render_inventory, set_event_sink, update_item_price
+)
+from async_inventory import AsyncInventory
+from concurrent_inventory import ConcurrentInventory
+from inventory_persistence import InventoryJournal, load_inventory
+
+
+def item_names(count):
+    """
+    Generate distinct item names.
+
+    :param count: The number of names to generate (integer).
+    :return: A list of item name strings.
+    """
+    return [f"sku{index:08d}" for index in range(count)]
+
+
+def measure_memory(build, names):
+    """
+    Measure how many bytes an inventory built from the given names occupies.
+
+    :param build: A callable that takes the list of names and returns an inventory.
+    :param names: The list of item names to store.
+    :return: The number of bytes still allocated after the build, excluding the names themselves.
+    """
+    tracemalloc.start()
+    inventory = build(names)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventory
+    return size
+
+
+def build_dict(names):
+    """ Build a plain nested-dictionary inventory. """
+    inventory = {}
+    for index, name in enumerate(names):
+        inventory[name] = {'quantity': index, 'price': index * 0.01}
+    return inventory
+
+
+def build_store(names):
+    """ Build a columnar InventoryStore. """
+    inventory = InventoryStore()
+    for index, name in enumerate(names):
+        inventory[name] = {'quantity': index, 'price': index * 0.01}
+    return inventory
+
+
+def benchmark_memory(sizes):
+    """
+    Compare the memory used by the dictionary and the InventoryStore.
+
+    :param sizes: A list of item counts to measure.
+    :return: None
+    """
+    print(f"{'items':>12} {'dict (MB)':>12} {'store (MB)':>12} {'bytes/item':>18}")
+    for count in sizes:
+        names = item_names(count)
+        dict_bytes = measure_memory(build_dict, names)
+        store_bytes = measure_memory(build_store, names)
+        per_item = f"{dict_bytes / count:.0f} -> {store_bytes / count:.0f}"
+        print(f"{count:>12,} {dict_bytes / 2 ** 20:>12.1f} {store_bytes / 2 ** 20:>12.1f} {per_item:>18}")
+
+
+def scan_ops(count, item_count=10_000, seed=0):
+    """
+    Generate a burst of warehouse scan operations that is valid for a fresh inventory.
+
+    :param count: The number of operations to generate (integer).
+    :param item_count: The number of distinct items the operations touch (integer).
+    :param seed: The random seed (integer).
+    :return: A list of (op, item_name, quantity, price) tuples.
+    """
+    rng = random.Random(seed)
+    names = item_names(item_count)
+    stock = dict.fromkeys(names, 0)
+    ops = []
+    for _ in range(count):
+        name = rng.choice(names)
+        if stock[name] and rng.random() < 0.5:
+            quantity = rng.randint(1, stock[name])
+            stock[name] -= quantity
+            ops.append(('remove', name, quantity, None))
+        else:
+            quantity = rng.randint(1, 20)
+            stock[name] += quantity
+            ops.append(('add', name, quantity, 1.25))
+    return ops
+
+
+def run_single_ops(ops):
+    """
+    Apply operations one call at a time to a fresh inventory.
+
+    :param ops: A list of (op, item_name, quantity, price) tuples.
+    :return: The elapsed time in seconds.
+    """
+    inventory = {}
+    start = time.perf_counter()
+    for op, name, quantity, price in ops:
+        if op == 'add':
+            add_item(inventory, name, quantity, price)
+        else:
+            remove_item(inventory, name, quantity)
+    return time.perf_counter() - start
+
+
+def benchmark_batch(sizes):
+    """
+    Compare applying scan operations one call at a time with apply_batch.
+
+    Both sides run with the same event sink: first with none, then with print_sink writing to
+    devnull, so the speedup measures the batch path and not how the events are reported.
+
+    :param sizes: A list of batch sizes to measure.
+    :return: None
+    """
+    print(f"{'ops':>10} {'sink':>6} {'per-item ops/s':>16} {'batch ops/s':>14} {'speedup':>8}")
+    for count in sizes:
+        ops = scan_ops(count)
+        for label, sink in [('none', None), ('print', print_sink)]:
+            previous_sink = set_event_sink(sink)
+            try:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    single = run_single_ops(ops)
+                    start = time.perf_counter()
+                    apply_batch({}, ops)
+                    batch = time.perf_counter() - start
+            finally:
+                set_event_sink(previous_sink)
+            print(f"{count:>10,} {label:>6} {count / single:>16,.0f} {count / batch:>14,.0f} {single / batch:>7.1f}x")
+
+
+def benchmark_events(sizes):
+    """
+    Compare operation throughput with no sink, a buffered sink and a printing sink.
+
+    :param sizes: A list of operation counts to measure.
+    :return: None
+    """
+    print(f"{'ops':>10} {'no sink ops/s':>15} {'buffered ops/s':>16} {'print ops/s':>13}")
+    for count in sizes:
+        ops = scan_ops(count)
+        with open(os.devnull, 'w') as devnull:
+            previous_sink = set_event_sink(None)
+            silent = run_single_ops(ops)
+
+            with BufferedSink(devnull, capacity=10_000) as sink:
+                set_event_sink(sink)
+                buffered = run_single_ops(ops)
+
+            set_event_sink(print_sink)
+            with contextlib.redirect_stdout(devnull):
+                printed = run_single_ops(ops)
+            set_event_sink(previous_sink)
+        print(f"{count:>10,} {count / silent:>15,.0f} {count / buffered:>16,.0f} {count / printed:>13,.0f}")
+
+
+def benchmark_recovery(sizes, tail=100_000):
+    """
+    Measure how long load_inventory takes to recover a snapshot plus a redo log tail.
+
+    :param sizes: A list of item counts to measure.
+    :param tail: The number of operations journalled after the snapshot (integer).
+    :return: None
+    """
+    print(f"{'items':>12} {'tail ops':>10} {'snapshot (s)':>13} {'recovery (s)':>13}")
+    for count in sizes:
+        inventory = build_dict(item_names(count))
+        with tempfile.TemporaryDirectory() as path:
+            with InventoryJournal(path, inventory, snapshot_every=None) as journal:
+                start = time.perf_counter()
+                journal.snapshot()
+                snapshot = time.perf_counter() - start
+
+                previous_sink = set_event_sink(journal)
+                apply_batch(inventory, scan_ops(tail))
+                set_event_sink(previous_sink)
+
+            start = time.perf_counter()
+            recovered = load_inventory(path)
+            recovery = time.perf_counter() - start
+        assert len(recovered) == len(inventory)
+        print(f"{count:>12,} {tail:>10,} {snapshot:>13.2f} {recovery:>13.2f}")
+
+
+def benchmark_stripes(stripe_counts, threads_count=8, ops_per_thread=50_000, shared_items=64):
+    """
+    Measure ConcurrentInventory throughput as the number of lock stripes grows.
+
+    Half of each thread's operations hit a small set of shared items, the other half its own items.
+
+    :param stripe_counts: A list of stripe counts to measure.
+    :param threads_count: The number of worker threads (integer).
+    :param ops_per_thread: The number of add/remove pairs each thread performs (integer).
+    :param shared_items: The number of items every thread touches (integer).
+    :return: None
+    """
+    shared = [f"shared{index:04d}" for index in range(shared_items)]
+    print(f"{'stripes':>8} {'threads':>8} {'ops/s':>14}")
+    for stripes in stripe_counts:
+        inventory = ConcurrentInventory(stripes=stripes)
+        for name in shared:
+            inventory.add_item(name, 1_000_000, 1.0)
+        barrier = threading.Barrier(threads_count + 1)
+
+        def work(worker):
+            private = [f"worker{worker:02d}-{index:04d}" for index in range(shared_items)]
+            barrier.wait()
+            for index in range(ops_per_thread):
+                name = shared[index % shared_items] if index % 2 else private[index % shared_items]
+                inventory.add_item(name, 2, 1.0)
+                inventory.remove_item(name, 1)
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print(f"{stripes:>8} {threads_count:>8} {2 * threads_count * ops_per_thread / elapsed:>14,.0f}")
+
+
+def benchmark_render(sizes):
+    """
+    Compare printing the inventory one line at a time with the paged, buffered renderer.
+
+    :param sizes: A list of item counts to measure.
+    :return: None
+    """
+    print(f"{'items':>12} {'print per line (s)':>19} {'render (s)':>11} {'render sorted (s)':>18}")
+    for count in sizes:
+        inventory = build_dict(item_names(count))
+        with open(os.devnull, 'w') as devnull:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                for item_name, details in inventory.items():
+                    print(f"{item_name}: Quantity: {details['quantity']}, Price: ${details['price']:.2f}")
+            printed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            render_inventory(inventory, devnull)
+            rendered = time.perf_counter() - start
+
+            start = time.perf_counter()
+            render_inventory(inventory, devnull, sort='price')
+            rendered_sorted = time.perf_counter() - start
+        print(f"{count:>12,} {printed:>19.2f} {rendered:>11.2f} {rendered_sorted:>18.2f}")
+
+
+async def run_async_clients(clients, requests_per_client, item_count=1_000):
+    """
+    Drive an AsyncInventory with many concurrent in-process clients.
+
+    :param clients: The number of concurrent clients (integer).
+    :param requests_per_client: The number of add/remove requests each client makes (integer).
+    :param item_count: The number of distinct items the clients touch (integer).
+    :return: A tuple of (sorted request latencies in seconds, elapsed seconds).
+    """
+    names = item_names(item_count)
+    latencies = []
+    async with AsyncInventory() as inventory:
+        for name in names:
+            await inventory.add_item(name, 1_000_000, 1.0)
+
+        async def client(number):
+            for request in range(requests_per_client):
+                name = names[(number + request) % item_count]
+                start = time.perf_counter()
+                if request % 2:
+                    await inventory.remove_item(name, 1)
+                else:
+                    await inventory.add_item(name, 1, 1.0)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(number) for number in range(clients)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return latencies, elapsed
+
+
+def benchmark_async(client_counts, requests_per_client=20):
+    """
+    Report AsyncInventory latency percentiles and throughput under many concurrent clients.
+
+    :param client_counts: A list of concurrent client counts to measure.
+    :param requests_per_client: The number of requests each client makes (integer).
+    :return: None
+    """
+    print(f"{'clients':>8} {'requests':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'requests/s':>12}")
+    for clients in client_counts:
+        latencies, elapsed = asyncio.run(run_async_clients(clients, requests_per_client))
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"{clients:>8,} {len(latencies):>10,} {p50:>9.2f} {p99:>9.2f} {len(latencies) / elapsed:>12,.0f}")
+
+
+def benchmark_indexed(sizes, ops=100_000):
+    """
+    Compare the build time and per-operation cost of a plain dictionary and an IndexedInventory.
+
+    :param sizes: A list of item counts to measure.
+    :param ops: The number of each kind of operation timed (integer).
+    :return: None
+    """
+    print(f"{'items':>12} {'inventory':>10} {'build (s)':>10} {'add (us)':>9} {'remove (us)':>12} "
+          f"{'reprice (us)':>13}")
+    for count in sizes:
+        names = item_names(count)
+        plain = build_dict(names)
+        rng = random.Random(0)
+        touched = [rng.choice(names) for _ in range(ops)]
+        for label, build in (('dict', dict), ('indexed', IndexedInventory)):
+            start = time.perf_counter()
+            inventory = build(plain)
+            built = time.perf_counter() - start
+            timings = []
+            for operation in (lambda name: add_item(inventory, name, 5, 2.5),
+                              lambda name: remove_item(inventory, name, 1),
+                              lambda name: update_item_price(inventory, name, 1.75)):
+                start = time.perf_counter()
+                for name in touched:
+                    operation(name)
+                timings.append((time.perf_counter() - start) / ops * 1e6)
+            print(f"{count:>12,} {label:>10} {built:>10.2f} {timings[0]:>9.2f} {timings[1]:>12.2f} "
+                  f"{timings[2]:>13.2f}")
+
+
+BENCHMARKS = {
+    'memory': (benchmark_memory, [1_000_000, 10_000_000]),
+    'batch': (benchmark_batch, [50_000, 500_000]),
+    'indexed': (benchmark_indexed, [100_000, 1_000_000, 4_000_000]),
+    'events': (benchmark_events, [100_000, 1_000_000]),
+    'recovery': (benchmark_recovery, [5_000_000]),
+    'stripes': (benchmark_stripes, [1, 4, 16, 64]),
+    'render': (benchmark_render, [1_000_000]),
+    'async': (benchmark_async, [10_000]),
+}
+
+
+def main():
+    """ Drive the program. """
+    names = sys.argv[1:2] or list(BENCHMARKS)
+    for name in names:
+        benchmark, sizes = BENCHMARKS[name]
+        sizes = [int(size) for size in sys.argv[2:]] or sizes
+        print(f"\n== {name} ==")
+        benchmark(sizes)
+
+
+if __name__ == "__main__":
+    main()
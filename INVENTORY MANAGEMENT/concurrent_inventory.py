@@ -0,0 +1,128 @@
+"""
+A thread-safe inventory with striped locking.
+
+Item names are hashed onto N stripes. Each stripe owns its own shard of the inventory and its own
+lock, so operations on items in different stripes never wait for each other. Every operation holds
+its stripe's lock from the quantity check to the write, which closes the check-then-act race
+in a bare remove_item call.
+"""
+import threading
+
+from inventory_manager import add_item, remove_item, update_item_price
+
+
+class ConcurrentInventory:
+    """
+    An inventory that can be shared by many threads.
+
+    >>> inventory = ConcurrentInventory(stripes=4)
+    >>> inventory.add_item("apple", 10, 0.5)
+    >>> inventory.remove_item("apple", 3)
+    >>> inventory.search_item("apple")
+    {'quantity': 7, 'price': 0.5}
+    """
+
+    def __init__(self, stripes=16, shard_factory=dict):
+        """
+        Create an empty inventory.
+
+        :param stripes: The number of lock stripes (integer, at least 1).
+        :param shard_factory: A callable returning an empty inventory for each stripe
+                              (dict or InventoryStore).
+        :raises ValueError: If stripes is less than 1.
+        """
+        if stripes < 1:
+            raise ValueError("There must be at least one lock stripe.")
+        self._shards = [shard_factory() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    @property
+    def stripes(self):
+        """ The number of lock stripes. """
+        return len(self._locks)
+
+    def _stripe(self, item_name):
+        """
+        Find the stripe that owns an item.
+
+        :param item_name: The name of the item (string).
+        :return: The stripe index (integer).
+        """
+        return hash(item_name) % len(self._locks)
+
+    def add_item(self, item_name, quantity, price):
+        """
+        Add an item, or increase its quantity and update its price.
+
+        :param item_name: The name of the item to add (string).
+        :param quantity: The number of items to add (integer).
+        :param price: The price of the item (float).
+        :return: None
+        """
+        stripe = self._stripe(item_name)
+        with self._locks[stripe]:
+            add_item(self._shards[stripe], item_name, quantity, price)
+
+    def remove_item(self, item_name, quantity):
+        """
+        Remove a quantity of an item, deleting it when none is left.
+
+        :param item_name: The name of the item to remove (string).
+        :param quantity: The number of items to remove (integer).
+        :return: None
+        :raises ValueError: If there is not enough quantity to remove.
+        :raises KeyError: If the item does not exist.
+        """
+        stripe = self._stripe(item_name)
+        with self._locks[stripe]:
+            remove_item(self._shards[stripe], item_name, quantity)
+
+    def update_item_price(self, item_name, new_price):
+        """
+        Update the price of an existing item.
+
+        :param item_name: The name of the item (string).
+        :param new_price: The new price of the item (float).
+        :return: None
+        :raises KeyError: If the item does not exist.
+        """
+        stripe = self._stripe(item_name)
+        with self._locks[stripe]:
+            update_item_price(self._shards[stripe], item_name, new_price)
+
+    def search_item(self, item_name):
+        """
+        Look up an item.
+
+        :param item_name: The name of the item (string).
+        :return: A copy of the item's details, {'quantity': int, 'price': float}.
+        :raises KeyError: If the item does not exist.
+        """
+        stripe = self._stripe(item_name)
+        with self._locks[stripe]:
+            shard = self._shards[stripe]
+            if item_name not in shard:
+                raise KeyError(f"{item_name} does not exist in the inventory.")
+            details = shard[item_name]
+            return {'quantity': details['quantity'], 'price': details['price']}
+
+    def snapshot(self):
+        """
+        Copy the whole inventory while holding every stripe lock.
+
+        :return: An inventory dictionary, {item_name: {'quantity': int, 'price': float}}.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            return {item_name: {'quantity': shard[item_name]['quantity'], 'price': shard[item_name]['price']}
+                    for shard in self._shards for item_name in shard}
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, item_name):
+        return item_name in self._shards[self._stripe(item_name)]
@@ -1,8 +1,486 @@
+import logging
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from itertools import chain
+from operator import itemgetter
+
+
+# The message written for each inventory event. Sinks only format it when they need the text.
+EVENT_MESSAGES = {
+    'item_added': "Added new item: {item_name} - Quantity: {quantity}, Price: {price:.2f}",
+    'item_updated': "Updated {item_name}: Quantity: {quantity}, Price: {price:.2f}",
+    'item_removed': "Removed {removed} of {item_name}. Remaining: {quantity}",
+    'item_out_of_stock': "{item_name} is now out of stock and removed from inventory.",
+    'price_updated': "Updated price of {item_name} to {price:.2f}",
+}
+
+# The callable that receives inventory events; None means events are dropped
+_event_sink = None
+
+
+def set_event_sink(sink):
+    """
+    Install the callable that receives inventory events.
+
+    The sink is called as sink(event, fields), where event is a key of EVENT_MESSAGES and fields is
+    a dictionary of the values in its message. By default no sink is installed and the inventory
+    functions do no logging work at all.
+
+    :param sink: A callable taking (event, fields), or None to silence events.
+    :return: The previously installed sink, so it can be restored later.
+    """
+    global _event_sink
+    previous = _event_sink
+    _event_sink = sink
+    return previous
+
+
+def format_event(event, fields):
+    """
+    Render an inventory event as the line the demo prints.
+
+    :param event: The event name (string).
+    :param fields: The dictionary of event values.
+    :return: The formatted message (string).
+
+    >>> format_event('price_updated', {'item_name': 'apple', 'price': 0.5})
+    'Updated price of apple to 0.50'
+    """
+    return EVENT_MESSAGES[event].format(**fields)
+
+
+def print_sink(event, fields):
+    """
+    A sink that prints every event to standard output, one line at a time.
+
+    :param event: The event name (string).
+    :param fields: The dictionary of event values.
+    :return: None
+    """
+    print(format_event(event, fields))
+
+
+def logging_sink(logger=None, level=logging.INFO):
+    """
+    Create a sink that forwards events to the logging module.
+
+    The message is only formatted when the logger is enabled for the level. The event name and
+    fields are attached to each record as the 'event' and 'fields' attributes.
+
+    :param logger: The logging.Logger to write to (defaults to this module's logger).
+    :param level: The logging level of the records (integer).
+    :return: A sink callable.
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    def sink(event, fields):
+        if logger.isEnabledFor(level):
+            logger.log(level, format_event(event, fields), extra={'event': event, 'fields': fields})
+
+    return sink
+
+
+class BufferedSink:
+    """
+    A sink that collects events and writes them to a stream in bulk.
+
+    Events are stored unformatted and rendered in one pass when the buffer holds `capacity` events,
+    when flush() is called, or when the sink is used as a context manager and exits.
+    """
+
+    def __init__(self, stream=None, capacity=1000):
+        """
+        Create a buffered sink.
+
+        :param stream: The text stream to write to (defaults to sys.stdout at flush time).
+        :param capacity: The number of events to hold before flushing automatically (integer).
+        """
+        self.stream = stream
+        self.capacity = capacity
+        self._events = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event, fields):
+        with self._lock:
+            self._events.append((event, fields))
+            if len(self._events) < self.capacity:
+                return
+            events, self._events = self._events, []
+        self._write(events)
+
+    def flush(self):
+        """
+        Write every buffered event to the stream.
+
+        :return: None
+        """
+        with self._lock:
+            events, self._events = self._events, []
+        self._write(events)
+
+    def _write(self, events):
+        if not events:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(''.join(EVENT_MESSAGES[event].format(**fields) + '\n' for event, fields in events))
+        stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+class _ItemView:
+    """
+    A live, dict-like view of a single item stored in an InventoryStore.
+
+    Reading or assigning 'quantity' and 'price' goes straight to the store's columns, so the
+    inventory functions can treat it exactly like the nested {'quantity': ..., 'price': ...} dict.
+    """
+    __slots__ = ('_store', '_name')
+
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+
+    def __getitem__(self, key):
+        store = self._store
+        row = store._index[self._name]
+        if key == 'quantity':
+            return store._quantities[row]
+        if key == 'price':
+            return store._prices[row]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        store = self._store
+        row = store._index[self._name]
+        if key == 'quantity':
+            store._quantities[row] = value
+        elif key == 'price':
+            store._prices[row] = value
+        else:
+            raise KeyError(key)
+
+    def keys(self):
+        return ('quantity', 'price')
+
+    def to_dict(self):
+        """
+        Copy the item's details into a plain dictionary.
+
+        :return: A dictionary of the form {'quantity': int, 'price': float}.
+        """
+        return {'quantity': self['quantity'], 'price': self['price']}
+
+    def __eq__(self, other):
+        if isinstance(other, _ItemView):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class InventoryStore(MutableMapping):
+    """
+    A columnar, memory-compact inventory.
+
+    Item names map to a row number, and each row's quantity and price live in typed arrays
+    ('q' for quantities, 'd' for prices) instead of one nested dictionary per item. The store
+    behaves like the inventory dictionary, so add_item, remove_item, update_item_price,
+    search_item and view_inventory accept either one.
+
+    >>> store = InventoryStore()
+    >>> store["apple"] = {'quantity': 10, 'price': 0.5}
+    >>> store["apple"]['quantity'] += 5
+    >>> store["apple"]
+    {'quantity': 15, 'price': 0.5}
+    """
+
+    def __init__(self, items=None):
+        """
+        Create a store, optionally filled from an existing inventory dictionary.
+
+        :param items: An optional mapping of {item_name: {'quantity': int, 'price': float}}.
+        """
+        self._index = {}
+        self._names = []
+        self._quantities = array('q')
+        self._prices = array('d')
+        if items:
+            self.update(items)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __contains__(self, item_name):
+        return item_name in self._index
+
+    def __getitem__(self, item_name):
+        if item_name not in self._index:
+            raise KeyError(item_name)
+        return _ItemView(self, item_name)
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details['quantity'], details['price']
+        row = self._index.get(item_name)
+        if row is None:
+            # Fill the typed columns first, which reject values of the wrong type, and only then
+            # publish the row, so a rejected item leaves the store unchanged
+            self._quantities.append(quantity)
+            try:
+                self._prices.append(price)
+            except TypeError:
+                self._quantities.pop()
+                raise
+            self._index[item_name] = len(self._names)
+            self._names.append(item_name)
+        else:
+            old_quantity = self._quantities[row]
+            self._quantities[row] = quantity
+            try:
+                self._prices[row] = price
+            except TypeError:
+                self._quantities[row] = old_quantity
+                raise
+
+    def __delitem__(self, item_name):
+        row = self._index.pop(item_name)
+        # Move the last row into the freed slot so the columns stay dense
+        last_name = self._names.pop()
+        last_quantity = self._quantities.pop()
+        last_price = self._prices.pop()
+        if last_name != item_name:
+            self._names[row] = last_name
+            self._quantities[row] = last_quantity
+            self._prices[row] = last_price
+            self._index[last_name] = row
+
+
+class SortedIndex:
+    """
+    A sorted list of (key, item_name) entries, split into buckets of bounded size.
+
+    An entry is added or removed by finding its bucket with a binary search over the buckets'
+    largest entries and then inserting or deleting inside that bucket, so an update moves at most
+    2 * bucket_size entries instead of the whole list. A bucket that grows past 2 * bucket_size
+    is split in two, and an empty bucket is dropped.
+
+    >>> index = SortedIndex([(5, 'pear'), (1, 'kiwi')], bucket_size=1)
+    >>> index.add((3, 'apple'))
+    >>> index.remove((5, 'pear'))
+    >>> list(index), index.irange(2, 3)
+    ([(1, 'kiwi'), (3, 'apple')], [(3, 'apple')])
+    """
+
+    def __init__(self, entries=(), bucket_size=1000):
+        """
+        Create an index, sorting the entries once.
+
+        :param entries: The initial (key, item_name) entries, in any order.
+        :param bucket_size: The number of entries each bucket starts with (integer, at least 1).
+        """
+        entries = sorted(entries)
+        self._bucket_size = bucket_size
+        self._buckets = [entries[start:start + bucket_size] for start in range(0, len(entries), bucket_size)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(entries)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._buckets)
+
+    def __repr__(self):
+        return f"SortedIndex({list(self)!r})"
+
+    def add(self, entry):
+        """
+        Insert an entry in its sorted position.
+
+        :param entry: The (key, item_name) entry.
+        :return: None
+        """
+        buckets, maxes = self._buckets, self._maxes
+        self._len += 1
+        if not buckets:
+            buckets.append([entry])
+            maxes.append(entry)
+            return
+        position = bisect_left(maxes, entry)
+        if position == len(maxes):
+            # The entry is the largest so far and goes at the end of the last bucket
+            position -= 1
+            buckets[position].append(entry)
+            maxes[position] = entry
+        else:
+            insort(buckets[position], entry)
+        bucket = buckets[position]
+        if len(bucket) > 2 * self._bucket_size:
+            half = bucket[self._bucket_size:]
+            del bucket[self._bucket_size:]
+            buckets.insert(position + 1, half)
+            maxes.insert(position, bucket[-1])
+
+    def remove(self, entry):
+        """
+        Delete an entry.
+
+        :param entry: The (key, item_name) entry.
+        :return: None
+        :raises ValueError: If the entry is not in the index.
+        """
+        buckets, maxes = self._buckets, self._maxes
+        position = bisect_left(maxes, entry)
+        if position < len(maxes):
+            bucket = buckets[position]
+            offset = bisect_left(bucket, entry)
+            if bucket[offset] == entry:
+                del bucket[offset]
+                self._len -= 1
+                if not bucket:
+                    del buckets[position]
+                    del maxes[position]
+                elif offset == len(bucket):
+                    maxes[position] = bucket[-1]
+                return
+        raise ValueError(f"{entry!r} is not in the index.")
+
+    def irange(self, low=None, high=None, include_high=True):
+        """
+        Find the entries whose key lies between two bounds, in O(log n + k).
+
+        :param low: The lowest key to include, or None for no lower bound.
+        :param high: The highest key, or None for no upper bound.
+        :param include_high: Whether entries whose key equals high are included.
+        :return: A list of the matching entries, in order.
+        """
+        key = itemgetter(0)
+        buckets = self._buckets
+        position = 0 if low is None else bisect_left(self._maxes, low, key=key)
+        found = []
+        for position in range(position, len(buckets)):
+            bucket = buckets[position]
+            start = 0 if low is None else bisect_left(bucket, low, key=key)
+            if high is None:
+                end = len(bucket)
+            elif include_high:
+                end = bisect_right(bucket, high, key=key)
+            else:
+                end = bisect_left(bucket, high, key=key)
+            found.extend(bucket[start:end])
+            if end < len(bucket):
+                break
+            # Later buckets are only entered while low is satisfied from their first entry
+            low = None
+        return found
+
+
+class IndexedInventory(dict):
+    """
+    An inventory dictionary that keeps sorted secondary indexes on quantity and price.
+
+    quantity_index holds (quantity, item_name) entries and price_index holds (price, item_name) entries,
+    each in a SortedIndex. Building the inventory sorts each index once, and every later change to
+    an item costs O(log n + bucket_size) per index. Adding or deleting an item updates them, and the
+    inventory functions call reindex() after changing an item's details in place. Bulk dict methods
+    such as update() or pop() bypass the indexes, so change items through the inventory functions or
+    item assignment.
+
+    >>> stock = IndexedInventory()
+    >>> add_item(stock, "apple", 3, 0.5)
+    >>> add_item(stock, "banana", 30, 0.25)
+    >>> items_below_quantity(stock, 5)
+    [('apple', 3)]
+    """
+
+    def __init__(self, items=None):
+        """
+        Create an indexed inventory, optionally filled from an existing inventory dictionary.
+
+        :param items: An optional mapping of {item_name: {'quantity': int, 'price': float}}.
+        """
+        super().__init__()
+        # The (quantity, price) each item currently has in the indexes
+        self._indexed = {}
+        if items:
+            for item_name, details in items.items():
+                quantity, price = details['quantity'], details['price']
+                dict.__setitem__(self, item_name, {'quantity': quantity, 'price': price})
+                self._indexed[item_name] = (quantity, price)
+        # Each index is sorted once here instead of growing by one insertion per item
+        self.quantity_index = SortedIndex((quantity, item_name)
+                                          for item_name, (quantity, _) in self._indexed.items())
+        self.price_index = SortedIndex((price, item_name) for item_name, (_, price) in self._indexed.items())
+
+    def __setitem__(self, item_name, details):
+        super().__setitem__(item_name, details)
+        self.reindex(item_name)
+
+    def __delitem__(self, item_name):
+        super().__delitem__(item_name)
+        self.reindex(item_name)
+
+    def reindex(self, item_name):
+        """
+        Bring the index entries of one item up to date with its details.
+
+        :param item_name: The name of the item that was added, changed or deleted (string).
+        :return: None
+        """
+        old = self._indexed.pop(item_name, None)
+        if item_name in self:
+            details = dict.__getitem__(self, item_name)
+            new = (details['quantity'], details['price'])
+        else:
+            new = None
+        if old is not None and new is not None:
+            # Leave an index alone when its key did not change, such as the price index after a removal
+            if old[0] != new[0]:
+                self.quantity_index.remove((old[0], item_name))
+                self.quantity_index.add((new[0], item_name))
+            if old[1] != new[1]:
+                self.price_index.remove((old[1], item_name))
+                self.price_index.add((new[1], item_name))
+        elif old is not None:
+            self.quantity_index.remove((old[0], item_name))
+            self.price_index.remove((old[1], item_name))
+        elif new is not None:
+            self.quantity_index.add((new[0], item_name))
+            self.price_index.add((new[1], item_name))
+        if new is not None:
+            self._indexed[item_name] = new
+
+
+def _reindex(inventory, item_name):
+    """
+    Tell an indexed inventory that an item's details were changed in place.
+
+    :param inventory: The inventory that was changed.
+    :param item_name: The name of the changed item (string).
+    :return: None
+    """
+    reindex = getattr(inventory, 'reindex', None)
+    if reindex is not None:
+        reindex(item_name)
+
+
 def add_item(inventory, item_name, quantity, price):
     """
     Add a new item to the inventory or update the quantity and price of an existing item.
 
-    :param inventory: The inventory dictionary that stores all items.
+    :param inventory: The inventory dictionary (or InventoryStore) that stores all items.
                        Structure: {item_name: {'quantity': int, 'price': float}}
     :param item_name: The name of the item to add (string).
     :param quantity: The number of items to add (integer).
@@ -12,36 +490,46 @@ def add_item(inventory, item_name, quantity, price):
     # Check if the item already exists in the inventory
     if item_name in inventory:
         # If the item exists, increase its quantity and update the price
-        inventory[item_name]['quantity'] += quantity
-        inventory[item_name]['price'] = price
-        print(f"Updated {item_name}: Quantity: {inventory[item_name]['quantity']}, Price: {price:.2f}")
+        details = inventory[item_name]
+        details['quantity'] += quantity
+        details['price'] = price
+        _reindex(inventory, item_name)
+        if _event_sink is not None:
+            _event_sink('item_updated', {'item_name': item_name, 'quantity': details['quantity'], 'price': price})
     else:
         # If the item does not exist, add it as a new entry in the inventory
         inventory[item_name] = {'quantity': quantity, 'price': price}
-        print(f"Added new item: {item_name} - Quantity: {quantity}, Price: {price:.2f}")
+        if _event_sink is not None:
+            _event_sink('item_added', {'item_name': item_name, 'quantity': quantity, 'price': price})
 
 
 def remove_item(inventory, item_name, quantity):
     """
     Remove a specified quantity of an item from the inventory.
 
-    :param inventory: The inventory dictionary that stores all items.
+    :param inventory: The inventory dictionary (or InventoryStore) that stores all items.
     :param item_name: The name of the item to remove (string).
     :param quantity: The number of items to remove (integer).
     :return: None
     """
     # Check if the item exists in the inventory
     if item_name in inventory:
+        details = inventory[item_name]
         # Check if there is enough quantity to remove
-        if inventory[item_name]['quantity'] >= quantity:
+        if details['quantity'] >= quantity:
             # Reduce the quantity of the item
-            inventory[item_name]['quantity'] -= quantity
-            print(f"Removed {quantity} of {item_name}. Remaining: {inventory[item_name]['quantity']}")
+            details['quantity'] -= quantity
+            if _event_sink is not None:
+                _event_sink('item_removed',
+                            {'item_name': item_name, 'removed': quantity, 'quantity': details['quantity']})
 
             # If the quantity becomes 0, remove the item completely from the inventory
-            if inventory[item_name]['quantity'] == 0:
+            if details['quantity'] == 0:
                 del inventory[item_name]
-                print(f"{item_name} is now out of stock and removed from inventory.")
+                if _event_sink is not None:
+                    _event_sink('item_out_of_stock', {'item_name': item_name})
+            else:
+                _reindex(inventory, item_name)
         else:
             # If there is not enough quantity to remove, show an error message
             # CHANGED: Raise ValueError instead of printing
@@ -56,7 +544,7 @@ def update_item_price(inventory, item_name, new_price):
     """
     Update the price of an existing item in the inventory.
 
-    :param inventory: The inventory dictionary that stores all items.
+    :param inventory: The inventory dictionary (or InventoryStore) that stores all items.
     :param item_name: The name of the item whose price needs to be updated (string).
     :param new_price: The new price of the item (float).
     :return: None
@@ -65,36 +553,251 @@ def update_item_price(inventory, item_name, new_price):
     if item_name in inventory:
         # Update the price of the item
         inventory[item_name]['price'] = new_price
-        print(f"Updated price of {item_name} to {new_price:.2f}")
+        _reindex(inventory, item_name)
+        if _event_sink is not None:
+            _event_sink('price_updated', {'item_name': item_name, 'price': new_price})
     else:
         # If the item does not exist, show an error message
         # CHANGED: Raise KeyError instead of printing
         raise KeyError(f"{item_name} does not exist in the inventory.")
 
 
+def apply_batch(inventory, ops):
+    """
+    Apply a batch of inventory operations atomically.
+
+    Every operation is validated against the inventory (and the operations before it in the batch)
+    before anything is changed, so either the whole batch is applied or the inventory is left
+    untouched. Each item is then written once with its final quantity and price. If an event sink
+    is installed, it receives the same events as the individual calls once the batch is applied.
+
+    :param inventory: The inventory dictionary (or InventoryStore) that stores all items.
+    :param ops: An iterable of (op, item_name, quantity, price) tuples, where op is one of
+                'add', 'remove' or 'update_price'. The quantity is ignored for 'update_price'
+                and the price is ignored for 'remove'.
+    :return: The number of operations applied (integer).
+    :raises ValueError: If an operation is unknown or removes more than the available quantity.
+    :raises KeyError: If an item that is removed or repriced does not exist.
+
+    >>> stock = {'apple': {'quantity': 5, 'price': 0.5}}
+    >>> apply_batch(stock, [('add', 'apple', 5, 0.6), ('remove', 'apple', 10, None)])
+    2
+    >>> stock
+    {}
+    """
+    ops = list(ops)
+    events = [] if _event_sink is not None else None
+
+    # Step 1: Validate the whole batch against a staged copy of every item it touches
+    # staged maps item_name -> [quantity, price], or None once the item has been removed, and
+    # original keeps the details each existing item had before the batch
+    staged = {}
+    original = {}
+    deleted = set()
+    for op, item_name, quantity, price in ops:
+        if item_name in staged:
+            state = staged[item_name]
+        elif item_name in inventory:
+            details = inventory[item_name]
+            state = staged[item_name] = [details['quantity'], details['price']]
+            original[item_name] = (state[0], state[1])
+        else:
+            state = None
+
+        if op == 'add':
+            if state is None:
+                # Re-insert so new items keep the order in which they were added
+                staged.pop(item_name, None)
+                state = staged[item_name] = [quantity, price]
+                event = 'item_added'
+            else:
+                state[0] += quantity
+                state[1] = price
+                event = 'item_updated'
+            if events is not None:
+                events.append((event, {'item_name': item_name, 'quantity': state[0], 'price': price}))
+        elif op == 'remove':
+            if state is None:
+                raise KeyError(f"{item_name} does not exist in the inventory.")
+            if state[0] < quantity:
+                raise ValueError(f"Not enough quantity to remove for {item_name}.")
+            state[0] -= quantity
+            if events is not None:
+                events.append(('item_removed', {'item_name': item_name, 'removed': quantity, 'quantity': state[0]}))
+            if state[0] == 0:
+                staged[item_name] = None
+                deleted.add(item_name)
+                if events is not None:
+                    events.append(('item_out_of_stock', {'item_name': item_name}))
+        elif op == 'update_price':
+            if state is None:
+                raise KeyError(f"{item_name} does not exist in the inventory.")
+            state[1] = price
+            if events is not None:
+                events.append(('price_updated', {'item_name': item_name, 'price': price}))
+        else:
+            raise ValueError(f"Unknown operation: {op}")
+
+    # Step 2: Apply the final state of every touched item. A typed inventory such as an
+    # InventoryStore can still reject a value here, so on failure every touched item is put back
+    try:
+        for item_name in deleted:
+            if item_name in inventory:
+                del inventory[item_name]
+        for item_name, state in staged.items():
+            if state is None:
+                continue
+            if item_name in inventory:
+                details = inventory[item_name]
+                details['quantity'] = state[0]
+                details['price'] = state[1]
+                _reindex(inventory, item_name)
+            else:
+                inventory[item_name] = {'quantity': state[0], 'price': state[1]}
+    except Exception:
+        for item_name in staged:
+            if item_name in original:
+                quantity, price = original[item_name]
+                inventory[item_name] = {'quantity': quantity, 'price': price}
+            elif item_name in inventory:
+                del inventory[item_name]
+        raise
+
+    # Step 3: Report the events of the applied batch
+    if events:
+        sink = _event_sink
+        for event, fields in events:
+            sink(event, fields)
+
+    return len(ops)
+
+
+def items_below_quantity(inventory, threshold):
+    """
+    Find the items whose quantity is below a reorder threshold.
+
+    An IndexedInventory answers from its quantity index in O(log n + k); any other inventory is
+    scanned and sorted.
+
+    :param inventory: The inventory dictionary (or IndexedInventory or InventoryStore).
+    :param threshold: The reorder threshold (integer).
+    :return: A list of (item_name, quantity) tuples, lowest quantity first.
+    """
+    index = getattr(inventory, 'quantity_index', None)
+    if index is None:
+        index = SortedIndex((inventory[item_name]['quantity'], item_name) for item_name in inventory)
+    return [(item_name, quantity) for quantity, item_name in index.irange(high=threshold, include_high=False)]
+
+
+def items_in_price_range(inventory, low, high):
+    """
+    Find the items whose price lies between two bounds, inclusive.
+
+    An IndexedInventory answers from its price index in O(log n + k); any other inventory is
+    scanned and sorted.
+
+    :param inventory: The inventory dictionary (or IndexedInventory or InventoryStore).
+    :param low: The lowest price to include (float).
+    :param high: The highest price to include (float).
+    :return: A list of (item_name, price) tuples, cheapest first.
+    """
+    index = getattr(inventory, 'price_index', None)
+    if index is None:
+        index = SortedIndex((inventory[item_name]['price'], item_name) for item_name in inventory)
+    return [(item_name, price) for price, item_name in index.irange(low, high)]
+
+
+def iter_inventory(inventory, sort=None, page_size=1000, prefix=None):
+    """
+    Iterate over the inventory one page at a time.
+
+    :param inventory: The inventory dictionary (or IndexedInventory or InventoryStore).
+    :param sort: None to keep the inventory's own order, or 'name', 'quantity' or 'price'.
+                 An IndexedInventory serves 'quantity' and 'price' from its indexes without sorting.
+    :param page_size: The number of items per page (integer, at least 1).
+    :param prefix: An optional name prefix; only items whose name starts with it are included.
+    :return: A generator of pages, each a list of (item_name, quantity, price) tuples.
+    :raises ValueError: If sort is not a supported order or page_size is less than 1.
+
+    >>> stock = {'pear': {'quantity': 4, 'price': 1.0}, 'apple': {'quantity': 9, 'price': 0.5}}
+    >>> list(iter_inventory(stock, sort='name', page_size=1))
+    [[('apple', 9, 0.5)], [('pear', 4, 1.0)]]
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1.")
+
+    # Step 1: Choose the matching item names, each checked against the prefix once, and their order
+    matching = inventory if prefix is None else (item_name for item_name in inventory if item_name.startswith(prefix))
+    if sort is None:
+        names = matching
+    elif sort == 'name':
+        names = sorted(matching)
+    elif sort in ('quantity', 'price'):
+        index = getattr(inventory, f'{sort}_index', None)
+        if index is None:
+            index = sorted((inventory[item_name][sort], item_name) for item_name in matching)
+        elif prefix is not None:
+            # The index holds every item, so it is narrowed to the matching names found above
+            matching = set(matching)
+            index = (entry for entry in index if entry[1] in matching)
+        names = (item_name for _, item_name in index)
+    else:
+        raise ValueError(f"Unknown sort order: {sort}")
+
+    # Step 2: Collect the items into pages
+    page = []
+    for item_name in names:
+        details = inventory[item_name]
+        page.append((item_name, details['quantity'], details['price']))
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def render_inventory(inventory, stream=None, sort=None, page_size=1000, prefix=None):
+    """
+    Write the inventory as a table, one buffered write per page, flushing each page as it is
+    written so only one page of text is held at a time.
+
+    :param inventory: The inventory dictionary (or IndexedInventory or InventoryStore).
+    :param stream: The text stream to write to (defaults to sys.stdout).
+    :param sort: The order of the items, as for iter_inventory.
+    :param page_size: The number of lines written at a time (integer).
+    :param prefix: An optional name prefix, as for iter_inventory.
+    :return: None
+    """
+    if stream is None:
+        stream = sys.stdout
+    if not inventory:
+        stream.write("The inventory is empty.\n")
+        return
+    stream.write("\n----- Current Inventory -----\n")
+    for page in iter_inventory(inventory, sort=sort, page_size=page_size, prefix=prefix):
+        stream.write(''.join(f"{item_name}: Quantity: {quantity}, Price: ${price:.2f}\n"
+                             for item_name, quantity, price in page))
+        stream.flush()
+    stream.write("-----------------------------\n")
+    stream.flush()
+
+
 def view_inventory(inventory):
     """
     Display the current inventory with item names, quantities, and prices.
 
-    :param inventory: The inventory dictionary that stores all items.
+    :param inventory: The inventory dictionary (or InventoryStore) that stores all items.
     :return: None
     """
-    # Check if the inventory is empty
-    if not inventory:
-        print("The inventory is empty.")
-    else:
-        # Display all items in the inventory
-        print("\n----- Current Inventory -----")
-        for item_name, details in inventory.items():
-            print(f"{item_name}: Quantity: {details['quantity']}, Price: ${details['price']:.2f}")
-        print("-----------------------------")
+    # Write the whole table through one buffered writer instead of one print per item
+    render_inventory(inventory)
 
 
 def search_item(inventory, item_name):
     """
     Search for an item in the inventory and display its details.
 
-    :param inventory: The inventory dictionary that stores all items.
+    :param inventory: The inventory dictionary (or InventoryStore) that stores all items.
     :param item_name: The name of the item to search for (string).
     :return: None
     """
@@ -116,6 +819,18 @@ def main():
     Main function to demonstrate the inventory system.
     Initializes the inventory and performs various operations.
     """
+    # Print every inventory event, as the demo has always done
+    previous_sink = set_event_sink(print_sink)
+    try:
+        run_demo()
+    finally:
+        set_event_sink(previous_sink)
+
+
+def run_demo():
+    """
+    Run the demonstration steps against a fresh inventory.
+    """
     # Step 1: Initialize an empty dictionary to represent the inventory
     inventory = {}
 
@@ -0,0 +1,290 @@
+"""
+Append-only redo log and snapshot persistence for the inventory.
+
+An InventoryJournal is an event sink: once installed with set_event_sink, every change made by
+add_item, remove_item, update_item_price and apply_batch is appended to a binary redo log. The
+records are written after the change is made in memory, so the log is not write-ahead: a crash
+can lose the change being made, but never records one that was not made. Every `snapshot_every`
+records the whole inventory is written to a compact snapshot and the log is emptied, so
+load_inventory only has to read the snapshot and replay the short log tail.
+
+Each log record holds the item's state *after* the change, so replaying a record more than once
+is harmless. That is what makes a crash between writing a snapshot and emptying the log safe.
+"""
+import mmap
+import os
+import struct
+
+SNAPSHOT_FILE = 'snapshot.bin'
+# The redo log keeps the file name it was first given, so existing journals still load
+WAL_FILE = 'wal.bin'
+
+# Snapshot layout: header, then one (name length, quantity, price) entry followed by the name
+SNAPSHOT_MAGIC = b'INVSNAP1'
+_SNAPSHOT_HEADER = struct.Struct('<8sQ')
+_SNAPSHOT_ENTRY = struct.Struct('<Iqd')
+
+# Log layout: each record is a payload length followed by the payload.
+# The payload starts with the record type and its values, and ends with the item name.
+_RECORD_LENGTH = struct.Struct('<I')
+_PUT = struct.Struct('<Bqd')
+_QUANTITY = struct.Struct('<Bq')
+_PRICE = struct.Struct('<Bd')
+_DELETE = struct.Struct('<B')
+PUT, QUANTITY, PRICE, DELETE = 1, 2, 3, 4
+
+
+def _encode_record(event, fields):
+    """
+    Encode an inventory event as a length-prefixed log record.
+
+    :param event: The event name (string).
+    :param fields: The dictionary of event values.
+    :return: The record (bytes).
+    """
+    name = fields['item_name'].encode('utf-8')
+    if event == 'item_added' or event == 'item_updated':
+        payload = _PUT.pack(PUT, fields['quantity'], fields['price']) + name
+    elif event == 'item_removed':
+        payload = _QUANTITY.pack(QUANTITY, fields['quantity']) + name
+    elif event == 'price_updated':
+        payload = _PRICE.pack(PRICE, fields['price']) + name
+    elif event == 'item_out_of_stock':
+        payload = _DELETE.pack(DELETE) + name
+    else:
+        raise ValueError(f"Unknown inventory event: {event}")
+    return _RECORD_LENGTH.pack(len(payload)) + payload
+
+
+def _iter_records(buffer):
+    """
+    Decode the complete records of a log.
+
+    A record cut short by a crash ends the log; everything before it is returned.
+
+    :param buffer: The log contents (a bytes-like object).
+    :return: A generator of (record_type, item_name, quantity, price, end_offset) tuples.
+    """
+    offset = 0
+    size = len(buffer)
+    while offset + _RECORD_LENGTH.size <= size:
+        (length,) = _RECORD_LENGTH.unpack_from(buffer, offset)
+        start = offset + _RECORD_LENGTH.size
+        end = start + length
+        if length == 0 or end > size:
+            return
+        record_type = buffer[start]
+        quantity = price = None
+        if record_type == PUT:
+            _, quantity, price = _PUT.unpack_from(buffer, start)
+            name_start = start + _PUT.size
+        elif record_type == QUANTITY:
+            _, quantity = _QUANTITY.unpack_from(buffer, start)
+            name_start = start + _QUANTITY.size
+        elif record_type == PRICE:
+            _, price = _PRICE.unpack_from(buffer, start)
+            name_start = start + _PRICE.size
+        elif record_type == DELETE:
+            name_start = start + _DELETE.size
+        else:
+            return
+        if name_start > end:
+            return
+        yield record_type, bytes(buffer[name_start:end]).decode('utf-8'), quantity, price, end
+        offset = end
+
+
+def _valid_log_length(path):
+    """
+    Find how many leading bytes of a log hold complete records.
+
+    :param path: The path of the log file.
+    :return: The length in bytes of the valid part of the log (integer).
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as file:
+        data = file.read()
+    end = 0
+    for *_, end in _iter_records(data):
+        pass
+    return end
+
+
+def write_snapshot(inventory, path):
+    """
+    Write the whole inventory to a snapshot file.
+
+    The snapshot is written to a temporary file and then renamed over `path`, so a reader never
+    sees a partly written snapshot. Items with a quantity of 0 are left out: remove_item only
+    leaves one in the inventory between recording the removal and deleting the item, so a snapshot
+    taken at that moment saves the inventory as it is once the removal is complete.
+
+    :param inventory: The inventory dictionary (or InventoryStore) to save.
+    :param path: The path of the snapshot file.
+    :return: None
+    """
+    temporary_path = path + '.tmp'
+    pack_entry = _SNAPSHOT_ENTRY.pack
+    count = 0
+    with open(temporary_path, 'wb') as file:
+        # The header is written again once the number of entries is known
+        file.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0))
+        for item_name in inventory:
+            details = inventory[item_name]
+            if details['quantity'] == 0:
+                continue
+            name = item_name.encode('utf-8')
+            file.write(pack_entry(len(name), details['quantity'], details['price']))
+            file.write(name)
+            count += 1
+        file.seek(0)
+        file.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, count))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def read_snapshot(path, inventory):
+    """
+    Load a snapshot file into an inventory by memory-mapping it.
+
+    :param path: The path of the snapshot file.
+    :param inventory: The inventory dictionary (or InventoryStore) to fill.
+    :return: None
+    :raises ValueError: If the file is not an inventory snapshot.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, count = _SNAPSHOT_HEADER.unpack_from(buffer, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not an inventory snapshot.")
+            unpack_entry = _SNAPSHOT_ENTRY.unpack_from
+            entry_size = _SNAPSHOT_ENTRY.size
+            offset = _SNAPSHOT_HEADER.size
+            for _ in range(count):
+                name_length, quantity, price = unpack_entry(buffer, offset)
+                offset += entry_size
+                item_name = buffer[offset:offset + name_length].decode('utf-8')
+                offset += name_length
+                inventory[item_name] = {'quantity': quantity, 'price': price}
+
+
+def replay_log(path, inventory):
+    """
+    Apply the records of a redo log to an inventory.
+
+    :param path: The path of the log file.
+    :param inventory: The inventory dictionary (or InventoryStore or IndexedInventory) to update.
+    :return: The number of records replayed (integer).
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as file:
+        data = file.read()
+    replayed = 0
+    # Items are always written by assignment, never changed in place, so an IndexedInventory
+    # keeps its indexes current
+    for record_type, item_name, quantity, price, _ in _iter_records(data):
+        replayed += 1
+        if record_type == PUT:
+            inventory[item_name] = {'quantity': quantity, 'price': price}
+        elif record_type == DELETE:
+            if item_name in inventory:
+                del inventory[item_name]
+        elif item_name in inventory:
+            # A change to a missing item is only seen when replaying a log the snapshot already
+            # covers, and a later record in the same log brings the item back to its final state
+            details = inventory[item_name]
+            if record_type == QUANTITY:
+                inventory[item_name] = {'quantity': quantity, 'price': details['price']}
+            else:
+                inventory[item_name] = {'quantity': details['quantity'], 'price': price}
+    return replayed
+
+
+def load_inventory(path, inventory=None):
+    """
+    Rebuild an inventory from its latest snapshot and the redo log written after it.
+
+    :param path: The directory holding the snapshot and log files.
+    :param inventory: An optional empty inventory (for example an InventoryStore) to fill.
+    :return: The recovered inventory (a dictionary unless `inventory` was given).
+    """
+    if inventory is None:
+        inventory = {}
+    snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        read_snapshot(snapshot_path, inventory)
+    replay_log(os.path.join(path, WAL_FILE), inventory)
+    return inventory
+
+
+class InventoryJournal:
+    """
+    An event sink that persists inventory changes to an append-only redo log with periodic snapshots.
+
+    Install it with set_event_sink(journal). It records the events of every inventory call made while
+    it is installed, so it should be used with a single inventory per process.
+    """
+
+    def __init__(self, path, inventory, snapshot_every=100_000, sync=False):
+        """
+        Open (or create) the journal directory for an inventory.
+
+        :param path: The directory for the snapshot and log files (created if missing).
+        :param inventory: The inventory whose changes are recorded; it is saved by each snapshot.
+        :param snapshot_every: The number of log records after which a snapshot is written (integer),
+                               or None to only snapshot when snapshot() is called.
+        :param sync: Whether to fsync the log after every record, so records survive power loss
+                     and not just a process crash (boolean).
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.inventory = inventory
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        self._snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+        self._log_path = os.path.join(path, WAL_FILE)
+
+        # Drop a record cut short by a crash before appending after it
+        valid_length = _valid_log_length(self._log_path)
+        self._log = open(self._log_path, 'ab')
+        self._log.truncate(valid_length)
+        self._records = 0
+
+    def __call__(self, event, fields):
+        self._log.write(_encode_record(event, fields))
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+        self._records += 1
+        if self.snapshot_every is not None and self._records >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        Write a snapshot of the inventory and empty the log.
+
+        :return: None
+        """
+        write_snapshot(self.inventory, self._snapshot_path)
+        self._log.truncate(0)
+        self._log.flush()
+        self._records = 0
+
+    def close(self):
+        """
+        Close the log file.
+
+        :return: None
+        """
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
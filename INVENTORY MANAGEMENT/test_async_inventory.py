@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+from async_inventory import AsyncInventory
+
+
+class TestAsyncInventory(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit test suite for the asyncio inventory front-end.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Set up a fresh inventory for each test.
+        """
+        self.inventory = AsyncInventory(max_batch=8)
+
+    async def asyncTearDown(self):
+        """
+        Stop the writer task.
+        """
+        await self.inventory.close()
+
+    async def test_operations(self):
+        """
+        Test the awaitable operations.
+        """
+        await self.inventory.add_item("apple", 10, 0.5)
+        await self.inventory.update_item_price("apple", 0.6)
+        await self.inventory.remove_item("apple", 4)
+        self.assertEqual(await self.inventory.search_item("apple"), {"quantity": 6, "price": 0.6})
+        self.assertEqual(self.inventory.inventory, {"apple": {"quantity": 6, "price": 0.6}})
+
+    async def test_errors_reach_the_caller(self):
+        """
+        Test that a failing request raises in its caller without stopping the writer.
+        """
+        await self.inventory.add_item("apple", 5, 0.5)
+        with self.assertRaises(ValueError):
+            await self.inventory.remove_item("apple", 10)
+        with self.assertRaises(KeyError):
+            await self.inventory.update_item_price("banana", 0.6)
+        with self.assertRaises(KeyError):
+            await self.inventory.search_item("banana")
+        await self.inventory.remove_item("apple", 5)
+        self.assertEqual(self.inventory.inventory, {})
+
+    async def test_concurrent_clients(self):
+        """
+        Test that many concurrent clients are all served exactly once.
+        """
+        await self.inventory.add_item("apple", 500, 0.5)
+
+        async def client():
+            try:
+                await self.inventory.remove_item("apple", 1)
+                return True
+            except (ValueError, KeyError):
+                return False
+
+        results = await asyncio.gather(*(client() for _ in range(600)))
+        self.assertEqual(sum(results), 500)
+        self.assertNotIn("apple", self.inventory.inventory)
+
+    async def test_close_serves_queued_requests(self):
+        """
+        Test that requests queued before close() are applied and later ones are rejected.
+        """
+        await self.inventory.add_item("apple", 1, 0.5)
+        # Queue more requests than one batch holds, then close before the writer has run
+        pending = [asyncio.ensure_future(self.inventory.add_item("apple", 1, 0.5)) for _ in range(20)]
+        await asyncio.sleep(0)
+        closing = asyncio.ensure_future(self.inventory.close())
+        await asyncio.sleep(0)
+        with self.assertRaises(RuntimeError):
+            await self.inventory.add_item("apple", 1, 0.5)
+        await asyncio.wait_for(asyncio.gather(closing, *pending), timeout=5)
+        self.assertEqual(self.inventory.inventory, {"apple": {"quantity": 21, "price": 0.5}})
+        with self.assertRaises(RuntimeError):
+            await self.inventory.search_item("apple")
+        await self.inventory.close()
+
+    async def test_writer_yields_between_batches(self):
+        """
+        Test that other tasks run between full batches instead of after the whole queue.
+        """
+        await self.inventory.add_item("apple", 1, 0.5)
+        seen = []
+
+        async def other():
+            seen.append(len(self.inventory.inventory))
+
+        requests = [asyncio.ensure_future(self.inventory.add_item(f"item{number}", 1, 1.0)) for number in range(32)]
+        await asyncio.sleep(0)
+        observer = asyncio.ensure_future(other())
+        await asyncio.gather(observer, *requests)
+        self.assertLess(seen[0], 33)
+
+
+if __name__ == "__main__":
+    # Run all the unit tests
+    unittest.main()
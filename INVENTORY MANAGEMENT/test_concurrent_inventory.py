@@ -0,0 +1,101 @@
+import threading
+import unittest
+from inventory_manager import InventoryStore
+from concurrent_inventory import ConcurrentInventory
+
+
+class TestConcurrentInventory(unittest.TestCase):
+    """
+    Unit test suite for the striped-lock inventory.
+    """
+
+    def setUp(self):
+        """
+        Set up a fresh inventory for each test.
+        """
+        self.inventory = ConcurrentInventory(stripes=4)
+
+    def test_operations(self):
+        """
+        Test the single-threaded behaviour matches the inventory functions.
+        """
+        self.inventory.add_item("apple", 10, 0.5)
+        self.inventory.add_item("apple", 5, 0.6)
+        self.inventory.update_item_price("apple", 0.7)
+        self.inventory.remove_item("apple", 3)
+        self.assertEqual(self.inventory.search_item("apple"), {"quantity": 12, "price": 0.7})
+        self.inventory.remove_item("apple", 12)
+        self.assertNotIn("apple", self.inventory)
+        self.assertEqual(len(self.inventory), 0)
+
+    def test_errors(self):
+        """
+        Test that missing items and overdrawn stock raise the usual errors.
+        """
+        self.inventory.add_item("apple", 5, 0.5)
+        with self.assertRaises(ValueError):
+            self.inventory.remove_item("apple", 10)
+        with self.assertRaises(KeyError):
+            self.inventory.remove_item("banana", 1)
+        with self.assertRaises(KeyError):
+            self.inventory.update_item_price("banana", 0.6)
+        with self.assertRaises(KeyError):
+            self.inventory.search_item("banana")
+        with self.assertRaises(ValueError):
+            ConcurrentInventory(stripes=0)
+
+    def test_store_shards(self):
+        """
+        Test using InventoryStore shards.
+        """
+        inventory = ConcurrentInventory(stripes=2, shard_factory=InventoryStore)
+        inventory.add_item("apple", 10, 0.5)
+        inventory.add_item("banana", 20, 0.25)
+        self.assertEqual(inventory.snapshot(), {"apple": {"quantity": 10, "price": 0.5},
+                                                "banana": {"quantity": 20, "price": 0.25}})
+
+    def test_stress_exactly_once_accounting(self):
+        """
+        Test that many threads decrementing shared and private items never oversell or lose stock.
+        """
+        threads_count = 8
+        attempts = 2000
+        shared = ["shared-0", "shared-1", "shared-2"]
+        for name in shared:
+            self.inventory.add_item(name, 3000, 1.0)
+        for worker in range(threads_count):
+            self.inventory.add_item(f"private-{worker}", attempts, 1.0)
+
+        sold = [0] * threads_count
+        restocked = [0] * threads_count
+        barrier = threading.Barrier(threads_count)
+
+        def work(worker):
+            barrier.wait()
+            for attempt in range(attempts):
+                name = shared[attempt % len(shared)]
+                try:
+                    self.inventory.remove_item(name, 1)
+                    sold[worker] += 1
+                except (ValueError, KeyError):
+                    pass
+                if attempt % 10 == 0:
+                    self.inventory.add_item(name, 1, 1.0)
+                    restocked[worker] += 1
+                self.inventory.remove_item(f"private-{worker}", 1)
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        remaining = sum(self.inventory.search_item(name)["quantity"] for name in shared if name in self.inventory)
+        self.assertEqual(remaining + sum(sold), 3000 * len(shared) + sum(restocked))
+        for worker in range(threads_count):
+            self.assertNotIn(f"private-{worker}", self.inventory)
+
+
+if __name__ == "__main__":
+    # Run all the unit tests
+    unittest.main()
@@ -1,4 +1,7 @@
+import io
+import random
 import unittest
+from contextlib import redirect_stdout
 from inventory_manager import *
 
 class TestInventorySystem(unittest.TestCase):
@@ -108,6 +111,434 @@ class TestInventorySystem(unittest.TestCase):
         self.assertIn("apple", self.inventory)
         self.assertIn("banana", self.inventory)
 
+
+class TestInventoryStore(unittest.TestCase):
+    """
+    Unit test suite for running the inventory functions against an InventoryStore.
+    """
+
+    def setUp(self):
+        """
+        Set up a fresh, empty store for each test.
+        """
+        self.inventory = InventoryStore()
+
+    def test_add_and_search_item(self):
+        """
+        Test adding items to the store and reading them back.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        add_item(self.inventory, "apple", 5, 0.6)
+        result = search_item(self.inventory, "apple")
+        self.assertEqual(result["quantity"], 15)
+        self.assertEqual(result["price"], 0.6)
+        self.assertEqual(result, {"quantity": 15, "price": 0.6})
+
+    def test_remove_item_keeps_other_rows(self):
+        """
+        Test that removing a row does not disturb the remaining items.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        add_item(self.inventory, "banana", 20, 0.25)
+        add_item(self.inventory, "orange", 30, 0.8)
+        remove_item(self.inventory, "apple", 10)
+        self.assertNotIn("apple", self.inventory)
+        self.assertEqual(len(self.inventory), 2)
+        self.assertEqual(self.inventory["orange"], {"quantity": 30, "price": 0.8})
+        self.assertEqual(self.inventory["banana"], {"quantity": 20, "price": 0.25})
+
+    def test_update_item_price(self):
+        """
+        Test updating the price of an item in the store.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        update_item_price(self.inventory, "apple", 0.75)
+        self.assertEqual(self.inventory["apple"]["price"], 0.75)
+
+    def test_errors_match_dictionary(self):
+        """
+        Test that the store raises the same errors as the inventory dictionary.
+        """
+        add_item(self.inventory, "apple", 5, 0.5)
+        with self.assertRaises(ValueError):
+            remove_item(self.inventory, "apple", 10)
+        with self.assertRaises(KeyError):
+            remove_item(self.inventory, "banana", 1)
+        with self.assertRaises(KeyError):
+            update_item_price(self.inventory, "banana", 0.6)
+        with self.assertRaises(KeyError):
+            search_item(self.inventory, "banana")
+
+    def test_store_from_dictionary(self):
+        """
+        Test building a store from an existing inventory dictionary.
+        """
+        store = InventoryStore({"apple": {"quantity": 10, "price": 0.5}})
+        self.assertEqual(dict(store), {"apple": {"quantity": 10, "price": 0.5}})
+
+    def test_rejected_item_leaves_store_unchanged(self):
+        """
+        Test that a value the typed columns reject does not leave a partial row behind.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        with self.assertRaises(TypeError):
+            self.inventory["banana"] = {"quantity": 1.5, "price": 0.25}
+        with self.assertRaises(TypeError):
+            self.inventory["banana"] = {"quantity": 1, "price": "cheap"}
+        with self.assertRaises(TypeError):
+            self.inventory["apple"] = {"quantity": 3, "price": "cheap"}
+        self.assertEqual(dict(self.inventory), {"apple": {"quantity": 10, "price": 0.5}})
+        self.assertEqual(len(self.inventory), 1)
+
+class TestApplyBatch(unittest.TestCase):
+    """
+    Unit test suite for applying batches of inventory operations.
+    """
+
+    def setUp(self):
+        """
+        Set up an inventory with a few items for each test.
+        """
+        self.inventory = {
+            "apple": {"quantity": 10, "price": 0.5},
+            "banana": {"quantity": 20, "price": 0.25},
+        }
+
+    def test_apply_batch_matches_single_operations(self):
+        """
+        Test that a batch leaves the inventory in the same state as the individual calls.
+        """
+        ops = [
+            ("add", "orange", 5, 0.8),
+            ("remove", "apple", 4, None),
+            ("update_price", "banana", None, 0.3),
+            ("add", "apple", 2, 0.55),
+            ("remove", "orange", 5, None),
+            ("add", "orange", 1, 0.9),
+        ]
+        expected = {name: dict(details) for name, details in self.inventory.items()}
+        add_item(expected, "orange", 5, 0.8)
+        remove_item(expected, "apple", 4)
+        update_item_price(expected, "banana", 0.3)
+        add_item(expected, "apple", 2, 0.55)
+        remove_item(expected, "orange", 5)
+        add_item(expected, "orange", 1, 0.9)
+
+        self.assertEqual(apply_batch(self.inventory, ops), 6)
+        self.assertEqual(self.inventory, expected)
+        self.assertEqual(list(self.inventory), list(expected))
+
+    def test_apply_batch_removes_sold_out_items(self):
+        """
+        Test that an item whose quantity reaches zero is removed.
+        """
+        apply_batch(self.inventory, [("remove", "apple", 6, None), ("remove", "apple", 4, None)])
+        self.assertNotIn("apple", self.inventory)
+
+    def test_apply_batch_is_all_or_nothing(self):
+        """
+        Test that a failing operation leaves the inventory untouched.
+        """
+        ops = [("add", "apple", 5, 0.6), ("remove", "banana", 25, None)]
+        with self.assertRaises(ValueError):
+            apply_batch(self.inventory, ops)
+        self.assertEqual(self.inventory["apple"], {"quantity": 10, "price": 0.5})
+
+        ops = [("remove", "apple", 10, None), ("update_price", "apple", None, 0.6)]
+        with self.assertRaises(KeyError):
+            apply_batch(self.inventory, ops)
+        self.assertIn("apple", self.inventory)
+
+    def test_apply_batch_unknown_operation(self):
+        """
+        Test that an unknown operation raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            apply_batch(self.inventory, [("sell", "apple", 1, None)])
+
+    def test_apply_batch_on_store(self):
+        """
+        Test applying a batch to an InventoryStore.
+        """
+        store = InventoryStore(self.inventory)
+        apply_batch(store, [("add", "kiwi", 3, 1.0), ("remove", "apple", 10, None)])
+        self.assertEqual(dict(store), {"banana": {"quantity": 20, "price": 0.25},
+                                       "kiwi": {"quantity": 3, "price": 1.0}})
+
+    def test_apply_batch_on_store_rolls_back_rejected_values(self):
+        """
+        Test that a batch the store rejects while applying leaves the store untouched.
+        """
+        store = InventoryStore(self.inventory)
+        ops = [("remove", "apple", 10, None), ("add", "banana", 1, 0.3), ("add", "b", 1, 1.0),
+               ("add", "c", 1.5, 1.0)]
+        with self.assertRaises(TypeError):
+            apply_batch(store, ops)
+        self.assertEqual(dict(store), self.inventory)
+
+
+class TestEventSinks(unittest.TestCase):
+    """
+    Unit test suite for reporting inventory events.
+    """
+
+    def setUp(self):
+        """
+        Install a sink that records every event, and restore the previous sink afterwards.
+        """
+        self.events = []
+        previous = set_event_sink(lambda event, fields: self.events.append((event, fields)))
+        self.addCleanup(set_event_sink, previous)
+        self.inventory = {}
+
+    def test_silent_by_default(self):
+        """
+        Test that nothing is printed when no sink is installed.
+        """
+        set_event_sink(None)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            add_item(self.inventory, "apple", 10, 0.5)
+            remove_item(self.inventory, "apple", 10)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_events_are_reported(self):
+        """
+        Test that each operation reports a structured event.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        update_item_price(self.inventory, "apple", 0.6)
+        remove_item(self.inventory, "apple", 10)
+        self.assertEqual([event for event, _ in self.events],
+                         ["item_added", "price_updated", "item_removed", "item_out_of_stock"])
+        self.assertEqual(self.events[2][1], {"item_name": "apple", "removed": 10, "quantity": 0})
+
+    def test_apply_batch_reports_the_same_events(self):
+        """
+        Test that a batch reports the events of the equivalent individual calls.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        remove_item(self.inventory, "apple", 4)
+        update_item_price(self.inventory, "apple", 0.6)
+        single_events = self.events[:]
+        self.events.clear()
+
+        apply_batch({}, [("add", "apple", 10, 0.5), ("remove", "apple", 4, None),
+                         ("update_price", "apple", None, 0.6)])
+        self.assertEqual(self.events, single_events)
+
+    def test_buffered_sink_flushes_in_bulk(self):
+        """
+        Test that the buffered sink writes once it reaches its capacity, and on flush.
+        """
+        stream = io.StringIO()
+        sink = BufferedSink(stream, capacity=2)
+        set_event_sink(sink)
+        add_item(self.inventory, "apple", 10, 0.5)
+        self.assertEqual(stream.getvalue(), "")
+        add_item(self.inventory, "apple", 5, 0.5)
+        update_item_price(self.inventory, "apple", 0.6)
+        self.assertEqual(stream.getvalue(), "Added new item: apple - Quantity: 10, Price: 0.50\n"
+                                            "Updated apple: Quantity: 15, Price: 0.50\n")
+        sink.flush()
+        self.assertTrue(stream.getvalue().endswith("Updated price of apple to 0.60\n"))
+
+    def test_logging_sink(self):
+        """
+        Test forwarding events to the logging module.
+        """
+        set_event_sink(logging_sink())
+        with self.assertLogs("inventory_manager", level="INFO") as logs:
+            add_item(self.inventory, "apple", 10, 0.5)
+        self.assertEqual(logs.records[0].getMessage(), "Added new item: apple - Quantity: 10, Price: 0.50")
+        self.assertEqual(logs.records[0].event, "item_added")
+
+    def test_main_prints_demo_output(self):
+        """
+        Test that the demo still prints every event.
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main()
+        self.assertIn("Added new item: apple - Quantity: 50, Price: 0.50", output.getvalue())
+        self.assertIn("Removed 10 of apple. Remaining: 40", output.getvalue())
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+    """
+    Unit test suite for the low-stock and price-range queries.
+    """
+
+    def setUp(self):
+        """
+        Set up the same items in an indexed inventory and a plain dictionary.
+        """
+        self.indexed = IndexedInventory()
+        self.plain = {}
+        for inventory in (self.indexed, self.plain):
+            add_item(inventory, "apple", 10, 0.5)
+            add_item(inventory, "banana", 2, 0.25)
+            add_item(inventory, "orange", 5, 0.8)
+            add_item(inventory, "kiwi", 1, 1.2)
+
+    def assert_queries_match(self):
+        """
+        Check that the indexed answers match a full scan of the plain dictionary.
+        """
+        for threshold in (0, 1, 3, 6, 100):
+            self.assertEqual(items_below_quantity(self.indexed, threshold),
+                             items_below_quantity(self.plain, threshold))
+        for low, high in ((0, 10), (0.25, 0.5), (0.3, 0.79), (2, 3)):
+            self.assertEqual(items_in_price_range(self.indexed, low, high),
+                             items_in_price_range(self.plain, low, high))
+
+    def test_queries(self):
+        """
+        Test the query results on a freshly built inventory.
+        """
+        self.assertEqual(items_below_quantity(self.indexed, 5), [("kiwi", 1), ("banana", 2)])
+        self.assertEqual(items_in_price_range(self.indexed, 0.25, 0.8),
+                         [("banana", 0.25), ("apple", 0.5), ("orange", 0.8)])
+        self.assert_queries_match()
+
+    def test_indexes_follow_changes(self):
+        """
+        Test that the indexes stay current as items are changed and removed.
+        """
+        for inventory in (self.indexed, self.plain):
+            add_item(inventory, "banana", 10, 0.3)
+            remove_item(inventory, "apple", 8)
+            remove_item(inventory, "kiwi", 1)
+            update_item_price(inventory, "orange", 0.1)
+            apply_batch(inventory, [("add", "grape", 3, 2.5), ("remove", "orange", 4, None),
+                                    ("update_price", "banana", None, 0.9)])
+        self.assertEqual(self.indexed, self.plain)
+        self.assertEqual(len(self.indexed.quantity_index), len(self.plain))
+        self.assert_queries_match()
+
+    def test_indexed_from_dictionary(self):
+        """
+        Test building an indexed inventory from an existing dictionary.
+        """
+        indexed = IndexedInventory(self.plain)
+        self.assertEqual(items_below_quantity(indexed, 3), [("kiwi", 1), ("banana", 2)])
+        self.assertEqual(list(indexed.price_index), [(0.25, "banana"), (0.5, "apple"), (0.8, "orange"), (1.2, "kiwi")])
+
+    def test_sorted_index_matches_sorted_list(self):
+        """
+        Test that a SortedIndex with tiny buckets stays equal to a sorted list through random updates.
+        """
+        rng = random.Random(0)
+        entries = [(rng.randrange(20), f"item{number}") for number in range(30)]
+        index = SortedIndex(entries, bucket_size=2)
+        expected = sorted(entries)
+        for number in range(30, 500):
+            if expected and rng.random() < 0.5:
+                entry = expected.pop(rng.randrange(len(expected)))
+                index.remove(entry)
+            else:
+                entry = (rng.randrange(20), f"item{number}")
+                expected.append(entry)
+                expected.sort()
+                index.add(entry)
+            self.assertEqual(len(index), len(expected))
+            low, high = sorted((rng.randrange(-1, 21), rng.randrange(-1, 21)))
+            self.assertEqual(index.irange(low, high), [entry for entry in expected if low <= entry[0] <= high])
+            self.assertEqual(index.irange(high=high, include_high=False),
+                             [entry for entry in expected if entry[0] < high])
+        self.assertEqual(list(index), expected)
+        with self.assertRaises(ValueError):
+            index.remove((99, "missing"))
+
+
+class TestIterInventory(unittest.TestCase):
+    """
+    Unit test suite for paging through and rendering the inventory.
+    """
+
+    def setUp(self):
+        """
+        Set up an inventory with a few items for each test.
+        """
+        self.inventory = {}
+        add_item(self.inventory, "pear", 4, 1.0)
+        add_item(self.inventory, "apple", 9, 0.5)
+        add_item(self.inventory, "apricot", 2, 2.0)
+
+    def test_pages(self):
+        """
+        Test splitting the inventory into pages in its own order.
+        """
+        pages = list(iter_inventory(self.inventory, page_size=2))
+        self.assertEqual(pages, [[("pear", 4, 1.0), ("apple", 9, 0.5)], [("apricot", 2, 2.0)]])
+
+    def test_sort_orders(self):
+        """
+        Test sorting by name, quantity and price, including from an indexed inventory.
+        """
+        def names(inventory, sort):
+            return [row[0] for page in iter_inventory(inventory, sort=sort) for row in page]
+
+        for inventory in (self.inventory, IndexedInventory(self.inventory)):
+            self.assertEqual(names(inventory, "name"), ["apple", "apricot", "pear"])
+            self.assertEqual(names(inventory, "quantity"), ["apricot", "pear", "apple"])
+            self.assertEqual(names(inventory, "price"), ["apple", "pear", "apricot"])
+        with self.assertRaises(ValueError):
+            list(iter_inventory(self.inventory, sort="colour"))
+
+    def test_prefix_filter(self):
+        """
+        Test keeping only the items whose name starts with a prefix.
+        """
+        pages = list(iter_inventory(self.inventory, sort="name", prefix="ap"))
+        self.assertEqual(pages, [[("apple", 9, 0.5), ("apricot", 2, 2.0)]])
+        self.assertEqual(list(iter_inventory(self.inventory, prefix="x")), [])
+        for inventory in (self.inventory, IndexedInventory(self.inventory)):
+            pages = list(iter_inventory(inventory, sort="price", prefix="ap", page_size=1))
+            self.assertEqual(pages, [[("apple", 9, 0.5)], [("apricot", 2, 2.0)]])
+
+    def test_render_inventory(self):
+        """
+        Test that rendering writes the same table view_inventory has always printed.
+        """
+        stream = io.StringIO()
+        render_inventory(self.inventory, stream, page_size=2)
+        self.assertEqual(stream.getvalue(),
+                         "\n----- Current Inventory -----\n"
+                         "pear: Quantity: 4, Price: $1.00\n"
+                         "apple: Quantity: 9, Price: $0.50\n"
+                         "apricot: Quantity: 2, Price: $2.00\n"
+                         "-----------------------------\n")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            view_inventory(self.inventory)
+        self.assertEqual(output.getvalue(), stream.getvalue())
+
+    def test_render_flushes_each_page(self):
+        """
+        Test that every page is flushed as it is written instead of being held until the end.
+        """
+        class PageStream(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.flushed = []
+
+            def flush(self):
+                self.flushed.append(self.getvalue().count("Quantity"))
+
+        stream = PageStream()
+        render_inventory(self.inventory, stream, page_size=2)
+        self.assertEqual(stream.flushed, [2, 3, 3])
+
+    def test_render_empty_inventory(self):
+        """
+        Test rendering an empty inventory.
+        """
+        stream = io.StringIO()
+        render_inventory({}, stream)
+        self.assertEqual(stream.getvalue(), "The inventory is empty.\n")
+
+
 if __name__ == "__main__":
     # Run all the unit tests
     unittest.main()
\ No newline at end of file
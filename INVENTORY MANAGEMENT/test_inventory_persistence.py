@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from inventory_manager import (
+    IndexedInventory, InventoryStore, add_item, apply_batch, items_below_quantity, items_in_price_range,
+    remove_item, set_event_sink, update_item_price
+)
+from inventory_persistence import InventoryJournal, WAL_FILE, SNAPSHOT_FILE, load_inventory
+
+
+class TestInventoryPersistence(unittest.TestCase):
+    """
+    Unit test suite for the redo log and snapshots.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary journal directory and an inventory whose changes are journalled.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+        self.inventory = {}
+        self.journal = InventoryJournal(self.path, self.inventory, snapshot_every=None)
+        self.addCleanup(self.journal.close)
+        self.addCleanup(set_event_sink, set_event_sink(self.journal))
+
+    def make_changes(self):
+        """
+        Apply a mix of operations to the journalled inventory.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        add_item(self.inventory, "banana", 20, 0.25)
+        add_item(self.inventory, "orange", 5, 0.8)
+        remove_item(self.inventory, "apple", 4)
+        update_item_price(self.inventory, "banana", 0.3)
+        remove_item(self.inventory, "orange", 5)
+        apply_batch(self.inventory, [("add", "kiwi", 3, 1.0), ("remove", "banana", 5, None)])
+
+    def test_load_replays_log(self):
+        """
+        Test recovering an inventory from the log alone.
+        """
+        self.make_changes()
+        self.assertEqual(load_inventory(self.path), self.inventory)
+
+    def test_load_snapshot_and_log_tail(self):
+        """
+        Test recovering from a snapshot plus the records written after it.
+        """
+        self.make_changes()
+        self.journal.snapshot()
+        self.assertEqual(os.path.getsize(os.path.join(self.path, WAL_FILE)), 0)
+        add_item(self.inventory, "grape", 7, 2.0)
+        remove_item(self.inventory, "kiwi", 3)
+        self.assertEqual(load_inventory(self.path), self.inventory)
+
+    def test_periodic_snapshot(self):
+        """
+        Test that a snapshot is written after the configured number of records.
+        """
+        self.journal.snapshot_every = 3
+        add_item(self.inventory, "apple", 10, 0.5)
+        add_item(self.inventory, "banana", 20, 0.25)
+        self.assertFalse(os.path.exists(os.path.join(self.path, SNAPSHOT_FILE)))
+        add_item(self.inventory, "orange", 5, 0.8)
+        self.assertTrue(os.path.exists(os.path.join(self.path, SNAPSHOT_FILE)))
+        self.assertEqual(load_inventory(self.path), self.inventory)
+
+    def test_snapshot_during_removal_leaves_out_empty_item(self):
+        """
+        Test that a snapshot taken on the removal record of an item's last stock does not save the
+        item with a quantity of 0, even if the process dies before the item is deleted from the log.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        add_item(self.inventory, "banana", 20, 0.25)
+        self.journal.snapshot_every = 3
+        remove_item(self.inventory, "apple", 10)
+        # The snapshot was written on the removal record; drop the deletion record after it
+        with open(os.path.join(self.path, WAL_FILE), "r+b") as log:
+            log.truncate(0)
+        self.assertEqual(load_inventory(self.path), {"banana": {"quantity": 20, "price": 0.25}})
+
+    def test_torn_record_is_ignored(self):
+        """
+        Test that a record cut short by a crash is dropped and later records still replay.
+        """
+        add_item(self.inventory, "apple", 10, 0.5)
+        with open(os.path.join(self.path, WAL_FILE), "ab") as log:
+            log.write(b"\x20\x00\x00\x00\x01")
+        self.assertEqual(load_inventory(self.path), self.inventory)
+
+        self.journal.close()
+        self.journal = InventoryJournal(self.path, self.inventory, snapshot_every=None)
+        self.addCleanup(self.journal.close)
+        set_event_sink(self.journal)
+        add_item(self.inventory, "banana", 20, 0.25)
+        self.assertEqual(load_inventory(self.path), self.inventory)
+
+    def test_replaying_covered_log_is_harmless(self):
+        """
+        Test that replaying records the snapshot already covers gives the same inventory.
+        """
+        self.make_changes()
+        with open(os.path.join(self.path, WAL_FILE), "rb") as log:
+            records = log.read()
+        self.journal.snapshot()
+        with open(os.path.join(self.path, WAL_FILE), "wb") as log:
+            log.write(records)
+        self.assertEqual(load_inventory(self.path), self.inventory)
+
+    def test_load_into_store(self):
+        """
+        Test recovering into an InventoryStore.
+        """
+        self.make_changes()
+        self.journal.snapshot()
+        store = load_inventory(self.path, InventoryStore())
+        self.assertIsInstance(store, InventoryStore)
+        self.assertEqual(dict(store), self.inventory)
+
+    def test_load_into_indexed_inventory(self):
+        """
+        Test that recovering into an IndexedInventory keeps its indexes current.
+        """
+        add_item(self.inventory, "apple", 5, 0.5)
+        self.journal.snapshot()
+        remove_item(self.inventory, "apple", 4)
+        update_item_price(self.inventory, "apple", 0.9)
+        add_item(self.inventory, "kiwi", 2, 1.0)
+        recovered = load_inventory(self.path, IndexedInventory())
+        self.assertEqual(recovered, self.inventory)
+        self.assertEqual(list(recovered.quantity_index), [(1, "apple"), (2, "kiwi")])
+        self.assertEqual(items_below_quantity(recovered, 3), [("apple", 1), ("kiwi", 2)])
+        self.assertEqual(items_in_price_range(recovered, 0.8, 1.0), [("apple", 0.9), ("kiwi", 1.0)])
+
+
+if __name__ == "__main__":
+    # Run all the unit tests
+    unittest.main()
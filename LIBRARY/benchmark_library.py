@@ -0,0 +1,195 @@
+"""Benchmarks for the library analysis.
+
+Run a single benchmark by name, for example:
+
+    python benchmark_library.py fused 10000000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from library import (
+    Book,
+    LibraryStats,
+    YearIndex,
+    authors_with_multiple_books,
+    books_published_after,
+    calculate_average_page_count,
+    count_books_by_genre,
+    highest_rated_book_by_genre,
+    iter_books,
+    top_k_by_genre
+)
+from library_cache import compile_catalogue, open_catalogue
+from library_incremental import refresh_stats
+from library_parallel import parallel_library_stats
+
+GENRES = ['Fiction', 'Non-Fiction', 'Mystery', 'Science Fiction', 'Fantasy', 'Biography', 'History', 'Poetry']
+
+
+def synthetic_books(count, seed=0):
+    """Returns a list of randomly generated Books."""
+    rng = random.Random(seed)
+    authors = [f"Author{index} Surname{index % 997}" for index in range(max(count // 3, 1))]
+    return [Book(f"Title {index}", rng.choice(authors), rng.choice(GENRES), rng.randint(50, 1200),
+                 rng.randint(1800, 2024), rng.randint(10, 50) / 10)
+            for index in range(count)]
+
+
+def write_catalogue(file_name, count, seed=0):
+    """Writes a synthetic catalogue file with the given number of rows."""
+    with open(file_name, 'w') as file:
+        file.write('title,author,genre,pages,year,rating\n')
+        rows = []
+        for book in synthetic_books(count, seed):
+            rows.append(f"{book.title},{book.author},{book.genre},{book.pages},{book.year},{book.rating}\n")
+            if len(rows) == 100_000:
+                file.write(''.join(rows))
+                rows = []
+        file.write(''.join(rows))
+
+
+def timed(function, *args):
+    """Returns the result of calling function and the elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_fused(sizes):
+    """Compares the fused LibraryStats pass with the five separate analysis functions."""
+    print(f"{'rows':>12} {'five passes (s)':>16} {'fused pass (s)':>15}")
+    for count in sizes:
+        data = synthetic_books(count)
+        start = time.perf_counter()
+        calculate_average_page_count(data)
+        books_published_after(data, 1950)
+        count_books_by_genre(data)
+        highest_rated_book_by_genre(data)
+        authors_with_multiple_books(data)
+        separate = time.perf_counter() - start
+        _, fused = timed(lambda: LibraryStats(1950).update(data))
+        print(f"{count:>12,} {separate:>16.2f} {fused:>15.2f}")
+
+
+def benchmark_parallel(worker_counts, rows=2_000_000):
+    """Measures the parallel analysis of a catalogue file as the number of worker processes grows."""
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'books.txt')
+        write_catalogue(file_name, rows)
+        _, serial = timed(lambda: LibraryStats(1950).update(iter_books(file_name)))
+        print(f"{rows:,} rows, serial pass: {serial:.2f} s ({os.cpu_count()} CPUs available)")
+        print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8}")
+        for workers in worker_counts:
+            _, elapsed = timed(parallel_library_stats, file_name, 1950, workers)
+            print(f"{workers:>8} {elapsed:>9.2f} {serial / elapsed:>7.2f}x")
+
+
+def benchmark_years(sizes, queries=10_000, scanned_queries=20):
+    """Times dashboard-style year queries against a YearIndex and estimates the same queries as scans."""
+    print(f"{'rows':>12} {'build (s)':>10} {'indexed queries (s)':>20} {'scans, estimated (s)':>21}")
+    for count in sizes:
+        data = synthetic_books(count)
+        rng = random.Random(1)
+        cutoffs = [(rng.randint(2014, 2024), None) if rng.random() < 0.5 else (year, year + rng.randint(0, 4))
+                   for year in (rng.randint(1800, 2024) for _ in range(queries))]
+
+        index, build = timed(YearIndex, data)
+        start = time.perf_counter()
+        for first, last in cutoffs:
+            if last is None:
+                index.published_after(first)
+            else:
+                index.published_between(first, last)
+        indexed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for first, last in cutoffs[:scanned_queries]:
+            if last is None:
+                books_published_after(data, first)
+            else:
+                [book for book in data if first <= int(book['year']) <= last]
+        scanned = (time.perf_counter() - start) * queries / scanned_queries
+        print(f"{count:>12,} {build:>10.2f} {indexed:>20.2f} {scanned:>21.0f}")
+
+
+def sorted_top_k_by_genre(data, k):
+    """The sort-based equivalent of top_k_by_genre: sorts every book, then takes the first k of each genre."""
+    ranked = sorted(enumerate(data), key=lambda item: (-float(item[1].get('rating', 0)), item[0]))
+    top = {}
+    for _, book in ranked:
+        books = top.setdefault(book.get('genre', 'Unknown'), [])
+        if len(books) < k:
+            books.append({'title': book['title'], 'rating': float(book.get('rating', 0))})
+    return top
+
+
+def benchmark_topk(sizes, ks=(10, 100)):
+    """Compares the bounded-heap top_k_by_genre with sorting the whole dataset."""
+    print(f"{'rows':>12} {'k':>5} {'sort (s)':>9} {'heaps (s)':>10}")
+    for count in sizes:
+        data = synthetic_books(count)
+        for k in ks:
+            expected, by_sorting = timed(sorted_top_k_by_genre, data, k)
+            result, by_heaps = timed(top_k_by_genre, data, k)
+            assert result.keys() == expected.keys() and all(result[genre] == expected[genre] for genre in result)
+            print(f"{count:>12,} {k:>5} {by_sorting:>9.2f} {by_heaps:>10.2f}")
+
+
+def benchmark_cache(sizes):
+    """Compares computing the report statistics from the text file and from the memory-mapped cache."""
+    print(f"{'rows':>12} {'text (s)':>9} {'compile (s)':>12} {'cached (s)':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            file_name = os.path.join(directory, f'books{count}.txt')
+            write_catalogue(file_name, count)
+            _, text = timed(lambda: LibraryStats(1950).update(iter_books(file_name)))
+            _, compiling = timed(compile_catalogue, file_name)
+
+            def cached_report():
+                with open_catalogue(file_name) as catalogue:
+                    return catalogue.stats(1950)
+
+            _, cached = timed(cached_report)
+            print(f"{count:>12,} {text:>9.2f} {compiling:>12.2f} {cached:>11.2f} {text / cached:>7.1f}x")
+
+
+def benchmark_incremental(sizes, appended=1_000):
+    """Times refreshing the saved statistics after a small append, against a full pass over the file."""
+    print(f"{'rows':>12} {'full pass (s)':>14} {'first refresh (s)':>18} {f'+{appended:,} rows (s)':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            file_name = os.path.join(directory, f'books{count}.txt')
+            write_catalogue(file_name, count)
+            _, full = timed(lambda: LibraryStats(1950).update(iter_books(file_name)))
+            _, first = timed(refresh_stats, file_name)
+            with open(file_name, 'a') as file:
+                for book in synthetic_books(appended, seed=1):
+                    file.write(f"{book.title},{book.author},{book.genre},{book.pages},{book.year},{book.rating}\n")
+            _, refresh = timed(refresh_stats, file_name)
+            print(f"{count:>12,} {full:>14.2f} {first:>18.2f} {refresh:>16.3f}")
+
+
+BENCHMARKS = {
+    'fused': (benchmark_fused, [10_000_000]),
+    'parallel': (benchmark_parallel, list(range(1, (os.cpu_count() or 1) + 1))),
+    'years': (benchmark_years, [5_000_000]),
+    'cache': (benchmark_cache, [1_000_000]),
+    'topk': (benchmark_topk, [10_000_000]),
+    'incremental': (benchmark_incremental, [100_000, 1_000_000, 5_000_000]),
+}
+
+
+def main():
+    names = sys.argv[1:2] or list(BENCHMARKS)
+    for name in names:
+        benchmark, sizes = BENCHMARKS[name]
+        sizes = [int(size) for size in sys.argv[2:]] or sizes
+        print(f"\n== {name} ==")
+        benchmark(sizes)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,126 @@
+import csv
+import sys
+from bisect import bisect_left, bisect_right
+from heapq import heappush, heappushpop, merge
+from itertools import islice
+
+
+class Book:
+    """A parsed catalogue row. Fields can also be read as book['field'], like read_file's dictionaries."""
+    __slots__ = ('title', 'author', 'genre', 'pages', 'year', 'rating')
+
+    def __init__(self, title, author, genre, pages, year, rating):
+        self.title = title
+        self.author = author
+        self.genre = genre
+        self.pages = pages
+        self.year = year
+        self.rating = rating
+
+    def __getitem__(self, key):
+        if key not in Book.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        """Returns the field's value, or default if the field is missing from the file."""
+        value = getattr(self, key, None) if key in Book.__slots__ else None
+        return default if value is None else value
+
+    def __reduce__(self):
+        # Pickle as constructor arguments, which is much faster than the default for __slots__ classes
+        return Book, (self.title, self.author, self.genre, self.pages, self.year, self.rating)
+
+    def __eq__(self, other):
+        if not isinstance(other, Book):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in Book.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{field}={getattr(self, field)!r}" for field in Book.__slots__)
+        return f"Book({fields})"
+
+
+def _parse_pages(value):
+    """Returns the page count as an int, or None if it is not a whole number."""
+    value = value.strip()
+    return int(value) if value.isdigit() else None
+
+
+# How each Book field is parsed from its text; fields missing from the file are None
+_FIELD_PARSERS = {
+    'title': str.strip,
+    'author': str.strip,
+    'genre': str.strip,
+    'pages': _parse_pages,
+    'year': int,
+    'rating': float,
+}
+
+
+def _row_fields(headers):
+    """Returns the (column, parser) of each Book field for a header row; fields missing from it are None."""
+    headers = [header.strip() for header in headers]
+    return [(headers.index(field), _FIELD_PARSERS[field]) if field in headers else None
+            for field in Book.__slots__]
+
+
+def _parse_rows(reader, fields, location):
+    """Yields a Book for each non-empty csv row; location(reader) describes a row that cannot be parsed."""
+    for row in reader:
+        if not row:
+            continue
+        try:
+            book = Book(*[None if spec is None else spec[1](row[spec[0]]) for spec in fields])
+        except (IndexError, ValueError):
+            raise ValueError(f"{location(reader)} could not be parsed.") from None
+        yield book
+
+
+def iter_books(file_name):
+    """Yields each row of the file as a Book, parsing every column once and in constant memory."""
+    try:
+        with open(file_name, 'r', newline='') as file:
+            reader = csv.reader(file)
+            fields = _row_fields(next(reader, []))
+            yield from _parse_rows(reader, fields, lambda rows: f"Line {rows.line_num} of '{file_name}'")
+    except FileNotFoundError:
+        print(f"Error: The file '{file_name}' was not found.")
+
+
+def iter_books_in_range(file_name, start, end):
+    """Yields the Books whose lines start within the byte range [start, end) of the file.
+
+    The ranges need not fall on line boundaries: a line belongs to the range it starts in, so
+    ranges that cover the file without gaps yield every book exactly once. Rows must not contain
+    quoted line breaks.
+    """
+    with open(file_name, 'rb') as file:
+        fields = _row_fields(next(csv.reader([file.readline().decode('utf-8')]), []))
+        header_end = file.tell()
+        # Skip to the first line that starts inside the range
+        if start > header_end:
+            file.seek(start - 1)
+            file.readline()
+        else:
+            file.seek(header_end)
+
+        def lines(block_size=1 << 20):
+            # Read whole blocks, finishing each block's last line, and decode them in one go
+            position = file.tell()
+            while position < end:
+                block = file.read(min(block_size, end - position))
+                if not block:
+                    return
+                if not block.endswith(b'\n'):
+                    block += file.readline()
+                position += len(block)
+                yield from block.decode('utf-8').split('\n')
+
+        yield from _parse_rows(csv.reader(lines()), fields,
+                               lambda rows: f"A line in bytes {start}-{end} of '{file_name}'")
+
+
 def read_file(file_name):
     """Reads the file and returns the data as a list of dictionaries."""
     data = []
@@ -17,10 +140,18 @@ def read_file(file_name):
 
 def calculate_average_page_count(data):
     """Calculates and returns the average number of pages."""
-    page_counts = [int(book['pages']) for book in data if book['pages'].isdigit()]
+    page_counts = [pages for pages in map(_page_count, data) if pages is not None]
     return sum(page_counts) / len(page_counts) if page_counts else 0
 
 
+def _page_count(book):
+    """Returns a book's page count as an int, or None if it is not a whole number."""
+    pages = book['pages']
+    if isinstance(pages, str):
+        return int(pages) if pages.isdigit() else None
+    return pages
+
+
 def books_published_after(data, year):
     """Returns a list of books published in or after the given year."""
     return [book for book in data if int(book['year']) >= year]
@@ -46,6 +177,30 @@ def highest_rated_book_by_genre(data):
     return highest_rated
 
 
+def top_k_by_genre(data, k):
+    """Finds the k highest-rated books in each genre in one pass, best first.
+
+    Each genre keeps a heap of at most k books, so memory stays O(genres x k) and data can be a
+    stream such as iter_books(). Books with equal ratings keep their order in data.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1.")
+    heaps = {}
+    for index, book in enumerate(data):
+        genre = book.get('genre', 'Unknown')
+        # The heap's smallest entry is the one to drop: the lowest rating, and the latest book among equals
+        entry = (float(book.get('rating', 0)), -index, book['title'])
+        heap = heaps.get(genre)
+        if heap is None:
+            heaps[genre] = [entry]
+        elif len(heap) < k:
+            heappush(heap, entry)
+        elif entry > heap[0]:
+            heappushpop(heap, entry)
+    return {genre: [{'title': title, 'rating': rating} for rating, _, title in sorted(heap, reverse=True)]
+            for genre, heap in heaps.items()}
+
+
 def authors_with_multiple_books(data):
     """Finds authors with more than one book, sorted alphabetically by surname."""
     author_counts = {}
@@ -57,40 +212,203 @@ def authors_with_multiple_books(data):
     return sorted(multiple_books, key=lambda name: name.split()[-1])  # Sort by surname
 
 
-def main():
-    file_name = 'books.txt'
-    data = read_file(file_name)
+class YearIndex:
+    """Books kept sorted by publication year, so year queries take O(log n + k) instead of a full scan.
 
-    if not data:
-        return  # Exit if the file couldn't be read
+    Books with the same year stay in the order they were added.
+    """
+
+    def __init__(self, data=()):
+        """Builds the index from an iterable of books (Books or read_file dictionaries)."""
+        self._years = []
+        self._books = []
+        self.extend(data)
+
+    def __len__(self):
+        return len(self._books)
+
+    def append(self, book):
+        """Adds one book, keeping the index sorted."""
+        year = int(book['year'])
+        position = bisect_right(self._years, year)
+        self._years.insert(position, year)
+        self._books.insert(position, book)
+
+    def extend(self, data):
+        """Adds many books with one sort of the new books and one linear merge into the index."""
+        added = sorted(((int(book['year']), book) for book in data), key=lambda entry: entry[0])
+        if not added:
+            return
+        if self._books and added[0][0] < self._years[-1]:
+            # merge() takes from the existing books first on equal years, which keeps insertion order
+            added = list(merge(zip(self._years, self._books), added, key=lambda entry: entry[0]))
+            self._years, self._books = [], []
+        self._years.extend(year for year, _ in added)
+        self._books.extend(book for _, book in added)
+
+    def published_after(self, year):
+        """Returns the books published in or after the given year, oldest first."""
+        return self._books[bisect_left(self._years, year):]
+
+    def published_between(self, first_year, last_year):
+        """Returns the books published from first_year to last_year inclusive, oldest first."""
+        return self._books[bisect_left(self._years, first_year):bisect_right(self._years, last_year)]
+
+
+class LibraryStats:
+    """Computes every figure of the library report in one streaming pass.
+
+    Statistics of separate chunks of the catalogue can be combined with merge(), as long as the
+    chunks are merged in file order, so ties are settled exactly as the single-pass functions settle them.
+    """
+
+    def __init__(self, year=1950):
+        """Creates empty statistics that list the books published in or after the given year."""
+        self.year = year
+        self.book_count = 0
+        self.page_total = 0
+        self.page_count = 0
+        self.recent_books = []
+        self.genre_counts = {}
+        self.highest_rated = {}
+        self.author_counts = {}
+
+    def add(self, book):
+        """Adds one book (a Book or a read_file dictionary) to the statistics."""
+        self.update((book,))
+
+    def update(self, data):
+        """Adds every book of an iterable to the statistics and returns self."""
+        cutoff = self.year
+        recent_books = self.recent_books
+        genre_counts = self.genre_counts
+        highest_rated = self.highest_rated
+        author_counts = self.author_counts
+        book_count = page_total = page_count = 0
+
+        for book in data:
+            # Read the fields straight from Books; dictionaries go through the usual parsing
+            if type(book) is Book:
+                title, author, genre, pages, year, rating = (
+                    book.title, book.author, book.genre, book.pages, book.year, book.rating)
+                if genre is None:
+                    genre = 'Unknown'
+                if rating is None:
+                    rating = 0
+            else:
+                title, author, genre = book['title'], book.get('author'), book.get('genre', 'Unknown')
+                pages, year, rating = _page_count(book), int(book['year']), float(book.get('rating', 0))
+
+            book_count += 1
+            if pages is not None:
+                page_total += pages
+                page_count += 1
+
+            if year >= cutoff:
+                recent_books.append(book)
+
+            genre_counts[genre] = genre_counts.get(genre, 0) + 1
+
+            best = highest_rated.get(genre)
+            if best is None or rating > best['rating']:
+                highest_rated[genre] = {'title': title, 'rating': float(rating)}
 
+            if author:
+                author_counts[author] = author_counts.get(author, 0) + 1
+
+        self.book_count += book_count
+        self.page_total += page_total
+        self.page_count += page_count
+        return self
+
+    def merge(self, other):
+        """Folds in the statistics of the chunk that follows this one in the file and returns self."""
+        if other.year != self.year:
+            raise ValueError("Cannot merge statistics computed for different years.")
+        self.book_count += other.book_count
+        self.page_total += other.page_total
+        self.page_count += other.page_count
+        self.recent_books.extend(other.recent_books)
+        for genre, count in other.genre_counts.items():
+            self.genre_counts[genre] = self.genre_counts.get(genre, 0) + count
+        for genre, book in other.highest_rated.items():
+            best = self.highest_rated.get(genre)
+            if best is None or book['rating'] > best['rating']:
+                self.highest_rated[genre] = book
+        for author, count in other.author_counts.items():
+            self.author_counts[author] = self.author_counts.get(author, 0) + count
+        return self
+
+    def average_page_count(self):
+        """Returns the average number of pages, as calculate_average_page_count does."""
+        return self.page_total / self.page_count if self.page_count else 0
+
+    def books_published_after(self):
+        """Returns the books published in or after the statistics' year, in file order."""
+        return self.recent_books
+
+    def count_books_by_genre(self):
+        """Returns the number of books in each genre."""
+        return self.genre_counts
+
+    def highest_rated_book_by_genre(self):
+        """Returns the highest-rated book in each genre."""
+        return self.highest_rated
+
+    def authors_with_multiple_books(self):
+        """Returns the authors with more than one book, sorted alphabetically by surname."""
+        multiple_books = [author for author, count in self.author_counts.items() if count > 1]
+        return sorted(multiple_books, key=lambda name: name.split()[-1])  # Sort by surname
+
+
+def _write_lines(lines, chunk_size=10_000):
+    """Writes lines to standard output, joining them into one write per chunk instead of one print each."""
+    lines = iter(lines)
+    write = sys.stdout.write
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        chunk.append('')
+        write('\n'.join(chunk))
+
+
+def print_report(stats):
+    """Prints the library report from the computed statistics."""
     # (b) Calculate the average number of pages
-    avg_pages = calculate_average_page_count(data)
+    avg_pages = stats.average_page_count()
     print(f"Average number of pages: {avg_pages:.2f}")
 
-    # (c) List books published in or after 1950
-    books_after_1950 = books_published_after(data, 1950)
-    print("\nBooks published in or after 1950:")
-    for i, book in enumerate(books_after_1950, start=1):
-        print(f"{i}. {book['title']} ({book['year']})")
+    # (c) List books published in or after the report year
+    books_after = stats.books_published_after()
+    print(f"\nBooks published in or after {stats.year}:")
+    _write_lines(f"{i}. {book['title']} ({book['year']})" for i, book in enumerate(books_after, start=1))
 
     # (d) Count the number of books in each genre
-    genre_counts = count_books_by_genre(data)
+    genre_counts = stats.count_books_by_genre()
     print("\nNumber of books by genre:")
-    for genre, count in genre_counts.items():
-        print(f"{genre}: {count}")
+    _write_lines(f"{genre}: {count}" for genre, count in genre_counts.items())
 
     # (e) Find the highest-rated book in each genre
-    highest_rated = highest_rated_book_by_genre(data)
+    highest_rated = stats.highest_rated_book_by_genre()
     print("\nHighest-rated book by genre:")
-    for genre, book in highest_rated.items():
-        print(f"{genre}: {book['title']} (Rating: {book['rating']})")
+    _write_lines(f"{genre}: {book['title']} (Rating: {book['rating']})" for genre, book in highest_rated.items())
 
     # (f) List authors with more than one book
-    authors = authors_with_multiple_books(data)
+    authors = stats.authors_with_multiple_books()
     print("\nAuthors with more than one book:")
-    for author in authors:
-        print(author)
+    _write_lines(authors)
+
+
+def main():
+    file_name = 'books.txt'
+    # Compute every figure of the report in a single pass over the file
+    stats = LibraryStats(1950).update(iter_books(file_name))
+
+    if not stats.book_count:
+        return  # Exit if the file couldn't be read
+
+    print_report(stats)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,335 @@
+"""Binary, columnar cache of the library catalogue for fast reloads.
+
+compile_catalogue() parses the text catalogue once and stores every column in a binary file next to
+it: pages, year and rating as typed arrays, and title, author and genre as string tables (genre and
+author dictionary-encoded). The figures of the report that do not depend on the year asked for (the
+counts per genre and author, each genre's best row, the page totals and the authors with more than
+one book, in report order) are stored too, with the rows in order of year. load_catalogue()
+memory-maps that file instead of re-parsing the text, as long as the source file's modification time
+and size are unchanged, and titles are only decoded when a row is read.
+"""
+import mmap
+import operator
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from library import Book, LibraryStats, iter_books, print_report
+
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = b'LIBCACH2'
+# Magic, byte order (1 = little-endian), source mtime in nanoseconds, source size, row count
+_HEADER = struct.Struct('<8sBqqQ')
+_SECTION_LENGTH = struct.Struct('<Q')
+# The page count stored for a row whose page count is not a whole number
+_NO_PAGES = -1
+
+
+def cache_path(file_name):
+    """Returns the path of the cache file that belongs to a catalogue file."""
+    return file_name + CACHE_SUFFIX
+
+
+class _StringTable:
+    """Collects strings as one UTF-8 blob plus an array of where each string ends. The ends are counted
+    in characters, so the decoded blob can be sliced directly, or in bytes, so each string can be
+    decoded on its own."""
+
+    def __init__(self, byte_offsets=False):
+        self.offsets = array('Q', [0])
+        self.data = bytearray()
+        self._byte_offsets = byte_offsets
+        self._length = 0
+
+    def append(self, text):
+        encoded = text.encode('utf-8')
+        self.data += encoded
+        self._length += len(encoded) if self._byte_offsets else len(text)
+        self.offsets.append(self._length)
+
+
+class _Dictionary(_StringTable):
+    """A string table holding each distinct value once, in order of first appearance."""
+
+    def __init__(self):
+        super().__init__()
+        self.codes = {}
+
+    def code(self, text):
+        """Returns the code of a value, adding it to the table if it is new."""
+        code = self.codes.get(text)
+        if code is None:
+            code = self.codes[text] = len(self.codes)
+            self.append(text)
+        return code
+
+
+def compile_catalogue(file_name, cache_name=None):
+    """Parses the catalogue file once and writes its columnar cache; returns the cache path.
+
+    Every column (title, author, genre, pages, year, rating) must be present in the file.
+    """
+    cache_name = cache_name or cache_path(file_name)
+    source = os.stat(file_name)
+
+    titles, authors, genres = _StringTable(byte_offsets=True), _Dictionary(), _Dictionary()
+    author_codes, genre_codes = array('I'), array('I')
+    pages, years, ratings = array('q'), array('q'), array('d')
+    genre_counts, genre_best_rows, author_counts = array('Q'), array('Q'), array('Q')
+    page_count = page_total = 0
+    for row, book in enumerate(iter_books(file_name)):
+        if book.title is None or book.author is None or book.genre is None or book.rating is None:
+            raise ValueError(f"'{file_name}' is missing a column, so it cannot be cached.")
+        titles.append(book.title)
+        author_code = authors.code(book.author)
+        if author_code == len(author_counts):
+            author_counts.append(0)
+        author_counts[author_code] += 1
+        author_codes.append(author_code)
+        # The first row with the highest rating is each genre's best, as in LibraryStats
+        genre_code = genres.code(book.genre)
+        if genre_code == len(genre_counts):
+            genre_counts.append(0)
+            genre_best_rows.append(row)
+        elif book.rating > ratings[genre_best_rows[genre_code]]:
+            genre_best_rows[genre_code] = row
+        genre_counts[genre_code] += 1
+        genre_codes.append(genre_code)
+        if book.pages is None:
+            pages.append(_NO_PAGES)
+        else:
+            pages.append(book.pages)
+            page_count += 1
+            page_total += book.pages
+        years.append(book.year)
+        ratings.append(book.rating)
+    # The rows in order of year, so the recent books are found with one binary search
+    year_rows = array('Q', sorted(range(len(years)), key=years.__getitem__))
+    # The authors with more than one book, sorted by surname as LibraryStats.authors_with_multiple_books does
+    author_names = list(authors.codes)
+    multiple_authors = array('I', sorted((code for code, count in enumerate(author_counts)
+                                          if count > 1 and author_names[code]),
+                                         key=lambda code: author_names[code].split()[-1]))
+
+    sections = [pages, years, ratings, genre_codes, genres.offsets, genres.data,
+                author_codes, authors.offsets, authors.data, titles.offsets, titles.data,
+                year_rows, genre_counts, genre_best_rows, author_counts, array('q', [page_count, page_total]),
+                multiple_authors]
+    temporary_name = cache_name + '.tmp'
+    with open(temporary_name, 'wb') as file:
+        file.write(_HEADER.pack(CACHE_MAGIC, sys.byteorder == 'little', source.st_mtime_ns, source.st_size,
+                                len(years)))
+        for section in sections:
+            data = section.tobytes() if isinstance(section, array) else bytes(section)
+            file.write(_SECTION_LENGTH.pack(len(data)))
+            file.write(data)
+            # Keep every section 8-byte aligned so it can be viewed in place as a typed array
+            file.write(b'\0' * (-len(data) % 8))
+    os.replace(temporary_name, cache_name)
+    return cache_name
+
+
+class BookRows(Sequence):
+    """A read-only sequence of some rows of a Catalogue, which creates their Books as they are read.
+    It can only be read while the catalogue is open."""
+
+    def __init__(self, catalogue, rows):
+        self._catalogue = catalogue
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BookRows(self._catalogue, self._rows[index])
+        return self._catalogue[self._rows[index]]
+
+    def __iter__(self):
+        for start in range(0, len(self._rows), 10_000):
+            yield from self._catalogue.books(self._rows[start:start + 10_000])
+
+    def __eq__(self, other):
+        if not isinstance(other, (BookRows, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(map(operator.eq, self, other))
+
+    def __repr__(self):
+        return f"BookRows({list(self)!r})"
+
+
+class _CatalogueStats(LibraryStats):
+    """LibraryStats whose authors with more than one book were already sorted when the cache was compiled."""
+
+    def __init__(self, year, multiple_authors):
+        super().__init__(year)
+        self._multiple_authors = multiple_authors
+
+    def merge(self, other):
+        # The stored list only describes this catalogue, so merged statistics sort their own
+        self._multiple_authors = None
+        return super().merge(other)
+
+    def authors_with_multiple_books(self):
+        if self._multiple_authors is None:
+            return super().authors_with_multiple_books()
+        return list(self._multiple_authors)
+
+
+class Catalogue:
+    """A memory-mapped catalogue cache. It behaves as a sequence of Books and computes LibraryStats
+    column by column without creating a Book for every row."""
+
+    def __init__(self, cache_name):
+        """Memory-maps a cache file written by compile_catalogue()."""
+        with open(cache_name, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, _, self._rows = _HEADER.unpack_from(self._buffer, 0)
+        view = memoryview(self._buffer)
+        self._views = [view]
+        sections = []
+        offset = _HEADER.size
+        for _ in range(17):
+            (length,) = _SECTION_LENGTH.unpack_from(self._buffer, offset)
+            offset += _SECTION_LENGTH.size
+            sections.append(view[offset:offset + length])
+            offset += length + (-length % 8)
+        (pages, years, ratings, genre_codes, genre_offsets, genre_data,
+         author_codes, author_offsets, author_data, title_offsets, title_data,
+         year_rows, genre_counts, genre_best_rows, author_counts, page_summary, multiple_authors) = sections
+        self.pages = self._cast(pages, 'q')
+        self.years = self._cast(years, 'q')
+        self.ratings = self._cast(ratings, 'd')
+        self.genre_codes = self._cast(genre_codes, 'I')
+        self.author_codes = self._cast(author_codes, 'I')
+        self._views += [genre_data, author_data, title_data]
+        self.genres = self._decode_all(self._cast(genre_offsets, 'Q'), genre_data)
+        self.authors = self._decode_all(self._cast(author_offsets, 'Q'), author_data)
+        # Titles stay encoded in the map; each one is decoded when its row is read
+        self._title_offsets = self._cast(title_offsets, 'Q')
+        self._title_data = title_data
+        self._year_rows = self._cast(year_rows, 'Q')
+        self._genre_counts = self._cast(genre_counts, 'Q')
+        self._genre_best_rows = self._cast(genre_best_rows, 'Q')
+        self._author_counts = self._cast(author_counts, 'Q')
+        self._page_summary = self._cast(page_summary, 'q')
+        self._multiple_authors = self._cast(multiple_authors, 'I')
+
+    def _cast(self, section, typecode):
+        """Views a section of the cache in place as an array of the given type."""
+        view = section.cast(typecode)
+        self._views.append(view)
+        return view
+
+    @staticmethod
+    def _decode_all(offsets, data):
+        """Decodes every string of a string table."""
+        text = str(data, 'utf-8')
+        return [text[offsets[index]:offsets[index + 1]] for index in range(len(offsets) - 1)]
+
+    def title(self, row):
+        """Returns the title of a row."""
+        return str(self._title_data[self._title_offsets[row]:self._title_offsets[row + 1]], 'utf-8')
+
+    def books(self, rows):
+        """Returns the Books of the given rows."""
+        titles, offsets = self._title_data, self._title_offsets
+        authors, author_codes = self.authors, self.author_codes
+        genres, genre_codes = self.genres, self.genre_codes
+        pages, years, ratings = self.pages, self.years, self.ratings
+        return [Book(str(titles[offsets[row]:offsets[row + 1]], 'utf-8'), authors[author_codes[row]],
+                     genres[genre_codes[row]], None if pages[row] == _NO_PAGES else pages[row], years[row],
+                     ratings[row])
+                for row in rows]
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self._rows:
+            raise IndexError(row)
+        return self.books((row,))[0]
+
+    def __iter__(self):
+        for start in range(0, self._rows, 10_000):
+            yield from self.books(range(start, min(start + 10_000, self._rows)))
+
+    def stats(self, year=1950):
+        """Computes the LibraryStats of the whole catalogue from the figures stored at compile time."""
+        authors = self.authors
+        stats = _CatalogueStats(year, [authors[code] for code in self._multiple_authors])
+        stats.book_count = self._rows
+        stats.page_count, stats.page_total = self._page_summary
+
+        # The recent books are the rows from the first one of the year on, put back in file order.
+        # They are kept as row numbers and only become Books when they are read
+        start = bisect_left(self._year_rows, year, key=self.years.__getitem__)
+        stats.recent_books = BookRows(self, array('Q', sorted(self._year_rows[start:])))
+
+        # Codes were assigned in order of first appearance, which is the order the dictionaries keep
+        stats.genre_counts = dict(zip(self.genres, self._genre_counts.tolist()))
+        stats.highest_rated = {genre: {'title': self.title(row), 'rating': self.ratings[row]}
+                               for genre, row in zip(self.genres, self._genre_best_rows)}
+        stats.author_counts = dict(zip(self.authors, self._author_counts.tolist()))
+        # LibraryStats does not count books without an author
+        stats.author_counts.pop('', None)
+        return stats
+
+    def close(self):
+        """Releases the memory map."""
+        for view in reversed(self._views):
+            view.release()
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_catalogue(file_name, cache_name=None):
+    """Returns the Catalogue cached for a file, or None if there is no cache or it is out of date."""
+    cache_name = cache_name or cache_path(file_name)
+    try:
+        source = os.stat(file_name)
+        with open(cache_name, 'rb') as file:
+            header = file.read(_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, little_endian, mtime_ns, size, _ = _HEADER.unpack(header)
+    if (magic != CACHE_MAGIC or little_endian != (sys.byteorder == 'little')
+            or mtime_ns != source.st_mtime_ns or size != source.st_size):
+        return None
+    return Catalogue(cache_name)
+
+
+def open_catalogue(file_name, cache_name=None):
+    """Returns the Catalogue of a file, compiling its cache first if it is missing or out of date."""
+    catalogue = load_catalogue(file_name, cache_name)
+    if catalogue is None:
+        catalogue = Catalogue(compile_catalogue(file_name, cache_name))
+    return catalogue
+
+
+def main():
+    file_name = 'books.txt'
+    if not os.path.exists(file_name):
+        print(f"Error: The file '{file_name}' was not found.")
+        return
+
+    with open_catalogue(file_name) as catalogue:
+        stats = catalogue.stats(1950)
+        if not stats.book_count:
+            return
+
+        print_report(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""Library statistics that stay up to date as rows are appended to the catalogue file.
+
+refresh_stats() saves the report's running totals next to the catalogue, with the byte offset of the
+last line they include. The next refresh parses only the lines appended after that offset, so its
+cost grows with the new rows (plus loading the per-author totals) rather than with the whole file.
+The books published in or after the report year are copied to a catalogue file of their own, which
+is read only when the report lists them.
+
+Only complete lines are counted: a last line without its line break is left for the next refresh.
+If the file is shorter than the saved offset, or the bytes at its start or just before the offset
+have changed, the statistics are rebuilt from the start. Rows must not contain quoted line breaks.
+"""
+import csv
+import hashlib
+import io
+import operator
+import os
+import pickle
+
+from library import Book, LibraryStats, _parse_rows, _row_fields, iter_books, print_report
+
+STATE_SUFFIX = '.stats'
+RECENT_SUFFIX = '.recent'
+STATE_VERSION = 1
+# How many bytes at the start of the file and before the saved offset are checked for changes
+_CHECK_BYTES = 4096
+
+
+def state_path(file_name):
+    """Returns the path of the saved statistics that belong to a catalogue file."""
+    return file_name + STATE_SUFFIX
+
+
+def recent_path(file_name):
+    """Returns the path of the file holding a catalogue's recent books."""
+    return file_name + RECENT_SUFFIX
+
+
+class RecentBooks:
+    """The saved recent books of a catalogue, read from their file each time they are iterated."""
+
+    def __init__(self, file_name, count):
+        self.file_name = file_name
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter_books(self.file_name)
+
+
+def _digest(file, start, end):
+    """Returns a hash of the bytes [start, end) of an open binary file."""
+    file.seek(start)
+    return hashlib.sha1(file.read(end - start)).hexdigest()
+
+
+def _check_digests(file, offset):
+    """Returns the hashes of the start of the file and of the bytes just before the offset."""
+    return (_digest(file, 0, min(offset, _CHECK_BYTES)),
+            _digest(file, max(offset - _CHECK_BYTES, 0), offset))
+
+
+def _load_state(file_name, year, size):
+    """Returns the saved state if it is still valid for the file, otherwise None."""
+    try:
+        with open(state_path(file_name), 'rb') as file:
+            state = pickle.load(file)
+        recent_size = os.path.getsize(recent_path(file_name))
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if (state.get('version') != STATE_VERSION or state['year'] != year or state['offset'] > size
+            or recent_size < state['recent_size']):
+        return None
+    with open(file_name, 'rb') as file:
+        if list(_check_digests(file, state['offset'])) != [state['head_digest'], state['tail_digest']]:
+            return None
+    if recent_size > state['recent_size']:
+        # Drop recent books written by a refresh that did not get to save its state
+        os.truncate(recent_path(file_name), state['recent_size'])
+    return state
+
+
+def _columns(headers):
+    """Returns the Book fields that a file with the given header row has."""
+    return [field for field, spec in zip(Book.__slots__, _row_fields(headers)) if spec is not None]
+
+
+def _new_state(file_name, year):
+    """Starts the state of a file from its header line and starts an empty recent-books file.
+
+    Returns None while the header line is incomplete.
+    """
+    with open(file_name, 'rb') as file:
+        header = file.readline()
+    if not header.endswith(b'\n'):
+        return None
+    headers = next(csv.reader([header.decode('utf-8')]), [])
+    with open(recent_path(file_name), 'w', newline='') as file:
+        csv.writer(file, lineterminator='\n').writerow(_columns(headers))
+    stats = LibraryStats(year)
+    return {'version': STATE_VERSION, 'year': year, 'offset': len(header), 'headers': headers,
+            'recent_size': os.path.getsize(recent_path(file_name)), 'recent_count': 0,
+            'book_count': stats.book_count, 'page_total': stats.page_total, 'page_count': stats.page_count,
+            'genre_counts': stats.genre_counts, 'highest_rated': stats.highest_rated,
+            'author_counts': stats.author_counts}
+
+
+def _stats_from_state(state):
+    """Returns a LibraryStats holding the saved totals, without the recent books."""
+    stats = LibraryStats(state['year'])
+    stats.book_count = state['book_count']
+    stats.page_total = state['page_total']
+    stats.page_count = state['page_count']
+    stats.genre_counts = state['genre_counts']
+    stats.highest_rated = state['highest_rated']
+    stats.author_counts = state['author_counts']
+    return stats
+
+
+def refresh_stats(file_name, year=1950):
+    """Brings the saved statistics of a catalogue file up to date and returns them as a LibraryStats.
+
+    Its recent books are a RecentBooks, which reads them from their own file when iterated.
+    """
+    size = os.path.getsize(file_name)
+    state = _load_state(file_name, year, size)
+    changed = state is None
+    if changed:
+        state = _new_state(file_name, year)
+        if state is None:
+            return LibraryStats(year)
+    stats = _stats_from_state(state)
+
+    with open(file_name, 'rb') as file:
+        file.seek(state['offset'])
+        tail = file.read(size - state['offset'])
+        # Only complete lines are consumed
+        tail = tail[:tail.rfind(b'\n') + 1]
+        if tail:
+            start = state['offset']
+            fields = _row_fields(state['headers'])
+            rows = csv.reader(tail.decode('utf-8').split('\n'))
+            stats.update(_parse_rows(rows, fields,
+                                     lambda reader: f"Line {reader.line_num} after byte {start} of '{file_name}'"))
+            state['offset'] += len(tail)
+            changed = True
+        if changed:
+            state['head_digest'], state['tail_digest'] = _check_digests(file, state['offset'])
+
+    if stats.recent_books:
+        text = io.StringIO()
+        columns = [map(operator.attrgetter(field), stats.recent_books) for field in _columns(state['headers'])]
+        csv.writer(text, lineterminator='\n').writerows(zip(*columns))
+        data = text.getvalue().encode('utf-8')
+        with open(recent_path(file_name), 'ab') as file:
+            file.write(data)
+        state['recent_size'] += len(data)
+        state['recent_count'] += len(stats.recent_books)
+
+    if changed:
+        # The recent books are written first, so a refresh that stops early leaves the old state valid
+        state.update(book_count=stats.book_count, page_total=stats.page_total, page_count=stats.page_count)
+        temporary_name = state_path(file_name) + '.tmp'
+        with open(temporary_name, 'wb') as file:
+            pickle.dump(state, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_name, state_path(file_name))
+
+    stats.recent_books = RecentBooks(recent_path(file_name), state['recent_count'])
+    return stats
+
+
+def main():
+    file_name = 'books.txt'
+    if not os.path.exists(file_name):
+        print(f"Error: The file '{file_name}' was not found.")
+        return
+
+    stats = refresh_stats(file_name, 1950)
+    if not stats.book_count:
+        return
+
+    print_report(stats)
+
+
+if __name__ == '__main__':
+    main()
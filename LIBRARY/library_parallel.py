@@ -0,0 +1,56 @@
+"""Parallel library analysis over byte ranges of the catalogue file.
+
+The file is cut into byte ranges, each range is parsed and reduced to a LibraryStats in a worker
+process, and the partial statistics are merged in file order, so the report matches the serial one.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from library import LibraryStats, iter_books_in_range, print_report
+
+
+def split_file(file_name, chunks):
+    """Returns `chunks` byte ranges (start, end) that together cover the whole file."""
+    size = os.path.getsize(file_name)
+    return [(size * index // chunks, size * (index + 1) // chunks) for index in range(chunks)]
+
+
+def range_stats(file_name, start, end, year):
+    """Parses the books of one byte range and returns their LibraryStats."""
+    return LibraryStats(year).update(iter_books_in_range(file_name, start, end))
+
+
+def parallel_library_stats(file_name, year=1950, workers=None, chunks=None):
+    """Computes the LibraryStats of the whole file with a pool of worker processes.
+
+    The file is split into `chunks` ranges (four per worker by default) so that uneven ranges
+    still keep every worker busy.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or workers * 4
+    ranges = split_file(file_name, chunks)
+    stats = LibraryStats(year)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() returns the partial statistics in file order, which merge() relies on
+        partials = pool.map(range_stats, [file_name] * chunks, *zip(*ranges), [year] * chunks)
+        for partial in partials:
+            stats.merge(partial)
+    return stats
+
+
+def main(workers=None):
+    file_name = 'books.txt'
+    if not os.path.exists(file_name):
+        print(f"Error: The file '{file_name}' was not found.")
+        return
+
+    stats = parallel_library_stats(file_name, 1950, workers)
+    if not stats.book_count:
+        return
+
+    print_report(stats)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -5,7 +5,12 @@ from library import (
     books_published_after,
     count_books_by_genre,
     highest_rated_book_by_genre,
-    authors_with_multiple_books
+    top_k_by_genre,
+    authors_with_multiple_books,
+    iter_books,
+    Book,
+    LibraryStats,
+    YearIndex
 )
 
 
@@ -50,6 +55,22 @@ class TestLibraryFunctions(unittest.TestCase):
         self.assertEqual(highest_rated["Fiction"]["title"], "Book Three")  # Highest-rated Fiction book
         self.assertEqual(highest_rated["Non-Fiction"]["title"], "Book Five")  # Highest-rated Non-Fiction book
 
+    def test_top_k_by_genre(self):
+        """Test finding the best books in each genre, with ties kept in file order."""
+        top = top_k_by_genre(self.sample_data, 2)
+        self.assertEqual(top["Fiction"], [{"title": "Book Three", "rating": 4.8}, {"title": "Book One", "rating": 4.5}])
+        self.assertEqual([book["title"] for book in top["Non-Fiction"]], ["Book Five", "Book Two"])
+        self.assertEqual(top_k_by_genre(self.sample_data, 1)["Fiction"][0],
+                         highest_rated_book_by_genre(self.sample_data)["Fiction"])
+
+        tied = [{"title": f"Book {index}", "genre": "Poetry", "rating": rating}
+                for index, rating in enumerate([4.0, 4.5, 4.0, 4.5, 4.0])]
+        self.assertEqual([book["title"] for book in top_k_by_genre(tied, 3)["Poetry"]], ["Book 1", "Book 3", "Book 0"])
+        self.assertEqual([book["title"] for book in top_k_by_genre(iter(tied), 10)["Poetry"]],
+                         ["Book 1", "Book 3", "Book 0", "Book 2", "Book 4"])
+        with self.assertRaises(ValueError):
+            top_k_by_genre(self.sample_data, 0)
+
     def test_authors_with_multiple_books(self):
         """Test finding authors with more than one book."""
         authors = authors_with_multiple_books(self.sample_data)
@@ -74,5 +95,147 @@ class TestLibraryFunctions(unittest.TestCase):
         self.assertEqual(data[1]["author"], "Author B")
 
 
+class TestIterBooks(unittest.TestCase):
+
+    def setUp(self):
+        """Set up mock file content with a quoted title and an unknown page count."""
+        self.mock_file_content = "title,author,genre,pages,year,rating\n" \
+                                 "\"Book One, Revised\",Author A,Fiction,300,1945,4.5\n" \
+                                 "Book Two,Author B,Non-Fiction,unknown,1955,3.8\n" \
+                                 "Book Three,Author A,Fiction,150,1960,4.8\n"
+
+    def read_mock_file(self, content):
+        """Reads the given content through iter_books by patching open()."""
+        from unittest.mock import mock_open, patch
+        with patch("builtins.open", mock_open(read_data=content)):
+            return list(iter_books("mock_books.txt"))
+
+    def test_iter_books_parses_types(self):
+        """Test that each column is parsed once into a typed Book."""
+        books = self.read_mock_file(self.mock_file_content)
+        self.assertEqual(len(books), 3)
+        self.assertEqual(books[0], Book("Book One, Revised", "Author A", "Fiction", 300, 1945, 4.5))
+        self.assertIsNone(books[1].pages)
+        self.assertEqual(books[2]["year"], 1960)
+        self.assertEqual(books[2].get("genre", "Unknown"), "Fiction")
+
+    def test_analysis_accepts_books(self):
+        """Test that the analysis functions give the same results for Books and dictionaries."""
+        books = self.read_mock_file(self.mock_file_content)
+        rows = [
+            {"title": "Book One, Revised", "author": "Author A", "genre": "Fiction", "pages": "300",
+             "year": "1945", "rating": "4.5"},
+            {"title": "Book Two", "author": "Author B", "genre": "Non-Fiction", "pages": "unknown",
+             "year": "1955", "rating": "3.8"},
+            {"title": "Book Three", "author": "Author A", "genre": "Fiction", "pages": "150",
+             "year": "1960", "rating": "4.8"},
+        ]
+        self.assertEqual(calculate_average_page_count(books), calculate_average_page_count(rows))
+        self.assertEqual([book.title for book in books_published_after(books, 1950)],
+                         [book["title"] for book in books_published_after(rows, 1950)])
+        self.assertEqual(count_books_by_genre(books), count_books_by_genre(rows))
+        self.assertEqual(highest_rated_book_by_genre(books), highest_rated_book_by_genre(rows))
+        self.assertEqual(authors_with_multiple_books(books), authors_with_multiple_books(rows))
+
+    def test_iter_books_missing_column(self):
+        """Test that a column missing from the file reads as None, or the default passed to get()."""
+        books = self.read_mock_file("title,author,genre,pages,year\nBook One,Author A,Fiction,300,1945\n")
+        self.assertIsNone(books[0].rating)
+        self.assertEqual(books[0].get("rating", 0), 0)
+
+    def test_iter_books_invalid_year(self):
+        """Test that an unparseable year reports the line it is on."""
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            self.read_mock_file("title,author,genre,pages,year,rating\nBook One,Author A,Fiction,300,soon,4.5\n")
+
+
+class TestLibraryStats(unittest.TestCase):
+
+    def setUp(self):
+        """Set up sample data with a rating tie and a non-numeric page count."""
+        self.sample_data = [
+            Book("Book One", "Ann Author", "Fiction", 300, 1945, 4.5),
+            Book("Book Two", "Bob Writer", "Non-Fiction", None, 1955, 3.8),
+            Book("Book Three", "Ann Author", "Fiction", 150, 1960, 4.8),
+            Book("Book Four", "Cy Penman", "Fiction", 400, 2000, 4.8),
+            Book("Book Five", "Bob Writer", "Non-Fiction", 350, 1980, 4.9),
+            Book("Book Six", "Dee Scribe", "Poetry", 90, 1990, 4.1),
+        ]
+
+    def assert_matches_functions(self, stats, data, year):
+        """Checks the statistics against the separate analysis functions."""
+        self.assertEqual(stats.average_page_count(), calculate_average_page_count(data))
+        self.assertEqual(stats.books_published_after(), books_published_after(data, year))
+        self.assertEqual(stats.count_books_by_genre(), count_books_by_genre(data))
+        self.assertEqual(list(stats.count_books_by_genre()), list(count_books_by_genre(data)))
+        self.assertEqual(stats.highest_rated_book_by_genre(), highest_rated_book_by_genre(data))
+        self.assertEqual(stats.authors_with_multiple_books(), authors_with_multiple_books(data))
+
+    def test_single_pass_matches_functions(self):
+        """Test that one pass gives the same results as the five functions."""
+        stats = LibraryStats(1950).update(self.sample_data)
+        self.assertEqual(stats.book_count, 6)
+        self.assertEqual(stats.highest_rated_book_by_genre()["Fiction"]["title"], "Book Three")
+        self.assert_matches_functions(stats, self.sample_data, 1950)
+
+    def test_merge_chunks(self):
+        """Test that merging the statistics of chunks gives the single-pass results."""
+        for split in range(len(self.sample_data) + 1):
+            stats = LibraryStats(1970).update(self.sample_data[:split])
+            stats.merge(LibraryStats(1970).update(self.sample_data[split:]))
+            self.assert_matches_functions(stats, self.sample_data, 1970)
+
+    def test_merge_different_years(self):
+        """Test that statistics for different years cannot be merged."""
+        with self.assertRaises(ValueError):
+            LibraryStats(1950).merge(LibraryStats(1960))
+
+
+class TestYearIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up sample data with two books from the same year."""
+        self.sample_data = [
+            Book("Book One", "Ann Author", "Fiction", 300, 1945, 4.5),
+            Book("Book Two", "Bob Writer", "Non-Fiction", 200, 1980, 3.8),
+            Book("Book Three", "Ann Author", "Fiction", 150, 1960, 4.8),
+            Book("Book Four", "Cy Penman", "Fiction", 400, 2000, 4.0),
+            Book("Book Five", "Bob Writer", "Non-Fiction", 350, 1960, 4.9),
+        ]
+
+    def titles(self, books):
+        """Returns the titles of the given books."""
+        return [book['title'] for book in books]
+
+    def test_published_after(self):
+        """Test that the index returns the same books as the linear scan, oldest first."""
+        index = YearIndex(self.sample_data)
+        for year in (1900, 1945, 1950, 1960, 1999, 2000, 2001):
+            expected = sorted(books_published_after(self.sample_data, year), key=lambda book: book.year)
+            self.assertEqual(index.published_after(year), expected)
+        self.assertEqual(self.titles(index.published_after(1950)),
+                         ["Book Three", "Book Five", "Book Two", "Book Four"])
+
+    def test_published_between(self):
+        """Test the inclusive year-range query."""
+        index = YearIndex(self.sample_data)
+        self.assertEqual(self.titles(index.published_between(1960, 1980)), ["Book Three", "Book Five", "Book Two"])
+        self.assertEqual(index.published_between(1961, 1979), [])
+
+    def test_incremental_updates(self):
+        """Test that appending and extending give the same index as building it at once."""
+        index = YearIndex(self.sample_data[:2])
+        index.append(self.sample_data[2])
+        index.extend(self.sample_data[3:])
+        index.extend([])
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.published_after(0), YearIndex(self.sample_data).published_after(0))
+
+    def test_dictionary_rows(self):
+        """Test indexing read_file dictionaries."""
+        index = YearIndex([{"title": "Old", "year": "1901"}, {"title": "New", "year": "2001"}])
+        self.assertEqual(self.titles(index.published_after(1950)), ["New"])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
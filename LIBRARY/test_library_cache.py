@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from library import LibraryStats, iter_books
+from library_cache import cache_path, compile_catalogue, load_catalogue, open_catalogue
+
+
+class TestLibraryCache(unittest.TestCase):
+
+    def setUp(self):
+        """Write a small catalogue file with a quoted title and an unknown page count."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_name = os.path.join(directory.name, "books.txt")
+        self.write_catalogue("title,author,genre,pages,year,rating\n"
+                             "\"Book One, Revised\",Ann Author,Fiction,300,1945,4.5\n"
+                             "Book Two,Bob Writer,Non-Fiction,n/a,1955,3.8\n"
+                             "Book Three,Ann Author,Fiction,150,1960,4.8\n"
+                             "Book Four,Cy Penman,Fiction,400,2000,4.8\n"
+                             "Book Five,Bob Writer,Non-Fiction,350,1980,4.9\n")
+
+    def write_catalogue(self, content):
+        """Writes the catalogue file."""
+        with open(self.file_name, "w") as file:
+            file.write(content)
+
+    def test_catalogue_matches_text(self):
+        """Test that the cached rows read back as the same Books."""
+        compile_catalogue(self.file_name)
+        with load_catalogue(self.file_name) as catalogue:
+            self.assertEqual(len(catalogue), 5)
+            self.assertEqual(list(catalogue), list(iter_books(self.file_name)))
+            self.assertIsNone(catalogue[1].pages)
+
+    def test_stats_match_text(self):
+        """Test that the column-wise statistics match a pass over the text file."""
+        expected = LibraryStats(1950).update(iter_books(self.file_name))
+        with open_catalogue(self.file_name) as catalogue:
+            stats = catalogue.stats(1950)
+            self.assertEqual(stats.books_published_after(), expected.books_published_after())
+            self.assertEqual(stats.books_published_after()[1:], expected.books_published_after()[1:])
+        self.assertEqual(stats.book_count, expected.book_count)
+        self.assertEqual(stats.average_page_count(), expected.average_page_count())
+        self.assertEqual(list(stats.count_books_by_genre().items()), list(expected.count_books_by_genre().items()))
+        self.assertEqual(stats.highest_rated_book_by_genre(), expected.highest_rated_book_by_genre())
+        self.assertEqual(stats.authors_with_multiple_books(), expected.authors_with_multiple_books())
+        # The recent books are read from the catalogue, so they are gone once it is closed
+        with self.assertRaises(ValueError):
+            list(stats.books_published_after())
+
+    def test_non_ascii_titles(self):
+        """Test that titles are decoded row by row, whatever their encoded length."""
+        self.write_catalogue("title,author,genre,pages,year,rating\n"
+                             "Café Żółć,Zoë Ångström,Poetry,90,1990,4.1\n"
+                             "Naïve,Ann Author,Poetry,80,1940,4.9\n"
+                             "Plain,,Fiction,70,1995,3.0\n")
+        with open_catalogue(self.file_name) as catalogue:
+            self.assertEqual(list(catalogue), list(iter_books(self.file_name)))
+            self.assertEqual(catalogue.title(1), "Naïve")
+            stats = catalogue.stats(1990)
+            expected = LibraryStats(1990).update(iter_books(self.file_name))
+            self.assertEqual(stats.books_published_after(), expected.books_published_after())
+            self.assertEqual(stats.highest_rated_book_by_genre(), expected.highest_rated_book_by_genre())
+            self.assertEqual(stats.author_counts, expected.author_counts)
+
+    def test_stale_cache_is_ignored(self):
+        """Test that changing the source file invalidates the cache."""
+        self.assertIsNone(load_catalogue(self.file_name))
+        compile_catalogue(self.file_name)
+        self.assertTrue(os.path.exists(cache_path(self.file_name)))
+        self.write_catalogue("title,author,genre,pages,year,rating\nBook Six,Dee Scribe,Poetry,90,1990,4.1\n")
+        self.assertIsNone(load_catalogue(self.file_name))
+        with open_catalogue(self.file_name) as catalogue:
+            self.assertEqual([book.title for book in catalogue], ["Book Six"])
+
+    def test_missing_column(self):
+        """Test that a file without every column cannot be cached."""
+        self.write_catalogue("title,author,genre,pages,year\nBook Six,Dee Scribe,Poetry,90,1990\n")
+        with self.assertRaises(ValueError):
+            compile_catalogue(self.file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
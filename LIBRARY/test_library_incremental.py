@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from library import LibraryStats, iter_books
+from library_incremental import recent_path, refresh_stats, state_path
+
+
+class TestIncrementalStats(unittest.TestCase):
+
+    def setUp(self):
+        """Write a small catalogue file."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_name = os.path.join(directory.name, "books.txt")
+        self.write("w", "title,author,genre,pages,year,rating\n"
+                        "\"Book One, Revised\",Ann Author,Fiction,300,1945,4.5\n"
+                        "Book Two,Bob Writer,Non-Fiction,n/a,1955,3.8\n")
+
+    def write(self, mode, content):
+        """Writes or appends to the catalogue file."""
+        with open(self.file_name, mode) as file:
+            file.write(content)
+
+    def assertMatchesFullPass(self, stats):
+        """Checks the statistics against a pass over the whole file."""
+        expected = LibraryStats(1950).update(iter_books(self.file_name))
+        self.assertEqual(stats.book_count, expected.book_count)
+        self.assertEqual(stats.average_page_count(), expected.average_page_count())
+        self.assertEqual(len(stats.books_published_after()), len(expected.books_published_after()))
+        self.assertEqual(list(stats.books_published_after()), expected.books_published_after())
+        self.assertEqual(list(stats.count_books_by_genre().items()), list(expected.count_books_by_genre().items()))
+        self.assertEqual(stats.highest_rated_book_by_genre(), expected.highest_rated_book_by_genre())
+        self.assertEqual(stats.authors_with_multiple_books(), expected.authors_with_multiple_books())
+
+    def test_appended_rows(self):
+        """Test that each refresh adds the appended rows, and only complete lines."""
+        self.assertMatchesFullPass(refresh_stats(self.file_name))
+        self.assertTrue(os.path.exists(state_path(self.file_name)))
+
+        self.write("a", "Book Three,Ann Author,Fiction,150,1960,4.8\nBook Four,Cy Pen")
+        stats = refresh_stats(self.file_name)
+        self.assertEqual(stats.book_count, 3)
+        self.assertEqual([book.title for book in stats.books_published_after()], ["Book Two", "Book Three"])
+
+        self.write("a", "man,Fiction,400,2000,4.8\nBook Five,Bob Writer,Non-Fiction,350,1980,4.9\n")
+        self.assertMatchesFullPass(refresh_stats(self.file_name))
+        self.assertMatchesFullPass(refresh_stats(self.file_name))
+
+    def test_changed_file_is_rebuilt(self):
+        """Test that a file that shrank or was rewritten is read again from the start."""
+        refresh_stats(self.file_name)
+        self.write("w", "title,author,genre,pages,year,rating\nBook Six,Dee Scribe,Poetry,90,1990,4.1\n")
+        self.assertMatchesFullPass(refresh_stats(self.file_name))
+        self.write("w", "title,author,genre,pages,year,rating\nBook Six,Dee Scribe,Poetry,90,1990,4.2\n")
+        self.assertMatchesFullPass(refresh_stats(self.file_name))
+        self.assertEqual(refresh_stats(self.file_name, 1900).book_count, 1)
+
+    def test_unsaved_recent_books_are_dropped(self):
+        """Test that recent books written without their state being saved are discarded."""
+        refresh_stats(self.file_name)
+        with open(recent_path(self.file_name), "a") as file:
+            file.write("Stray Book,Nobody,Fiction,10,2020,1.0\n")
+        self.assertMatchesFullPass(refresh_stats(self.file_name))
+
+    def test_incomplete_header(self):
+        """Test that nothing is counted until the header line is complete."""
+        self.write("w", "title,author,genre")
+        self.assertEqual(refresh_stats(self.file_name).book_count, 0)
+        self.assertFalse(os.path.exists(state_path(self.file_name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
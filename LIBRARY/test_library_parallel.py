@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from library import LibraryStats, iter_books
+from library_parallel import parallel_library_stats, range_stats, split_file
+
+
+class TestParallelLibrary(unittest.TestCase):
+
+    def setUp(self):
+        """Write a small catalogue file, including a quoted title and a blank line."""
+        content = "title,author,genre,pages,year,rating\n" \
+                  "\"Book One, Revised\",Ann Author,Fiction,300,1945,4.5\n" \
+                  "Book Two,Bob Writer,Non-Fiction,n/a,1955,3.8\n" \
+                  "Book Three,Ann Author,Fiction,150,1960,4.8\n" \
+                  "\n" \
+                  "Book Four,Cy Penman,Fiction,400,2000,4.8\n" \
+                  "Book Five,Bob Writer,Non-Fiction,350,1980,4.9\n" \
+                  "Book Six,Dee Scribe,Poetry,90,1990,4.1\n"
+        handle, self.file_name = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w") as file:
+            file.write(content)
+        self.addCleanup(os.remove, self.file_name)
+        self.serial = LibraryStats(1950).update(iter_books(self.file_name))
+
+    def assert_same_stats(self, stats):
+        """Checks that the statistics match the serial pass."""
+        self.assertEqual(stats.book_count, self.serial.book_count)
+        self.assertEqual(stats.average_page_count(), self.serial.average_page_count())
+        self.assertEqual(stats.books_published_after(), self.serial.books_published_after())
+        self.assertEqual(list(stats.count_books_by_genre().items()),
+                         list(self.serial.count_books_by_genre().items()))
+        self.assertEqual(stats.highest_rated_book_by_genre(), self.serial.highest_rated_book_by_genre())
+        self.assertEqual(stats.authors_with_multiple_books(), self.serial.authors_with_multiple_books())
+
+    def test_ranges_cover_every_book_once(self):
+        """Test that any number of byte ranges yields each book exactly once."""
+        size = os.path.getsize(self.file_name)
+        for chunks in (1, 2, 3, 7, size, size + 5):
+            stats = LibraryStats(1950)
+            for start, end in split_file(self.file_name, chunks):
+                stats.merge(range_stats(self.file_name, start, end, 1950))
+            self.assert_same_stats(stats)
+
+    def test_parallel_matches_serial(self):
+        """Test that the process pool gives the serial results."""
+        self.assert_same_stats(parallel_library_stats(self.file_name, 1950, workers=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
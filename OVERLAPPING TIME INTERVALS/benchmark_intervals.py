@@ -0,0 +1,276 @@
+"""
+Benchmarks for the time interval tools.
+
+Run a single benchmark by name, for example:
+
+    python benchmark_intervals.py index 1000000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import *
+
+from interval_arrays import np, merge_interval_arrays
+from interval_index import IntervalIndex
+from interval_set import IntervalSet
+from interval_stream import merge_intervals_iter, read_intervals
+from time_intervals import merge_intervals
+
+
+def random_intervals(count: int, span: int = 10_000_000, longest: int = 1_000, seed: int = 0) -> List[Tuple[int, int]]:
+    """
+    Generate random intervals, like bookings spread over a time span.
+
+    :param count: The number of intervals.
+    :param span: The range of start times.
+    :param longest: The longest interval length.
+    :param seed: The random seed.
+    :return: A list of (start, end) tuples.
+    """
+    rng = random.Random(seed)
+    starts = [rng.randrange(span) for _ in range(count)]
+    return [(start, start + rng.randint(1, longest)) for start in starts]
+
+
+def timed(function: Callable, *args) -> Tuple[Any, float]:
+    """
+    Call a function and measure how long it takes.
+
+    :return: The function's result and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def traced(function: Callable, *args) -> Tuple[Any, float, float]:
+    """
+    Call a function under tracemalloc and measure how long it takes and its peak memory.
+
+    :return: The function's result, the elapsed seconds and the peak traced memory in MiB.
+    """
+    tracemalloc.start()
+    try:
+        result, elapsed = timed(function, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def benchmark_index(sizes: List[int], queries: int = 10_000, scanned_queries: int = 5) -> None:
+    """
+    Time IntervalIndex stabbing and overlap queries and updates, and estimate the same queries as scans.
+
+    :param sizes: The numbers of intervals to index.
+    :param queries: The number of queries of each kind.
+    :param scanned_queries: The number of queries actually run as scans; the rest is extrapolated.
+    :return: None
+    """
+    print(f"{'intervals':>12} {'build (s)':>10} {'stab (s)':>9} {'overlap (s)':>12} {'insert+remove (s)':>18} "
+          f"{'scans, estimated (s)':>21}")
+    for count in sizes:
+        intervals = random_intervals(count)
+        rng = random.Random(1)
+        points = [rng.randrange(10_000_000) for _ in range(queries)]
+        ranges = [(point, point + rng.randint(1, 5_000)) for point in points]
+
+        index, build = timed(IntervalIndex, intervals)
+        _, stab = timed(lambda: [index.stab(point) for point in points])
+        _, overlap = timed(lambda: [index.overlap(start, end) for start, end in ranges])
+        updates = random_intervals(queries, seed=2)
+
+        def insert_and_remove():
+            for interval in updates:
+                index.insert(*interval)
+            for interval in updates:
+                index.remove(*interval)
+
+        _, update = timed(insert_and_remove)
+
+        start = time.perf_counter()
+        for point, (low, high) in zip(points[:scanned_queries], ranges):
+            assert sorted(interval for interval in intervals if interval[0] <= point < interval[1]) == index.stab(point)
+            assert sorted(interval for interval in intervals if interval[0] < high and interval[1] > low) == \
+                index.overlap(low, high)
+        scanned = (time.perf_counter() - start) * queries / scanned_queries
+        print(f"{count:>12,} {build:>10.2f} {stab:>9.2f} {overlap:>12.2f} {update:>18.2f} {scanned:>21.0f}")
+
+
+def benchmark_results(sizes: List[int], windows: Sequence[int] = (1, 1_000, 100_000, 1_000_000, 10_000_000),
+                      queried: int = 2_000_000) -> None:
+    """
+    Measure how the cost of IntervalIndex.overlap grows with the number of intervals it finds.
+
+    Each window length is queried at random places until about `queried` intervals have been
+    found in total. If the cost per interval found stays flat or falls as the results grow, the
+    walk is not paying O(log n) for every interval.
+
+    :param sizes: The numbers of intervals to index.
+    :param windows: The lengths of the query ranges.
+    :param queried: The total number of intervals to find with each window length.
+    :return: None
+    """
+    print(f"{'intervals':>12} {'window':>12} {'queries':>8} {'found/query':>12} {'us/query':>10} {'ns/found':>9}")
+    for count in sizes:
+        index = IntervalIndex(random_intervals(count), seed=0)
+        rng = random.Random(1)
+        for window in windows:
+            # Roughly count / 10_000_000 intervals start per time unit, each lasting about 500 units
+            expected = max(1.0, count * (window + 500) / 10_000_000)
+            ranges = [(low, low + window) for low in (rng.randrange(10_000_000 - window + 1)
+                                                      for _ in range(max(1, min(10_000, int(queried / expected)))))]
+            results, elapsed = timed(lambda: [len(index.overlap(low, high)) for low, high in ranges])
+            found = sum(results)
+            print(f"{count:>12,} {window:>12,} {len(ranges):>8,} {found / len(ranges):>12,.0f} "
+                  f"{elapsed / len(ranges) * 1e6:>10.1f} {elapsed / max(found, 1) * 1e9:>9.0f}")
+
+
+def benchmark_arrays(sizes: List[int], sample: int = 2_000_000) -> None:
+    """
+    Compare merge_intervals with the NumPy merge_interval_arrays.
+
+    merge_intervals is timed on at most `sample` intervals and scaled up linearly (plus the sort's
+    log factor), since tens of millions of tuples do not fit in memory; the arrays are full size.
+
+    :param sizes: The numbers of intervals to merge.
+    :param sample: The most intervals merge_intervals is actually run on.
+    :return: None
+    """
+    if np is None:
+        print("NumPy is not installed, so the array version cannot be benchmarked.")
+        return
+    print(f"{'intervals':>12} {'merge_intervals (s)':>20} {'arrays (s)':>11} {'speedup':>8}")
+    for count in sizes:
+        rng = np.random.default_rng(0)
+        span = count * 10
+        starts = rng.integers(0, span, count)
+        ends = starts + rng.integers(1, 20, count)
+
+        measured = min(count, sample)
+        intervals = list(zip(starts[:measured].tolist(), ends[:measured].tolist()))
+        _, loop = timed(merge_intervals, intervals)
+        del intervals
+        loop *= (count * np.log2(count)) / (measured * np.log2(measured))
+
+        _, vectorized = timed(merge_interval_arrays, starts, ends)
+        estimated = '' if measured == count else ' (est.)'
+        print(f"{count:>12,} {loop:>13.2f}{estimated:>7} {vectorized:>11.2f} {loop / vectorized:>7.1f}x")
+
+
+def benchmark_stream(sizes: List[int], files: int = 8, max_in_memory: int = 100_000) -> None:
+    """
+    Compare reading files into merge_intervals with streaming them through merge_intervals_iter.
+
+    The intervals are split over several files, sorted within each file. merge_intervals_iter
+    merges them as they are, and also sorts them externally as if they were unsorted.
+
+    :param sizes: The total numbers of intervals.
+    :param files: The number of files the intervals are split over.
+    :param max_in_memory: The run size of the external sort.
+    :return: None
+    """
+    print(f"{'intervals':>12} {'method':>16} {'time (s)':>9} {'peak (MiB)':>11}")
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            names = []
+            for part in range(files):
+                name = os.path.join(directory, f"part{part}.txt")
+                with open(name, 'w') as file:
+                    file.writelines(f"{start},{end}\n"
+                                    for start, end in sorted(random_intervals(count // files, seed=part)))
+                names.append(name)
+
+            def in_memory():
+                return merge_intervals([interval for name in names for interval in read_intervals(name)],
+                                       in_place=True)
+
+            def merged(presorted):
+                # Count the merged intervals without keeping them, as a consumer writing them out would
+                return sum(1 for _ in merge_intervals_iter(*names, presorted=presorted,
+                                                           max_in_memory=max_in_memory, spill_directory=directory))
+
+            methods = [('merge_intervals', lambda: len(in_memory())), ('presorted', lambda: merged(True)),
+                       ('external sort', lambda: merged(False))]
+            expected = None
+            for method, function in methods:
+                result, elapsed, peak = traced(function)
+                assert expected is None or result == expected
+                expected = result
+                print(f"{count:>12,} {method:>16} {elapsed:>9.2f} {peak:>11.1f}")
+
+
+def benchmark_memory(sizes: List[int]) -> None:
+    """
+    Measure the time and extra peak memory of merge_intervals in its default and in-place modes.
+
+    The intervals are built before tracing starts, so the peak is only what merge_intervals
+    allocates on top of its input: the default mode copies an unsorted list once and a sorted
+    one not at all, and the in-place mode never copies.
+
+    :param sizes: The numbers of intervals to merge.
+    :return: None
+    """
+    print(f"{'intervals':>12} {'input':>9} {'mode':>9} {'time (s)':>9} {'peak (MiB)':>11}")
+    for count in sizes:
+        unsorted = random_intervals(count)
+        for order, intervals in [('unsorted', unsorted), ('sorted', sorted(unsorted))]:
+            for mode, in_place in [('default', False), ('in place', True)]:
+                # The in-place mode reorders its input, so it gets its own copy, made before tracing
+                argument = list(intervals) if in_place else intervals
+                _, elapsed, peak = traced(merge_intervals, argument, in_place)
+                del argument
+                print(f"{count:>12,} {order:>9} {mode:>9} {elapsed:>9.2f} {peak:>11.1f}")
+
+
+def benchmark_set(sizes: List[int], operations: int = 20_000) -> None:
+    """
+    Measure IntervalSet updates as the set grows, to check that they stay logarithmic.
+
+    A set is built from mostly disjoint intervals, then timed over a batch of adds and a batch of
+    removes of short intervals at random places. If a splice shifted the whole list, the time
+    per operation would grow with the set; with buckets it should stay nearly flat.
+
+    :param sizes: The numbers of intervals the set is built from.
+    :param operations: The number of adds and of removes timed on each set.
+    :return: None
+    """
+    print(f"{'intervals':>12} {'merged':>10} {'build (s)':>10} {'add (us)':>9} {'remove (us)':>12}")
+    for count in sizes:
+        span = count * 1_000
+        interval_set, build = timed(IntervalSet, random_intervals(count, span=span, longest=100))
+        merged = len(interval_set)
+        rng = random.Random(1)
+        additions = [(start, start + rng.randint(1, 100)) for start in (rng.randrange(span) for _ in range(operations))]
+        removals = [(start, start + rng.randint(1, 100)) for start in (rng.randrange(span) for _ in range(operations))]
+        _, adding = timed(lambda: [interval_set.add(start, end) for start, end in additions])
+        _, removing = timed(lambda: [interval_set.remove(start, end) for start, end in removals])
+        print(f"{count:>12,} {merged:>10,} {build:>10.2f} {adding / operations * 1e6:>9.2f} "
+              f"{removing / operations * 1e6:>12.2f}")
+
+
+BENCHMARKS = {
+    'index': (benchmark_index, [100_000, 1_000_000]),
+    'results': (benchmark_results, [1_000_000]),
+    'arrays': (benchmark_arrays, [1_000_000, 10_000_000, 50_000_000]),
+    'stream': (benchmark_stream, [1_000_000, 4_000_000]),
+    'memory': (benchmark_memory, [1_000_000, 5_000_000]),
+    'set': (benchmark_set, [10_000, 100_000, 1_000_000, 4_000_000]),
+}
+
+
+def main():
+    """ Run the benchmarks named on the command line, or all of them. """
+    names = sys.argv[1:2] or list(BENCHMARKS)
+    for name in names:
+        benchmark, sizes = BENCHMARKS[name]
+        sizes = [int(size) for size in sys.argv[2:]] or sizes
+        print(f"\n== {name} ==")
+        benchmark(sizes)
+
+
+if __name__ == "__main__":
+    main()
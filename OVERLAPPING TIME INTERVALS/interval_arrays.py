@@ -0,0 +1,58 @@
+"""
+An optional NumPy version of merge_intervals for large arrays of intervals.
+
+The intervals are sorted with argsort, a running maximum of the end times (np.maximum.accumulate)
+gives the end of the merged interval reaching each position, and a new merged interval begins
+wherever a start time is past that running end. Every step is a vectorized operation, with no
+Python-level loop.
+
+NumPy is only needed by this module; time_intervals works without it.
+"""
+from typing import *
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only where NumPy is missing
+    np = None
+
+
+def merge_interval_arrays(starts, ends=None) -> Tuple[Any, Any]:
+    """
+    Merge overlapping intervals given as arrays, like merge_intervals.
+
+    Intervals that overlap or touch are merged, as in merge_intervals.
+
+    :param starts: The start times, or an N x 2 array of (start, end) rows if ends is omitted.
+    :param ends: The end times, one per start time.
+    :precondition: every start must be less than or equal to its end.
+    :return: Two arrays (merged_starts, merged_ends), sorted by start time.
+    :raises ImportError: If NumPy is not installed.
+    :raises ValueError: If the arrays do not have matching one-dimensional shapes.
+
+    >>> merged_starts, merged_ends = merge_interval_arrays(np.array([[8, 10], [1, 3], [2, 6], [15, 18]]))
+    >>> merged_starts.tolist(), merged_ends.tolist()
+    ([1, 8, 15], [6, 10, 18])
+    """
+    if np is None:
+        raise ImportError("The array version of merge_intervals needs NumPy; install it with 'pip install numpy'.")
+    if ends is None:
+        pairs = np.asarray(starts)
+        if pairs.ndim != 2 or pairs.shape[1] != 2:
+            raise ValueError("Expected an N x 2 array of (start, end) rows.")
+        starts, ends = pairs[:, 0], pairs[:, 1]
+    starts, ends = np.asarray(starts), np.asarray(ends)
+    if starts.ndim != 1 or starts.shape != ends.shape:
+        raise ValueError("starts and ends must be one-dimensional arrays of the same length.")
+    if not len(starts):
+        return starts.copy(), ends.copy()
+
+    # Step 1: Sort by start time; the order of equal starts does not change the result,
+    # so the faster unstable sort is used
+    order = np.argsort(starts)
+    sorted_starts = starts[order]
+    # Step 2: The furthest end reached by each interval and every interval before it
+    reach = np.maximum.accumulate(ends[order])
+    # Step 3: A merged interval begins where a start is past everything reached so far
+    begins = np.flatnonzero(np.r_[True, sorted_starts[1:] > reach[:-1]])
+    # Step 4: Each merged interval ends at the reach just before the next one begins
+    return sorted_starts[begins], reach[np.r_[begins[1:] - 1, len(reach) - 1]]
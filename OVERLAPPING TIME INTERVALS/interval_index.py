@@ -0,0 +1,280 @@
+"""
+An index of half-open time intervals [start, end) for overlap and stabbing queries.
+
+The intervals are kept in a treap (a binary search tree balanced by random priorities) ordered
+by (start, end). Every node also stores the largest end time in its subtree, so a query can
+skip any subtree whose intervals all end too early. Insertion and deletion take O(log n) expected
+time.
+
+A query walks the tree in order, keeping its path on a stack instead of descending again from the
+root for each interval it finds. It only enters nodes with a matching interval below them, so
+every node it visits without a match is an ancestor of an interval it reports (or of the node
+where it stops). A query finding k intervals therefore costs O(log n + k log(n / k)) expected: O(log n)
+when k is small, nearly O(1) per interval when k is a large share of the index, and never more
+than O(log n) per interval found. It is not the O(log n + k) of a priority search tree; the
+'results' benchmark measures the cost per interval found as k grows.
+"""
+import random
+from typing import *
+
+
+class _Node:
+    """ A treap node holding one distinct interval and how many times it was inserted. """
+    __slots__ = ('key', 'start', 'end', 'count', 'priority', 'left', 'right', 'max_end')
+
+    def __init__(self, start: int, end: int, priority: float):
+        self.key = (start, end)
+        self.start = start
+        self.end = end
+        self.count = 1
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+
+def _update(node: _Node) -> None:
+    """ Recompute a node's max_end from its own end and its children's. """
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+def _split(node: Optional[_Node], key: Tuple[int, int]) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """ Split a treap into the nodes with keys below key and the nodes with keys at or above it. """
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _join(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """ Join two treaps where every key of left is below every key of right. """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _join(left.right, right)
+        _update(left)
+        return left
+    right.left = _join(left, right.left)
+    _update(right)
+    return right
+
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    """ Insert a node whose key is not in the treap yet, and return the new root. """
+    if node is None:
+        return new
+    if new.priority > node.priority:
+        new.left, new.right = _split(node, new.key)
+        _update(new)
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    _update(node)
+    return node
+
+
+def _delete(node: _Node, key: Tuple[int, int]) -> Optional[_Node]:
+    """ Remove the node with the given key, which must be in the treap, and return the new root. """
+    if key == node.key:
+        return _join(node.left, node.right)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    _update(node)
+    return node
+
+
+class IntervalIndex:
+    """
+    A multiset of half-open intervals [start, end) that answers overlap and stabbing queries.
+
+    >>> index = IntervalIndex([(9, 12), (11, 14), (15, 17)])
+    >>> index.stab(11)
+    [(9, 12), (11, 14)]
+    >>> index.overlap(12, 15)
+    [(11, 14)]
+    >>> index.remove(11, 14)
+    >>> index.overlap(12, 15)
+    []
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = (), seed: Optional[int] = None):
+        """
+        Build an index, in O(n) time if the intervals are already sorted.
+
+        :param intervals: The (start, end) intervals to index.
+        :param seed: A seed for the random priorities, for reproducible tree shapes.
+        :raises ValueError: If an interval does not have start < end.
+        """
+        self._random = random.Random(seed)
+        self._root = None
+        self._size = 0
+        self._build(intervals)
+
+    def _build(self, intervals: Iterable[Tuple[int, int]]) -> None:
+        """
+        Build the treap from scratch as a Cartesian tree over the sorted distinct intervals.
+
+        :param intervals: The (start, end) intervals to index.
+        :return: None
+        """
+        intervals = list(intervals)
+        for start, end in intervals:
+            if not start < end:
+                raise ValueError(f"Interval ({start}, {end}) must have start < end.")
+        if any(intervals[index] > intervals[index + 1] for index in range(len(intervals) - 1)):
+            intervals.sort()
+
+        # Each node goes on the right spine, taking the lower-priority nodes it passes as its left subtree
+        spine = []
+        for start, end in intervals:
+            if spine and spine[-1].key == (start, end):
+                spine[-1].count += 1
+                continue
+            node = _Node(start, end, self._random.random())
+            below = None
+            while spine and spine[-1].priority < node.priority:
+                # A node leaving the spine has a final subtree
+                below = spine.pop()
+                _update(below)
+            node.left = below
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        self._root = spine[0] if spine else None
+        for node in reversed(spine):
+            _update(node)
+        self._size = len(intervals)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, interval: Tuple[int, int]) -> bool:
+        return self._find(tuple(interval)) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """ Yield every interval in (start, end) order, repeated as many times as it was inserted. """
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            for _ in range(node.count):
+                yield node.key
+            node = node.right
+
+    def _find(self, key: Tuple[int, int]) -> Optional[_Node]:
+        """
+        Find the node of an interval.
+
+        :param key: The (start, end) interval.
+        :return: Its node, or None if it is not in the index.
+        """
+        node = self._root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
+
+    def insert(self, start: int, end: int) -> None:
+        """
+        Add an interval in O(log n) expected time.
+
+        :param start: The start time (included).
+        :param end: The end time (excluded).
+        :return: None
+        :raises ValueError: If start is not less than end.
+        """
+        if not start < end:
+            raise ValueError(f"Interval ({start}, {end}) must have start < end.")
+        node = self._find((start, end))
+        if node is not None:
+            node.count += 1
+        else:
+            self._root = _insert(self._root, _Node(start, end, self._random.random()))
+        self._size += 1
+
+    def remove(self, start: int, end: int) -> None:
+        """
+        Remove one occurrence of an interval in O(log n) expected time.
+
+        :param start: The start time of the interval.
+        :param end: The end time of the interval.
+        :return: None
+        :raises KeyError: If the interval is not in the index.
+        """
+        node = self._find((start, end))
+        if node is None:
+            raise KeyError((start, end))
+        if node.count > 1:
+            node.count -= 1
+        else:
+            self._root = _delete(self._root, node.key)
+        self._size -= 1
+
+    def _search(self, low: int, high: int, touching: bool) -> List[Tuple[int, int]]:
+        """
+        Find the intervals [s, e) with e > low and s < high (or s <= high when touching).
+
+        The walk is in (start, end) order and keeps its path on a stack. It skips every subtree whose
+        max_end is at or before low, and stops at the first interval starting after high, so it costs
+        O(log n + k log(n / k)) expected for k intervals found (see the module docstring).
+
+        :param low: The time the intervals must end after.
+        :param high: The time the intervals must start before.
+        :param touching: Whether intervals starting exactly at high are included.
+        :return: The matching intervals, repeated as many times as they were inserted.
+        """
+        found = []
+        stack = []
+        node = self._root
+        while True:
+            while node is not None and node.max_end > low:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return found
+            node = stack.pop()
+            if node.start > high or (node.start == high and not touching):
+                return found
+            if node.end > low:
+                found.extend([node.key] * node.count)
+            node = node.right
+
+    def overlap(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Find the intervals that overlap [start, end).
+
+        :param start: The start of the query range (included).
+        :param end: The end of the query range (excluded).
+        :return: The intervals [s, e) with s < end and e > start, in (start, end) order.
+        :raises ValueError: If start is not less than end, since the range would be empty.
+        """
+        if not start < end:
+            raise ValueError(f"Query range ({start}, {end}) must have start < end.")
+        return self._search(start, end, False)
+
+    def stab(self, point: int) -> List[Tuple[int, int]]:
+        """
+        Find the intervals active at a point in time.
+
+        :param point: The point in time.
+        :return: The intervals [s, e) with s <= point < e, in (start, end) order.
+        """
+        return self._search(point, point, True)
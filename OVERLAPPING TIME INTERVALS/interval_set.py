@@ -0,0 +1,199 @@
+"""
+A set of time that keeps its intervals merged as they are added and removed.
+
+The intervals are closed [start, end], as in merge_intervals: intervals that overlap or touch are
+coalesced. The merged, disjoint intervals are kept in order, split into buckets of bounded size,
+with the first start and the last end of every bucket in two sorted lists. A binary search over
+those lists and then inside one bucket finds the neighbours of a new interval in O(log n), and
+the splice only moves the entries of the buckets it touches, so an add or remove that coalesces
+k intervals costs O(log n + k + bucket_size) plus moving one reference per bucket when a bucket is
+split or dropped, instead of shifting the whole list.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from operator import itemgetter
+from typing import *
+
+_start = itemgetter(0)
+_end = itemgetter(1)
+
+
+class IntervalSet:
+    """
+    Disjoint, merged intervals kept in sorted order.
+
+    >>> bookings = IntervalSet([(1, 3), (8, 10)])
+    >>> bookings.add(2, 6)
+    >>> bookings.add(6, 7)
+    >>> list(bookings)
+    [(1, 7), (8, 10)]
+    >>> bookings.remove(4, 5)
+    >>> list(bookings)
+    [(1, 4), (5, 7), (8, 10)]
+    >>> bookings.coverage(), 9 in bookings
+    (7, True)
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = (), bucket_size: int = 1000):
+        """
+        Create a set holding the given intervals.
+
+        :param intervals: The (start, end) intervals to add.
+        :param bucket_size: The number of intervals a bucket holds before it is split in two, halved.
+        :raises ValueError: If an interval has start > end.
+        """
+        self._bucket_size = bucket_size
+        self._buckets = []
+        self._firsts = []
+        self._lasts = []
+        self._len = 0
+        self._coverage = 0
+        for start, end in intervals:
+            self.add(start, end)
+
+    def _replace(self, low: Tuple[int, int], high: Tuple[int, int], pieces: List[Tuple[int, int]]) -> None:
+        """
+        Replace the intervals from one position up to another with new ones, keeping the buckets balanced.
+
+        :param low: The (bucket, offset) of the first interval replaced.
+        :param high: The (bucket, offset) just after the last interval replaced, in the same or a later bucket.
+        :param pieces: The intervals put in their place, in order.
+        :return: None
+        """
+        buckets, firsts, lasts = self._buckets, self._firsts, self._lasts
+        (low_bucket, low_offset), (high_bucket, high_offset) = low, high
+        replaced = list(chain.from_iterable(
+            buckets[bucket][low_offset if bucket == low_bucket else 0:high_offset if bucket == high_bucket else None]
+            for bucket in range(low_bucket, high_bucket + 1)))
+        self._coverage += sum(end - start for start, end in pieces) - sum(end - start for start, end in replaced)
+        self._len += len(pieces) - len(replaced)
+        if low_bucket == high_bucket:
+            buckets[low_bucket][low_offset:high_offset] = pieces
+            touched = [low_bucket]
+        else:
+            buckets[low_bucket][low_offset:] = pieces
+            del buckets[high_bucket][:high_offset]
+            # The buckets in between are dropped whole
+            del buckets[low_bucket + 1:high_bucket], firsts[low_bucket + 1:high_bucket], \
+                lasts[low_bucket + 1:high_bucket]
+            touched = [low_bucket + 1, low_bucket]
+        # Later buckets first, so the earlier positions stay valid
+        for position in touched:
+            bucket = buckets[position]
+            if not bucket:
+                del buckets[position], firsts[position], lasts[position]
+            elif len(bucket) > 2 * self._bucket_size:
+                half = bucket[self._bucket_size:]
+                del bucket[self._bucket_size:]
+                buckets.insert(position + 1, half)
+                firsts[position:position + 1] = [bucket[0][0], half[0][0]]
+                lasts[position:position + 1] = [bucket[-1][1], half[-1][1]]
+            else:
+                firsts[position], lasts[position] = bucket[0][0], bucket[-1][1]
+
+    def _insert(self, low: Tuple[int, int], interval: Tuple[int, int]) -> None:
+        """
+        Insert an interval that overlaps none of the others before the one at a position.
+
+        :param low: The (bucket, offset) of the interval it goes before; the bucket is len(buckets) at the end.
+        :param interval: The (start, end) interval.
+        :return: None
+        """
+        buckets = self._buckets
+        if not buckets:
+            buckets.append([])
+            self._firsts.append(interval[0])
+            self._lasts.append(interval[1])
+        if low[0] == len(buckets):
+            low = (len(buckets) - 1, len(buckets[-1]))
+        self._replace(low, low, [interval])
+
+    def add(self, start: int, end: int) -> None:
+        """
+        Add the interval [start, end], coalescing it with the intervals it overlaps or touches.
+
+        :param start: The start time of the interval.
+        :param end: The end time of the interval.
+        :return: None
+        :raises ValueError: If start > end.
+        """
+        if start > end:
+            raise ValueError(f"Interval ({start}, {end}) must have start <= end.")
+        buckets = self._buckets
+        # The intervals that end at or after start and begin at or before end are coalesced
+        low_bucket = bisect_left(self._lasts, start)
+        low_offset = 0 if low_bucket == len(buckets) else bisect_left(buckets[low_bucket], start, key=_end)
+        high_bucket = bisect_right(self._firsts, end) - 1
+        high_offset = 0 if high_bucket < 0 else bisect_right(buckets[high_bucket], end, key=_start)
+        if low_bucket == len(buckets) or high_bucket < 0 or (low_bucket, low_offset) >= (high_bucket, high_offset):
+            self._insert((low_bucket, low_offset), (start, end))
+            return
+        start = min(start, buckets[low_bucket][low_offset][0])
+        end = max(end, buckets[high_bucket][high_offset - 1][1])
+        self._replace((low_bucket, low_offset), (high_bucket, high_offset), [(start, end)])
+
+    def remove(self, start: int, end: int) -> None:
+        """
+        Subtract the open range (start, end), trimming or splitting the intervals it overlaps.
+
+        The endpoints themselves stay in the set, and pieces left with zero length are dropped,
+        so removing (4, 5) from [1, 7] leaves [1, 4] and [5, 7].
+
+        :param start: The start time of the range to remove.
+        :param end: The end time of the range to remove.
+        :return: None
+        :raises ValueError: If start > end.
+        """
+        if start > end:
+            raise ValueError(f"Range ({start}, {end}) must have start <= end.")
+        if start == end:
+            return
+        buckets = self._buckets
+        # The intervals that end after start and begin before end lose some of their time
+        low_bucket = bisect_right(self._lasts, start)
+        high_bucket = bisect_left(self._firsts, end) - 1
+        if low_bucket == len(buckets) or high_bucket < 0:
+            return
+        low_offset = bisect_right(buckets[low_bucket], start, key=_end)
+        high_offset = bisect_left(buckets[high_bucket], end, key=_start)
+        if (low_bucket, low_offset) >= (high_bucket, high_offset):
+            return
+        first, last = buckets[low_bucket][low_offset], buckets[high_bucket][high_offset - 1]
+        pieces = []
+        if first[0] < start:
+            pieces.append((first[0], start))
+        if last[1] > end:
+            pieces.append((end, last[1]))
+        self._replace((low_bucket, low_offset), (high_bucket, high_offset), pieces)
+
+    def coverage(self) -> int:
+        """
+        Return the total length of time covered by the set.
+
+        :return: The sum of end - start over the merged intervals.
+        """
+        return self._coverage
+
+    def __contains__(self, point: int) -> bool:
+        """
+        Check whether a point in time is covered, in O(log n).
+
+        :param point: The point in time.
+        :return: True if some interval [start, end] contains the point.
+        """
+        position = bisect_right(self._firsts, point) - 1
+        if position < 0:
+            return False
+        bucket = self._buckets[position]
+        return point <= bucket[bisect_right(bucket, point, key=_start) - 1][1]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """ Yield the merged intervals in order, as merge_intervals returns them. """
+        return chain.from_iterable(self._buckets)
+
+    def __len__(self) -> int:
+        """ Return the number of merged intervals. """
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)!r})"
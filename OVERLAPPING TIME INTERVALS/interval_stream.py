@@ -0,0 +1,201 @@
+"""
+Streaming merge_intervals for interval logs too large to hold in memory.
+
+merge_intervals_iter() takes one or more sources, each either an iterable of (start, end) pairs or
+the name of a file with one "start,end" pair per line. Sources that are already sorted by start time
+are k-way merged with heapq.merge, and the merged intervals are yielded one at a time, so memory
+holds one interval per source. Unsorted sources are first put through an external sort: they are
+read in runs of at most max_in_memory intervals, each run is sorted and spilled to a temporary file,
+and the runs are then k-way merged the same way. At most fan_in runs are open at once; while there
+are more, groups of fan_in runs are merged into longer runs, pass after pass, so memory and open
+files stay bounded however large the input is.
+"""
+import heapq
+import os
+import tempfile
+from itertools import chain
+from operator import itemgetter
+from typing import *
+
+Source = Union[str, os.PathLike, Iterable[Tuple[int, int]]]
+
+
+def read_intervals(file_name: Union[str, os.PathLike]) -> Iterator[Tuple[int, int]]:
+    """
+    Read the intervals of a file lazily.
+
+    :param file_name: A file with one "start,end" pair of integers per line; blank lines are skipped.
+    :return: An iterator of (start, end) tuples, in file order.
+    :raises ValueError: If a line is not a pair of integers.
+    """
+    with open(file_name) as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                start, end = line.split(',')
+                yield int(start), int(end)
+            except ValueError:
+                raise ValueError(f"Line {line_number} of '{file_name}' is not a 'start,end' pair.") from None
+
+
+def _open_source(source: Source) -> Iterable[Tuple[int, int]]:
+    """
+    Turn a source into an iterable of intervals.
+
+    :param source: A file name or an iterable of (start, end) pairs.
+    :return: An iterable of (start, end) pairs.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return read_intervals(source)
+    return source
+
+
+def _check_sorted(intervals: Iterable[Tuple[int, int]], position: int) -> Iterator[Tuple[int, int]]:
+    """
+    Pass intervals through, checking that their start times never decrease.
+
+    :param intervals: The intervals of one source.
+    :param position: The position of the source among the arguments, for the error message.
+    :return: An iterator of the same intervals.
+    :raises ValueError: As soon as an interval starts before the one preceding it.
+    """
+    previous = None
+    for interval in intervals:
+        if previous is not None and interval[0] < previous:
+            raise ValueError(f"Source {position} is not sorted by start time: {interval[0]} follows {previous}.")
+        previous = interval[0]
+        yield interval
+
+
+def _coalesce(intervals: Iterable[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+    """
+    Merge intervals sorted by start time, exactly as merge_intervals does, yielding each merged interval.
+
+    :param intervals: The intervals, sorted by start time.
+    :return: An iterator of merged (start, end) tuples.
+    """
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_start is None:
+            current_start, current_end = start, end
+        elif start <= current_end:
+            current_end = max(current_end, end)
+        else:
+            yield current_start, current_end
+            current_start, current_end = start, end
+    if current_start is not None:
+        yield current_start, current_end
+
+
+def _write_run(intervals: Iterable[Tuple[int, int]], directory: str) -> str:
+    """
+    Write sorted intervals to a new temporary file.
+
+    :param intervals: The intervals, sorted by start time.
+    :param directory: The directory for the file.
+    :return: The file name.
+    """
+    descriptor, file_name = tempfile.mkstemp(suffix='.txt', dir=directory)
+    with open(descriptor, 'w') as file:
+        file.writelines(f"{start},{end}\n" for start, end in intervals)
+    return file_name
+
+
+def _spill(run: List[Tuple[int, int]], directory: str) -> str:
+    """
+    Sort a run of intervals and write it to a temporary file.
+
+    :param run: The intervals of the run; it is sorted in place.
+    :param directory: The directory for the file.
+    :return: The file name.
+    """
+    run.sort(key=itemgetter(0))
+    return _write_run(run, directory)
+
+
+def _merge_runs(runs: List[str], fan_in: int, directory: str) -> List[str]:
+    """
+    Merge spilled runs in groups of fan_in until at most fan_in runs are left.
+
+    :param runs: The names of the run files; merged runs are deleted.
+    :param fan_in: The most runs merged at once.
+    :param directory: The directory for the merged runs.
+    :return: The names of the remaining runs.
+    """
+    while len(runs) > fan_in:
+        merged = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            if len(group) == 1:
+                merged.extend(group)
+                continue
+            merged.append(_write_run(heapq.merge(*map(read_intervals, group), key=itemgetter(0)), directory))
+            for file_name in group:
+                os.remove(file_name)
+        runs = merged
+    return runs
+
+
+def _external_sort(intervals: Iterable[Tuple[int, int]], max_in_memory: int, fan_in: int,
+                   directory: Optional[str]) -> Iterator[Tuple[int, int]]:
+    """
+    Sort intervals by start time, holding at most max_in_memory of them in memory at once.
+
+    :param intervals: The unsorted intervals.
+    :param max_in_memory: The largest run that is sorted in memory.
+    :param fan_in: The most spilled runs open at once.
+    :param directory: Where the temporary directory for the spilled runs is created (the system default if None).
+    :return: An iterator of the sorted intervals.
+    """
+    run = []
+    with tempfile.TemporaryDirectory(dir=directory) as spill_directory:
+        runs = []
+        for interval in intervals:
+            run.append(interval)
+            if len(run) >= max_in_memory:
+                runs.append(_spill(run, spill_directory))
+                run = []
+        if not runs:
+            # Everything fit in memory, so nothing needs to be spilled
+            run.sort(key=itemgetter(0))
+            yield from run
+            return
+        if run:
+            runs.append(_spill(run, spill_directory))
+            run = []
+        runs = _merge_runs(runs, fan_in, spill_directory)
+        yield from heapq.merge(*map(read_intervals, runs), key=itemgetter(0))
+
+
+def merge_intervals_iter(*sources: Source, presorted: bool = True, max_in_memory: int = 1_000_000,
+                         fan_in: int = 64, spill_directory: Optional[str] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Merge overlapping intervals from several sources lazily, like merge_intervals.
+
+    :param sources: Iterables of (start, end) pairs, or names of files with one "start,end" pair per line.
+    :param presorted: Whether every source is already sorted by start time. Sorted sources are merged
+                      in memory proportional to the number of sources; unsorted ones are sorted
+                      externally first.
+    :param max_in_memory: With presorted=False, the most intervals held in memory at once; larger
+                          inputs are sorted in runs of this size spilled to temporary files.
+    :param fan_in: With presorted=False, the most spilled runs merged (and open) at once.
+    :param spill_directory: Where the spill files are written (the system temporary directory by default).
+    :return: An iterator of the merged (start, end) tuples, in order.
+    :raises ValueError: With presorted=True, when a source turns out not to be sorted, or if
+                        max_in_memory is less than 1 or fan_in is less than 2.
+
+    >>> list(merge_intervals_iter([(1, 3), (8, 10)], [(2, 6), (15, 18)]))
+    [(1, 6), (8, 10), (15, 18)]
+    >>> list(merge_intervals_iter([(4, 5), (1, 4)], presorted=False))
+    [(1, 5)]
+    """
+    if max_in_memory < 1:
+        raise ValueError("max_in_memory must be at least 1.")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+    streams = map(_open_source, sources)
+    if presorted:
+        checked = [_check_sorted(stream, position) for position, stream in enumerate(streams)]
+        return _coalesce(heapq.merge(*checked, key=itemgetter(0)))
+    return _coalesce(_external_sort(chain.from_iterable(streams), max_in_memory, fan_in, spill_directory))
@@ -0,0 +1,35 @@
+import random
+import unittest
+from interval_arrays import np, merge_interval_arrays
+from time_intervals import merge_intervals
+
+
+@unittest.skipUnless(np is not None, "NumPy is not installed")
+class TestMergeIntervalArrays(unittest.TestCase):
+    def test_examples(self):
+        starts, ends = merge_interval_arrays([1, 2, 8, 15], [3, 6, 10, 18])
+        self.assertEqual(list(zip(starts.tolist(), ends.tolist())), [(1, 6), (8, 10), (15, 18)])
+        starts, ends = merge_interval_arrays(np.array([[1, 4], [4, 5]]))
+        self.assertEqual(list(zip(starts.tolist(), ends.tolist())), [(1, 5)])
+        starts, ends = merge_interval_arrays(np.empty((0, 2), dtype=np.int64))
+        self.assertEqual((len(starts), len(ends)), (0, 0))
+
+    def test_matches_merge_intervals(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            intervals = []
+            for _ in range(rng.randint(1, 50)):
+                start = rng.randint(0, 200)
+                intervals.append((start, start + rng.randint(0, 30)))
+            starts, ends = merge_interval_arrays(np.array(intervals))
+            self.assertEqual(list(zip(starts.tolist(), ends.tolist())), merge_intervals(list(intervals)))
+
+    def test_invalid_shapes(self):
+        with self.assertRaises(ValueError):
+            merge_interval_arrays(np.array([1, 2, 3]))
+        with self.assertRaises(ValueError):
+            merge_interval_arrays([1, 2], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from interval_index import IntervalIndex
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def check_tree(self, index):
+        """ Check the search-tree order, heap order and max_end of every node. """
+        def visit(node, low, high):
+            if node is None:
+                return None
+            self.assertTrue(low is None or node.key > low)
+            self.assertTrue(high is None or node.key < high)
+            for child in (node.left, node.right):
+                if child is not None:
+                    self.assertLessEqual(child.priority, node.priority)
+            ends = [node.end] + [end for end in (visit(node.left, low, node.key), visit(node.right, node.key, high))
+                                 if end is not None]
+            self.assertEqual(node.max_end, max(ends))
+            return node.max_end
+        visit(index._root, None, None)
+
+    def test_queries(self):
+        index = IntervalIndex([(15, 17), (9, 12), (11, 14), (9, 12)])
+        self.assertEqual(list(index), [(9, 12), (9, 12), (11, 14), (15, 17)])
+        self.assertEqual(index.stab(11), [(9, 12), (9, 12), (11, 14)])
+        self.assertEqual(index.stab(14), [])
+        self.assertEqual(index.stab(15), [(15, 17)])
+        self.assertEqual(index.overlap(12, 15), [(11, 14)])
+        self.assertEqual(index.overlap(14, 15), [])
+        self.assertEqual(index.overlap(0, 100), list(index))
+        # An empty or reversed range is rejected rather than answered as stab(11)
+        with self.assertRaises(ValueError):
+            index.overlap(11, 11)
+        with self.assertRaises(ValueError):
+            index.overlap(12, 11)
+        self.assertIn((11, 14), index)
+        self.assertNotIn((11, 13), index)
+
+    def test_insert_and_remove(self):
+        index = IntervalIndex()
+        index.insert(1, 5)
+        index.insert(1, 5)
+        index.insert(3, 4)
+        index.remove(1, 5)
+        self.assertEqual(list(index), [(1, 5), (3, 4)])
+        self.assertEqual(len(index), 2)
+        with self.assertRaises(KeyError):
+            index.remove(2, 3)
+        with self.assertRaises(ValueError):
+            index.insert(5, 5)
+        with self.assertRaises(ValueError):
+            IntervalIndex([(3, 1)])
+
+    def test_random_operations_match_brute_force(self):
+        rng = random.Random(0)
+        intervals = []
+        for _ in range(300):
+            start = rng.randint(0, 500)
+            intervals.append((start, start + rng.randint(1, 60)))
+        index = IntervalIndex(intervals, seed=1)
+        self.check_tree(index)
+        for step in range(2000):
+            if intervals and rng.random() < 0.4:
+                interval = intervals.pop(rng.randrange(len(intervals)))
+                index.remove(*interval)
+            elif rng.random() < 0.5:
+                start = rng.randint(0, 500)
+                interval = (start, start + rng.randint(1, 60))
+                intervals.append(interval)
+                index.insert(*interval)
+            start = rng.randint(-10, 560)
+            end = start + rng.randint(1, 40)
+            self.assertEqual(index.overlap(start, end), sorted(i for i in intervals if i[0] < end and i[1] > start))
+            self.assertEqual(index.stab(start), sorted(i for i in intervals if i[0] <= start < i[1]))
+            if step % 200 == 0:
+                self.check_tree(index)
+        self.assertEqual(list(index), sorted(intervals))
+        self.assertEqual(len(index), len(intervals))
+
+
+if __name__ == "__main__":
+    unittest.main()
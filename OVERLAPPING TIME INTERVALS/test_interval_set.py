@@ -0,0 +1,105 @@
+import random
+import unittest
+from interval_set import IntervalSet
+from time_intervals import merge_intervals
+
+
+class TestIntervalSet(unittest.TestCase):
+    def test_add_coalesces_neighbours(self):
+        intervals = IntervalSet()
+        intervals.add(8, 10)
+        intervals.add(1, 3)
+        intervals.add(15, 18)
+        intervals.add(2, 6)
+        self.assertEqual(list(intervals), [(1, 6), (8, 10), (15, 18)])
+        intervals.add(6, 8)
+        self.assertEqual(list(intervals), [(1, 10), (15, 18)])
+        intervals.add(0, 20)
+        self.assertEqual(list(intervals), [(0, 20)])
+        self.assertEqual(len(intervals), 1)
+        with self.assertRaises(ValueError):
+            intervals.add(3, 2)
+
+    def test_remove(self):
+        intervals = IntervalSet([(1, 10), (12, 15)])
+        intervals.remove(3, 5)
+        self.assertEqual(list(intervals), [(1, 3), (5, 10), (12, 15)])
+        intervals.remove(8, 13)
+        self.assertEqual(list(intervals), [(1, 3), (5, 8), (13, 15)])
+        intervals.remove(1, 3)
+        intervals.remove(4, 4)
+        self.assertEqual(list(intervals), [(5, 8), (13, 15)])
+        intervals.remove(0, 100)
+        self.assertEqual(list(intervals), [])
+        self.assertEqual(intervals.coverage(), 0)
+
+    def test_coverage_and_membership(self):
+        intervals = IntervalSet([(1, 4), (4, 5), (7, 7), (9, 12)])
+        self.assertEqual(list(intervals), [(1, 5), (7, 7), (9, 12)])
+        self.assertEqual(intervals.coverage(), 7)
+        for point, expected in [(0, False), (1, True), (5, True), (6, False), (7, True), (8.5, False), (12, True)]:
+            self.assertEqual(point in intervals, expected, point)
+
+    def test_random_insertion_orders_match_merge_intervals(self):
+        """ Property: for any intervals added in any order, the set equals merge_intervals of them. """
+        rng = random.Random(0)
+        for _ in range(500):
+            count = rng.randint(0, 30)
+            intervals = []
+            for _ in range(count):
+                start = rng.randint(0, 100)
+                intervals.append((start, start + rng.choice([0, 1, rng.randint(0, 20)])))
+            interval_set = IntervalSet()
+            for start, end in rng.sample(intervals, len(intervals)):
+                interval_set.add(start, end)
+            merged = merge_intervals(list(intervals))
+            self.assertEqual(list(interval_set), merged)
+            self.assertEqual(interval_set.coverage(), sum(end - start for start, end in merged))
+
+    def test_random_removals_match_point_model(self):
+        """ Property: after adds and removes, coverage and membership match a brute-force model. """
+        rng = random.Random(1)
+        for _ in range(300):
+            interval_set = IntervalSet()
+            covered = set()
+            for _ in range(rng.randint(1, 25)):
+                start = rng.randint(0, 60)
+                end = start + rng.randint(1, 15)
+                # Unit cells [k, k + 1] stand for the time between whole numbers
+                if rng.random() < 0.6:
+                    interval_set.add(start, end)
+                    covered.update(range(start, end))
+                else:
+                    interval_set.remove(start, end)
+                    covered.difference_update(range(start, end))
+            self.assertEqual(interval_set.coverage(), len(covered))
+            for cell in range(-1, 80):
+                self.assertEqual(cell + 0.5 in interval_set, cell in covered)
+            pairs = list(interval_set)
+            self.assertTrue(all(end < next_start for (_, end), (next_start, _) in zip(pairs, pairs[1:])))
+
+    def test_small_buckets_match_point_model(self):
+        """ Property: with buckets of one or two intervals, adds and removes that span buckets stay exact. """
+        rng = random.Random(2)
+        for _ in range(300):
+            interval_set = IntervalSet(bucket_size=rng.randint(1, 2))
+            covered = set()
+            for _ in range(rng.randint(1, 40)):
+                start = rng.randint(0, 100)
+                end = start + rng.choice([1, 2, rng.randint(1, 40)])
+                if rng.random() < 0.7:
+                    interval_set.add(start, end)
+                    covered.update(range(start, end))
+                else:
+                    interval_set.remove(start, end)
+                    covered.difference_update(range(start, end))
+                pairs = list(interval_set)
+                self.assertEqual(len(interval_set), len(pairs))
+                self.assertTrue(all(end < next_start for (_, end), (next_start, _) in zip(pairs, pairs[1:])))
+            self.assertEqual(interval_set.coverage(), len(covered))
+            for cell in range(-1, 150):
+                self.assertEqual(cell + 0.5 in interval_set, cell in covered)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import os
+import random
+import tempfile
+import unittest
+from interval_stream import merge_intervals_iter, read_intervals
+from time_intervals import merge_intervals
+
+
+class TestMergeIntervalsIter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, intervals):
+        file_name = os.path.join(self.directory.name, name)
+        with open(file_name, 'w') as file:
+            file.writelines(f"{start},{end}\n" for start, end in intervals)
+        return file_name
+
+    def test_merges_sorted_sources(self):
+        morning = self.write('morning.txt', [(1, 3), (8, 10)])
+        self.assertEqual(list(merge_intervals_iter(morning, [(2, 6), (15, 18)])), [(1, 6), (8, 10), (15, 18)])
+        self.assertEqual(list(merge_intervals_iter([(1, 4)], [(4, 5)])), [(1, 5)])
+        self.assertEqual(list(merge_intervals_iter()), [])
+        self.assertEqual(list(merge_intervals_iter([], [(3, 3)])), [(3, 3)])
+
+    def test_is_lazy(self):
+        # An endless source still yields its merged intervals one at a time
+        endless = ((start, start + 1) for start in itertools.count(0, 3))
+        self.assertEqual(list(itertools.islice(merge_intervals_iter(endless, [(1, 4)]), 3)),
+                         [(0, 4), (6, 7), (9, 10)])
+
+    def test_unsorted_source_raises(self):
+        with self.assertRaisesRegex(ValueError, "Source 1"):
+            list(merge_intervals_iter([(1, 2)], [(5, 6), (3, 4)]))
+        with self.assertRaises(ValueError):
+            merge_intervals_iter([(1, 2)], presorted=False, max_in_memory=0)
+        with self.assertRaises(ValueError):
+            merge_intervals_iter([(1, 2)], presorted=False, fan_in=1)
+
+    def test_bad_line_raises(self):
+        file_name = self.write('bad.txt', [(1, 2)])
+        with open(file_name, 'a') as file:
+            file.write("\n3;4\n")
+        with self.assertRaisesRegex(ValueError, "Line 3"):
+            list(read_intervals(file_name))
+
+    def test_external_sort_matches_merge_intervals(self):
+        rng = random.Random(0)
+        for trial in range(20):
+            sources = []
+            for _ in range(rng.randint(1, 4)):
+                starts = [rng.randrange(200) for _ in range(rng.randint(0, 60))]
+                sources.append([(start, start + rng.randint(0, 10)) for start in starts])
+            expected = merge_intervals([interval for source in sources for interval in source]) \
+                if any(sources) else []
+            spill_directory = os.path.join(self.directory.name, str(trial))
+            os.mkdir(spill_directory)
+            merged = merge_intervals_iter(*sources, presorted=False, max_in_memory=rng.randint(1, 50),
+                                          fan_in=rng.randint(2, 5), spill_directory=spill_directory)
+            self.assertEqual(list(merged), expected)
+            self.assertEqual(os.listdir(spill_directory), [])
+
+            # The same intervals, each source sorted, need no external sort
+            self.assertEqual(list(merge_intervals_iter(*(sorted(source) for source in sources))), expected)
+
+    def test_fan_in_bounds_open_runs(self):
+        # 500 one-interval runs merged three at a time never have more than three runs open
+        rng = random.Random(1)
+        intervals = [(start, start + 1) for start in rng.sample(range(0, 5000, 3), 500)]
+        spill_directory = os.path.join(self.directory.name, 'spill')
+        os.mkdir(spill_directory)
+        largest = 0
+        original_merge = heapq.merge
+
+        def counting_merge(*iterables, **kwargs):
+            nonlocal largest
+            largest = max(largest, len(iterables))
+            return original_merge(*iterables, **kwargs)
+
+        heapq.merge = counting_merge
+        try:
+            merged = list(merge_intervals_iter(intervals, presorted=False, max_in_memory=1, fan_in=3,
+                                               spill_directory=spill_directory))
+        finally:
+            heapq.merge = original_merge
+        self.assertEqual(merged, sorted(intervals))
+        self.assertEqual(largest, 3)
+        self.assertEqual(os.listdir(spill_directory), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
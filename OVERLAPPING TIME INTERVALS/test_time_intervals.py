@@ -26,5 +26,16 @@ class TestMergeIntervals(unittest.TestCase):
         intervals = [(1, 10), (2, 5), (6, 12)]
         self.assertEqual(merge_intervals(intervals), [(1, 12)])
 
+    def test_input_is_not_modified(self):
+        intervals = [(8, 10), (15, 18), (1, 3), (2, 6)]
+        self.assertEqual(merge_intervals(intervals), [(1, 6), (8, 10), (15, 18)])
+        self.assertEqual(intervals, [(8, 10), (15, 18), (1, 3), (2, 6)])
+
+    def test_in_place_sorts_input(self):
+        intervals = [(8, 10), (15, 18), (1, 3), (2, 6)]
+        self.assertEqual(merge_intervals(intervals, in_place=True), [(1, 6), (8, 10), (15, 18)])
+        self.assertEqual(intervals, [(1, 3), (2, 6), (8, 10), (15, 18)])
+        self.assertEqual(merge_intervals([], in_place=True), [])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
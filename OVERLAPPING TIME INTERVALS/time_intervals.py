@@ -1,10 +1,16 @@
+from itertools import islice
 from typing import *
 
-def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+def merge_intervals(intervals: List[Tuple[int, int]], in_place: bool = False) -> List[Tuple[int, int]]:
     """
     Merge overlapping time intervals.
 
+    By default the caller's list is left untouched: a list that is already sorted is read as it is,
+    and any other list is read through a sorted copy. With in_place=True the list is sorted in place
+    instead, so no copy is made at all; use it only when the caller owns the list.
+
     :param intervals: A list of tuples, where each tuple represents a time interval (start, end).
+    :param in_place: Whether to sort the caller's list in place instead of leaving it unchanged.
     :precondition: intervals must be a list of tuples that contain integers.
     :postcondition: Returns a list of tuples containing the merged intervals.
     :return: A list of tuples, where each tuple represents a merged time interval (start, end).
@@ -16,6 +22,12 @@ def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
     >>> test_intervals = [(1, 4), (4, 5)]
     >>> merge_intervals(test_intervals)
     [(1, 5)]
+
+    >>> test_intervals = [(8, 10), (1, 3), (2, 6)]
+    >>> merge_intervals(test_intervals), test_intervals
+    ([(1, 6), (8, 10)], [(8, 10), (1, 3), (2, 6)])
+    >>> merge_intervals(test_intervals, in_place=True), test_intervals
+    ([(1, 6), (8, 10)], [(1, 3), (2, 6), (8, 10)])
     """
     # Step 1: Handle the edge case where the input list is empty
     # If there are no intervals, there is nothing to merge, so return an empty list.
@@ -26,16 +38,26 @@ def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
     # Sorting ensures that we process intervals in the order of their start times.
     # This makes it easier to compare adjacent intervals and detect overlaps.
     # For example, intervals [(8, 10), (1, 3), (2, 6)] will be sorted to [(1, 3), (2, 6), (8, 10)].
-    intervals.sort(key=lambda x: x[0])
+    # In place, the caller's list itself is sorted. Otherwise a list that is already in order is
+    # used as it is (checking costs one pass and no memory), and only an unsorted list is copied.
+    if in_place:
+        intervals.sort(key=lambda x: x[0])
+        ordered = intervals
+    elif all(previous[0] <= interval[0] for previous, interval in zip(intervals, islice(intervals, 1, None))):
+        ordered = intervals
+    else:
+        ordered = sorted(intervals, key=lambda x: x[0])
 
     # Step 3: Initialize the list of merged intervals
     # Start by adding the first interval from the sorted list to the merged_intervals list.
     # This serves as the "base" interval that we will compare others against.
-    merged_intervals = [intervals[0]]
+    # An iterator over the sorted list hands out the first interval, then the rest, without slicing a copy.
+    remaining = iter(ordered)
+    merged_intervals = [next(remaining)]
 
     # Step 4: Iterate through the rest of the intervals
-    # We start from the second interval (intervals[1:]) since the first one is already in merged_intervals.
-    for current_start, current_end in intervals[1:]:
+    # We continue from the second interval, since the first one is already in merged_intervals.
+    for current_start, current_end in remaining:
         # Step 4.1: Retrieve the last interval from the merged_intervals list
         # This is the interval we will compare the current interval to.
         last_start, last_end = merged_intervals[-1]
@@ -0,0 +1,159 @@
+"""
+Benchmarks for the grade analysis.
+
+Run a single benchmark by name, for example:
+
+    python benchmark_grades.py arrays 50000000
+"""
+import random
+import sys
+import time
+
+from grades_analysis import (
+    GradeBook,
+    calculate_subject_averages,
+    count_students_in_grade_ranges,
+    highest_grade_per_subject
+)
+from grades_arrays import np, GradeArrays
+
+SUBJECTS = ['Math', 'Science', 'English', 'History', 'Art', 'Music', 'Biology', 'Chemistry', 'Physics',
+            'Geography']
+
+
+def synthetic_records(count, students=100_000, seed=0):
+    """
+    Generates grade records shaped like the output of read_file.
+
+    Args:
+        count (int): The number of records.
+        students (int): The number of distinct students.
+        seed (int): The random seed.
+
+    Returns:
+        list[dict]: The records.
+    """
+    rng = random.Random(seed)
+    return [{'name': f"Student {rng.randrange(students)}", 'subject': rng.choice(SUBJECTS),
+             'grade': str(rng.randint(0, 100))} for _ in range(count)]
+
+
+def timed(function, *args):
+    """
+    Calls a function and measures how long it takes.
+
+    Returns:
+        tuple: The function's result and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_arrays(sizes, sample=1_000_000, students=100_000):
+    """
+    Compares the three loop-based aggregates with the NumPy backend.
+
+    The loop-based functions parse every grade with int() as they go, so loading the records
+    into columns with GradeArrays.from_records (parsing and factorizing) is timed too, and the
+    speedup is given both for the queries alone and with the load included. The loops and the
+    load are timed on at most `sample` records and scaled up linearly, since tens of millions of
+    record dictionaries do not fit in memory. The array columns are generated directly at full
+    size for the queries.
+    """
+    if np is None:
+        print("NumPy is not installed, so the array backend cannot be benchmarked.")
+        return
+    print(f"{'rows':>12} {'loops (s)':>10} {'load (s)':>9} {'arrays (s)':>11} {'queries speedup':>16} "
+          f"{'with load':>10}")
+    for count in sizes:
+        records = synthetic_records(min(count, sample), students)
+        scale = count / len(records)
+        start = time.perf_counter()
+        calculate_subject_averages(records)
+        count_students_in_grade_ranges(records)
+        highest_grade_per_subject(records)
+        loops = (time.perf_counter() - start) * scale
+
+        _, load = timed(GradeArrays.from_records, records)
+        load *= scale
+        del records
+
+        rng = np.random.default_rng(0)
+        arrays = GradeArrays(rng.integers(0, 101, count, dtype=np.int16),
+                             rng.integers(0, len(SUBJECTS), count, dtype=np.int32), SUBJECTS,
+                             rng.integers(0, students, count, dtype=np.int32),
+                             [f"Student {index}" for index in range(students)])
+        start = time.perf_counter()
+        arrays.calculate_subject_averages()
+        arrays.count_students_in_grade_ranges()
+        arrays.highest_grade_per_subject()
+        vectorized = time.perf_counter() - start
+        estimated = '*' if scale > 1 else ' '
+        print(f"{count:>12,} {loops:>9.2f}{estimated} {load:>8.2f}{estimated} {vectorized:>11.2f} "
+              f"{loops / vectorized:>15.1f}x {loops / (load + vectorized):>9.1f}x")
+    print("* estimated from a sample")
+
+
+def scan_transcript(data, name):
+    """
+    Answers a transcript query by scanning every record, as the subject-centric functions do.
+
+    Returns:
+        tuple: The student's transcript (as in GradeBook.transcript) and average grade.
+    """
+    grades_by_subject = {}
+    for entry in data:
+        grades_by_subject.setdefault(entry['subject'], []).append(int(entry['grade']))
+    transcript = []
+    for entry in data:
+        if entry['name'] == name:
+            grades, grade = grades_by_subject[entry['subject']], int(entry['grade'])
+            below = sum(other < grade for other in grades)
+            equal = sum(other == grade for other in grades)
+            transcript.append({'subject': entry['subject'], 'grade': grade, 'rank': len(grades) - below - equal + 1,
+                               'percentile': 100 * (below + equal / 2) / len(grades)})
+    return transcript, sum(row['grade'] for row in transcript) / len(transcript)
+
+
+def benchmark_gradebook(sizes, lookups=100_000, scanned_lookups=3, students=100_000):
+    """
+    Times transcript lookups against a GradeBook, and estimates the same lookups as scans.
+    """
+    print(f"{'rows':>12} {'build (s)':>10} {f'{lookups:,} lookups (s)':>20} {'scans, estimated (s)':>21}")
+    for count in sizes:
+        records = synthetic_records(count, students)
+        rng = random.Random(1)
+        names = [records[rng.randrange(count)]['name'] for _ in range(lookups)]
+
+        book, build = timed(GradeBook, records)
+        start = time.perf_counter()
+        for name in names:
+            book.transcript(name)
+            book.average(name)
+        indexed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names[:scanned_lookups]:
+            assert scan_transcript(records, name) == (book.transcript(name), book.average(name))
+        scanned = (time.perf_counter() - start) * lookups / scanned_lookups
+        print(f"{count:>12,} {build:>10.2f} {indexed:>20.2f} {scanned:>21.0f}")
+
+
+BENCHMARKS = {
+    'arrays': (benchmark_arrays, [1_000_000, 50_000_000]),
+    'gradebook': (benchmark_gradebook, [1_000_000]),
+}
+
+
+def main():
+    names = sys.argv[1:2] or list(BENCHMARKS)
+    for name in names:
+        benchmark, sizes = BENCHMARKS[name]
+        sizes = [int(size) for size in sys.argv[2:]] or sizes
+        print(f"\n== {name} ==")
+        benchmark(sizes)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,7 @@
+import math
+from bisect import bisect_left, bisect_right
+
+
 def read_file(file_name):
     """
     Reads a file and returns its contents as a list of dictionaries.
@@ -32,6 +36,28 @@ def read_file(file_name):
     return data
 
 
+def iter_records(file_name):
+    """
+    Reads a file one record at a time, in constant memory.
+
+    The records are the same dictionaries that read_file returns, for files too large to
+    hold in memory as a list.
+
+    Args:
+        file_name (str): The name of the file to read (e.g., 'grades.txt').
+
+    Yields:
+        dict: Each record of the file. If the file is not found, nothing is yielded.
+    """
+    try:
+        with open(file_name, 'r') as file:
+            headers = file.readline().strip().split(',')
+            for line in file:
+                yield dict(zip(headers, line.strip().split(',')))
+    except FileNotFoundError:
+        print(f"Error: File '{file_name}' not found.")
+
+
 def calculate_subject_averages(data):
     """
     Calculates the average grade for each subject in the data.
@@ -77,51 +103,111 @@ def find_top_students(data, threshold=90):
     return [entry for entry in data if int(entry['grade']) > threshold]
 
 
-def count_students_in_grade_ranges(data):
+# The default grade ranges: the lowest grade of every range except the first, which starts at 0
+GRADE_BOUNDARIES = (60, 70, 80, 90)
+# The range that counts grades that are not whole numbers from 0 to 100
+INVALID_GRADES = "invalid"
+
+
+def grade_range_table(boundaries=GRADE_BOUNDARIES, labels=None):
+    """
+    Builds the lookup table that maps every grade from 0 to 100 to its grade range.
+
+    Args:
+        boundaries (sequence[int]): The lowest grade of each range after the first, in
+                                    increasing order; the first range starts at 0 and the
+                                    last one ends at 100.
+        labels (sequence[str]): The name of each range, lowest range first. By default the
+                                ranges are named by their grades, e.g. "60-69".
+
+    Returns:
+        tuple: (table, labels), where table[grade] is the index in labels of the grade's range.
+
+    Raises:
+        ValueError: If the boundaries are not increasing grades from 1 to 100, or if the
+                    labels are repeated or do not match the number of ranges.
+    """
+    boundaries = list(boundaries)
+    starts = [0] + boundaries
+    if any(not 0 < boundary <= 100 for boundary in boundaries) or starts != sorted(set(starts)):
+        raise ValueError("Grade range boundaries must be increasing grades from 1 to 100.")
+    ends = [start - 1 for start in boundaries] + [100]
+    if labels is None:
+        labels = [f"{start}-{end}" for start, end in zip(starts, ends)]
+    elif len(labels) != len(starts):
+        raise ValueError(f"Expected {len(starts)} grade range labels, got {len(labels)}.")
+    if len(set(labels) | {INVALID_GRADES}) != len(labels) + 1:
+        raise ValueError(f"Grade range labels must be distinct and must not be '{INVALID_GRADES}'.")
+
+    table = []
+    for index, (start, end) in enumerate(zip(starts, ends)):
+        table.extend([index] * (end - start + 1))
+    return table, list(labels)
+
+
+def grade_range_counts(counts, labels, invalid):
+    """
+    Builds the result of count_students_in_grade_ranges from the count of every range.
+
+    Args:
+        counts (sequence[int]): The number of grades in each range, lowest range first.
+        labels (sequence[str]): The name of each range, lowest range first.
+        invalid (int): The number of invalid grades.
+
+    Returns:
+        dict: A dictionary where the keys are grade ranges, highest range first, followed
+              by "invalid", and the values are the number of students in each range.
+    """
+    ranges = {label: counts[index] for index, label in reversed(list(enumerate(labels)))}
+    ranges[INVALID_GRADES] = invalid
+    return ranges
+
+
+def count_students_in_grade_ranges(data, boundaries=GRADE_BOUNDARIES, labels=None):
     """
-    Counts the number of students in predefined grade ranges.
+    Counts the number of students in each grade range.
 
-    The grade ranges are:
+    The default grade ranges are:
         - 90–100
         - 80–89
         - 70–79
         - 60–69
         - 0–59
 
+    Other grading schemes (e.g., plus/minus letters) are given as range boundaries and labels.
+    Each grade is placed with a lookup table, so the cost per row does not grow with the number
+    of ranges. Grades that are not whole numbers from 0 to 100 are counted as "invalid".
+
     Args:
         data (list[dict]): A list of dictionaries where each dictionary contains
                            information about a student's grade in a subject.
+        boundaries (sequence[int]): The lowest grade of each range after the first (see
+                                    grade_range_table).
+        labels (sequence[str]): The name of each range, lowest range first.
 
     Returns:
-        dict: A dictionary where the keys are grade ranges (e.g., "90-100"),
-              and the values are the number of students in each range.
-    """
-    # Initialize the grade range counters
-    ranges = {
-        "90-100": 0,
-        "80-89": 0,
-        "70-79": 0,
-        "60-69": 0,
-        "0-59": 0
-    }
+        dict: A dictionary where the keys are grade ranges (e.g., "90-100"), highest range
+              first, followed by "invalid", and the values are the number of students in
+              each range.
+    """
+    table, labels = grade_range_table(boundaries, labels)
+    counts = [0] * len(labels)
+    invalid = 0
 
     for entry in data:
-        # Convert the grade to an integer
-        grade = int(entry['grade'])
-
-        # Increment the appropriate grade range counter
-        if 90 <= grade <= 100:
-            ranges["90-100"] += 1
-        elif 80 <= grade <= 89:
-            ranges["80-89"] += 1
-        elif 70 <= grade <= 79:
-            ranges["70-79"] += 1
-        elif 60 <= grade <= 69:
-            ranges["60-69"] += 1
+        try:
+            grade = int(entry['grade'])
+        except ValueError:
+            invalid += 1
+            continue
+
+        # Look up the grade's range instead of comparing it with every boundary
+        if 0 <= grade <= 100:
+            counts[table[grade]] += 1
         else:
-            ranges["0-59"] += 1
+            invalid += 1
 
-    return ranges
+    return grade_range_counts(counts, labels, invalid)
 
 
 def highest_grade_per_subject(data):
@@ -150,6 +236,292 @@ def highest_grade_per_subject(data):
     return highest_grades
 
 
+class SubjectStatistics:
+    """
+    Streaming statistics of one subject's grades.
+
+    The mean and variance are kept with Welford's algorithm, and the grades themselves in an
+    exact histogram with one bin per grade from 0 to 100, so the median and percentiles are
+    exact while memory stays constant. Statistics of separate chunks can be merged.
+    """
+
+    def __init__(self):
+        """
+        Creates the statistics of no grades.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._squares = 0.0  # The sum of squared differences from the mean
+        self.histogram = [0] * 101
+
+    def add(self, grade):
+        """
+        Adds one grade.
+
+        Args:
+            grade (int): A whole-number grade from 0 to 100.
+
+        Raises:
+            ValueError: If the grade is not from 0 to 100.
+        """
+        if not 0 <= grade <= 100:
+            raise ValueError(f"Grade {grade} is not from 0 to 100.")
+        self.histogram[grade] += 1
+        self.count += 1
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (grade - self.mean)
+
+    def merge(self, other):
+        """
+        Folds in the statistics of another chunk of grades.
+
+        Args:
+            other (SubjectStatistics): The statistics to add.
+
+        Returns:
+            SubjectStatistics: self.
+        """
+        count = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self._squares += other._squares + delta * delta * self.count * other.count / count
+            self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+            self.count = count
+        return self
+
+    def variance(self):
+        """
+        Returns the population variance of the grades (0.0 for no grades).
+        """
+        return self._squares / self.count if self.count else 0.0
+
+    def stdev(self):
+        """
+        Returns the population standard deviation of the grades (0.0 for no grades).
+        """
+        return math.sqrt(self.variance())
+
+    def _grade_at(self, rank):
+        """
+        Returns the grade at a position (from 0) of the sorted grades.
+        """
+        seen = 0
+        for grade, count in enumerate(self.histogram):
+            seen += count
+            if seen > rank:
+                return grade
+        raise IndexError(rank)
+
+    def quantile(self, fraction):
+        """
+        Returns a quantile of the grades, interpolating linearly between the grades on either side.
+
+        This is the "inclusive" method of statistics.quantiles, and NumPy's default.
+
+        Args:
+            fraction (float): The quantile, from 0 to 1 (e.g., 0.9 for the 90th percentile).
+
+        Returns:
+            float: The quantile.
+
+        Raises:
+            ValueError: If there are no grades or the fraction is not from 0 to 1.
+        """
+        if not self.count:
+            raise ValueError("There are no grades.")
+        if not 0 <= fraction <= 1:
+            raise ValueError("The quantile must be from 0 to 1.")
+        position = (self.count - 1) * fraction
+        below = math.floor(position)
+        low = self._grade_at(below)
+        high = self._grade_at(below + 1) if below + 1 < self.count else low
+        return low + (high - low) * (position - below)
+
+    def median(self):
+        """
+        Returns the median grade.
+        """
+        return self.quantile(0.5)
+
+    def summary(self):
+        """
+        Returns the main statistics of the grades.
+
+        Returns:
+            dict: The count, mean, standard deviation, median, 10th and 90th percentiles.
+        """
+        return {'count': self.count, 'mean': self.mean, 'stdev': self.stdev(), 'median': self.median(),
+                'p10': self.quantile(0.1), 'p90': self.quantile(0.9)}
+
+
+class GradeStatistics:
+    """
+    Streaming SubjectStatistics for every subject, built from records in one pass.
+
+    Records whose grade is not a whole number from 0 to 100 are counted in invalid rather
+    than included in any subject. Statistics of separate chunks or processes can be merged.
+    """
+
+    def __init__(self):
+        """
+        Creates the statistics of no records.
+        """
+        self.subjects = {}
+        self.invalid = 0
+
+    def update(self, data):
+        """
+        Adds every record of an iterable, such as read_file or iter_records output.
+
+        Args:
+            data (iterable[dict]): Records with 'subject' and 'grade' fields.
+
+        Returns:
+            GradeStatistics: self.
+        """
+        subjects = self.subjects
+        for entry in data:
+            try:
+                grade = int(entry['grade'])
+            except ValueError:
+                self.invalid += 1
+                continue
+            if not 0 <= grade <= 100:
+                self.invalid += 1
+                continue
+            statistics = subjects.get(entry['subject'])
+            if statistics is None:
+                statistics = subjects[entry['subject']] = SubjectStatistics()
+            statistics.add(grade)
+        return self
+
+    def merge(self, other):
+        """
+        Folds in the statistics of another chunk of records.
+
+        Args:
+            other (GradeStatistics): The statistics to add.
+
+        Returns:
+            GradeStatistics: self.
+        """
+        for subject, statistics in other.subjects.items():
+            self.subjects.setdefault(subject, SubjectStatistics()).merge(statistics)
+        self.invalid += other.invalid
+        return self
+
+    def summary(self):
+        """
+        Returns the main statistics of every subject.
+
+        Returns:
+            dict: A dictionary where the keys are subject names, and the values are
+                  dictionaries of statistics (see SubjectStatistics.summary).
+        """
+        return {subject: statistics.summary() for subject, statistics in self.subjects.items()}
+
+
+class GradeBook:
+    """
+    Per-student indexes over the records, for answering transcript queries without a scan.
+
+    The book is built once. It keeps the rows of each student, each subject's grades in sorted
+    order (so ranks and percentiles take O(log n) with bisect), and each student's average.
+    """
+
+    def __init__(self, data):
+        """
+        Builds the indexes.
+
+        Args:
+            data (list[dict]): A list of dictionaries where each dictionary contains
+                               information about a student's grade in a subject.
+        """
+        self.data = data
+        # Each grade is converted once, and kept by row
+        self.grades = [int(entry['grade']) for entry in data]
+        self.rows_by_student = {}
+        grades_by_subject = {}
+        for row, (entry, grade) in enumerate(zip(data, self.grades)):
+            self.rows_by_student.setdefault(entry['name'], []).append(row)
+            grades_by_subject.setdefault(entry['subject'], []).append(grade)
+        self.sorted_grades = {subject: sorted(grades) for subject, grades in grades_by_subject.items()}
+        self.averages = {name: sum(self.grades[row] for row in rows) / len(rows)
+                         for name, rows in self.rows_by_student.items()}
+
+    def __contains__(self, name):
+        return name in self.rows_by_student
+
+    def rank(self, subject, grade):
+        """
+        Ranks a grade within a subject: 1 plus the number of higher grades, so ties share a rank.
+
+        Args:
+            subject (str): The subject.
+            grade (int): The grade.
+
+        Returns:
+            int: The rank, where 1 is the best.
+
+        Raises:
+            KeyError: If there are no grades for the subject.
+        """
+        grades = self.sorted_grades[subject]
+        return len(grades) - bisect_right(grades, grade) + 1
+
+    def percentile(self, subject, grade):
+        """
+        Finds the percentile rank of a grade within a subject.
+
+        Args:
+            subject (str): The subject.
+            grade (int): The grade.
+
+        Returns:
+            float: The percentage of the subject's grades that are lower, counting equal grades
+                   as half lower, from 0 to 100.
+
+        Raises:
+            KeyError: If there are no grades for the subject.
+        """
+        grades = self.sorted_grades[subject]
+        below = bisect_left(grades, grade)
+        equal = bisect_right(grades, grade) - below
+        return 100 * (below + equal / 2) / len(grades)
+
+    def average(self, name):
+        """
+        Returns a student's average grade over all of their records.
+
+        Raises:
+            KeyError: If the student has no records.
+        """
+        return self.averages[name]
+
+    def transcript(self, name):
+        """
+        Lists a student's grades, with their rank and percentile in each subject.
+
+        Args:
+            name (str): The student's name.
+
+        Returns:
+            list[dict]: One dictionary per record of the student, in file order, with the
+                        'subject', 'grade', 'rank' and 'percentile'.
+
+        Raises:
+            KeyError: If the student has no records.
+        """
+        transcript = []
+        for row in self.rows_by_student[name]:
+            subject, grade = self.data[row]['subject'], self.grades[row]
+            transcript.append({'subject': subject, 'grade': grade, 'rank': self.rank(subject, grade),
+                               'percentile': self.percentile(subject, grade)})
+        return transcript
+
+
 def main():
     """
     Main function to orchestrate the program.
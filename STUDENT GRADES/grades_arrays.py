@@ -0,0 +1,183 @@
+"""
+An optional NumPy backend for the grade aggregates in grades_analysis.
+
+The records are loaded once into columns: the grades as an int16 array, and the student and
+subject columns factorised into integer codes plus a table of the distinct values, in order of
+first appearance. The aggregates are then computed with vectorized NumPy operations instead of
+Python loops, and return the same results as the functions in grades_analysis. A grade that is not
+a whole number, or does not fit in int16, is stored as UNPARSED_GRADE: it is counted as invalid by
+count_students_in_grade_ranges and left out of the averages and the highest grades.
+
+NumPy is only needed by this module; grades_analysis works without it.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only where NumPy is missing
+    np = None
+
+from grades_analysis import GRADE_BOUNDARIES, grade_range_counts, grade_range_table
+
+# The smallest int16, kept for grades that cannot be stored; parse_grade never returns it for a real grade
+UNPARSED_GRADE = -32768
+
+
+
+def _require_numpy():
+    """
+    Raises an ImportError explaining that NumPy is needed.
+    """
+    if np is None:
+        raise ImportError("The array backend needs NumPy; install it with 'pip install numpy'.")
+
+
+def parse_grade(value):
+    """
+    Converts a grade to an integer that fits in an int16 column.
+
+    Args:
+        value (str): The grade as read from the file.
+
+    Returns:
+        int: The grade, or UNPARSED_GRADE if it is not a whole number from -32767 to 32767.
+    """
+    try:
+        grade = int(value)
+    except ValueError:
+        return UNPARSED_GRADE
+    return grade if -32767 <= grade <= 32767 else UNPARSED_GRADE
+
+
+def factorize(values):
+    """
+    Encodes values as integer codes into a table of their distinct values.
+
+    Codes are assigned in order of first appearance, so iterating over the table visits the
+    values in the same order as a dictionary filled row by row.
+
+    Args:
+        values (sequence): The values to encode (e.g., subject names).
+
+    Returns:
+        tuple: (codes, uniques), where codes is an int32 array with one code per value and
+               uniques is a list of the distinct values.
+    """
+    _require_numpy()
+    uniques, first_rows, inverse = np.unique(np.asarray(values), return_index=True, return_inverse=True)
+    # np.unique sorts the values; renumber them by the row they first appear in
+    order = np.argsort(first_rows)
+    renumber = np.empty(len(order), dtype=np.int32)
+    renumber[order] = np.arange(len(order), dtype=np.int32)
+    return renumber[inverse.ravel()], uniques[order].tolist()
+
+
+class GradeArrays:
+    """
+    Grade records stored as columns, with vectorized versions of the grade aggregates.
+    """
+
+    def __init__(self, grades, subject_codes, subjects, name_codes, names):
+        """
+        Wraps columns that are already encoded.
+
+        Args:
+            grades (array-like): The grade of each row, stored as int16, with UNPARSED_GRADE for
+                                 grades that could not be read.
+            subject_codes (array-like): The code of each row's subject in subjects.
+            subjects (list[str]): The distinct subjects, in order of first appearance.
+            name_codes (array-like): The code of each row's student in names.
+            names (list[str]): The distinct student names.
+        """
+        _require_numpy()
+        self.grades = np.asarray(grades, dtype=np.int16)
+        self.subject_codes = np.asarray(subject_codes, dtype=np.int32)
+        self.subjects = list(subjects)
+        self.name_codes = np.asarray(name_codes, dtype=np.int32)
+        self.names = list(names)
+
+    @classmethod
+    def from_records(cls, data):
+        """
+        Loads the output of read_file into columns.
+
+        Args:
+            data (list[dict]): A list of dictionaries where each dictionary contains
+                               information about a student's grade in a subject.
+
+        Returns:
+            GradeArrays: The records as columns.
+        """
+        _require_numpy()
+        grades = np.fromiter((parse_grade(entry['grade']) for entry in data), dtype=np.int16, count=len(data))
+        subject_codes, subjects = factorize([entry['subject'] for entry in data])
+        name_codes, names = factorize([entry['name'] for entry in data])
+        return cls(grades, subject_codes, subjects, name_codes, names)
+
+    def __len__(self):
+        return len(self.grades)
+
+    def calculate_subject_averages(self):
+        """
+        Calculates the average grade for each subject, like calculate_subject_averages.
+
+        Rows whose grade could not be read are left out.
+
+        Returns:
+            dict: A dictionary where the keys are subject names, and the values
+                  are the average grades for those subjects.
+        """
+        # Whole-number sums are exact in float64, so the averages equal sum(grades) / len(grades)
+        parsed = self.grades != UNPARSED_GRADE
+        subject_codes, grades = self.subject_codes[parsed], self.grades[parsed]
+        sums = np.bincount(subject_codes, weights=grades, minlength=len(self.subjects))
+        counts = np.bincount(subject_codes, minlength=len(self.subjects))
+        return {subject: float(total) / int(count)
+                for subject, total, count in zip(self.subjects, sums, counts) if count}
+
+    def count_students_in_grade_ranges(self, boundaries=GRADE_BOUNDARIES, labels=None):
+        """
+        Counts the rows in each grade range, like count_students_in_grade_ranges.
+
+        Args:
+            boundaries (sequence[int]): The lowest grade of each range after the first (see
+                                        grade_range_table).
+            labels (sequence[str]): The name of each range, lowest range first.
+
+        Returns:
+            dict: A dictionary where the keys are grade ranges (e.g., "90-100"), highest range
+                  first, followed by "invalid", and the values are the number of students in
+                  each range.
+        """
+        table, labels = grade_range_table(boundaries, labels)
+        counts = [0] * len(labels)
+        invalid = 0
+        if len(self):
+            # Count each distinct grade in one pass, then place the few distinct grades in their ranges
+            lowest = int(self.grades.min())
+            grade_counts = np.bincount(self.grades.astype(np.int32) - lowest).tolist()
+            for grade, count in enumerate(grade_counts, start=lowest):
+                if 0 <= grade <= 100:
+                    counts[table[grade]] += count
+                else:
+                    invalid += count
+        return grade_range_counts(counts, labels, invalid)
+
+    def highest_grade_per_subject(self):
+        """
+        Finds the student with the highest grade in each subject, like highest_grade_per_subject.
+
+        The first row with the highest grade wins a tie. Rows whose grade could not be read are
+        left out.
+
+        Returns:
+            dict: A dictionary where the keys are subject names, and the values
+                  are dictionaries containing the student's name and their grade.
+        """
+        best = np.full(len(self.subjects), np.iinfo(np.int16).min, dtype=np.int16)
+        np.maximum.at(best, self.subject_codes, self.grades)
+        # The rows holding their subject's best grade; np.unique keeps the first of them for each subject
+        rows = np.flatnonzero((self.grades == best[self.subject_codes]) & (self.grades != UNPARSED_GRADE))
+        codes, firsts = np.unique(self.subject_codes[rows], return_index=True)
+        rows = rows[firsts]
+        return {self.subjects[code]: {'name': self.names[name], 'grade': int(grade)}
+                for code, name, grade in zip(codes.tolist(), self.name_codes[rows].tolist(),
+                                             self.grades[rows].tolist())}
@@ -0,0 +1,202 @@
+"""
+Parallel ingestion of many grade files, such as one file per school.
+
+Each file is parsed in a worker process and reduced to a GradeSummary: per-subject sums and
+counts, a histogram of the grades and each subject's best student. Only these summaries are sent
+back, never the rows. They are merged in sorted file order, so the results match running the
+single-file functions on the files joined in that order.
+"""
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from grades_analysis import GRADE_BOUNDARIES, grade_range_counts, grade_range_table, iter_records
+
+
+class GradeSummary:
+    """
+    Mergeable partial aggregates of grade records.
+    """
+
+    def __init__(self):
+        """
+        Creates the summary of no records.
+        """
+        self.sums = {}
+        self.counts = {}
+        self.histogram = [0] * 101
+        self.invalid = 0
+        self.highest = {}
+
+    def update(self, data):
+        """
+        Adds every record of an iterable.
+
+        A grade that is not a whole number is counted as invalid and otherwise skipped, as
+        GradeStatistics.update does, so one bad row does not abort a whole ingestion.
+
+        Args:
+            data (iterable[dict]): Records with 'name', 'subject' and 'grade' fields.
+
+        Returns:
+            GradeSummary: self.
+        """
+        sums, counts, histogram, highest = self.sums, self.counts, self.histogram, self.highest
+        for entry in data:
+            try:
+                grade = int(entry['grade'])
+            except ValueError:
+                self.invalid += 1
+                continue
+            subject = entry['subject']
+            sums[subject] = sums.get(subject, 0) + grade
+            counts[subject] = counts.get(subject, 0) + 1
+            if 0 <= grade <= 100:
+                histogram[grade] += 1
+            else:
+                self.invalid += 1
+            best = highest.get(subject)
+            if best is None or grade > best['grade']:
+                highest[subject] = {'name': entry['name'], 'grade': grade}
+        return self
+
+    def merge(self, other):
+        """
+        Folds in the summary of the records that follow these ones.
+
+        Args:
+            other (GradeSummary): The summary to add.
+
+        Returns:
+            GradeSummary: self.
+        """
+        for subject, total in other.sums.items():
+            self.sums[subject] = self.sums.get(subject, 0) + total
+            self.counts[subject] = self.counts.get(subject, 0) + other.counts[subject]
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+        self.invalid += other.invalid
+        # Ties keep the earlier record, as highest_grade_per_subject does
+        for subject, best in other.highest.items():
+            if subject not in self.highest or best['grade'] > self.highest[subject]['grade']:
+                self.highest[subject] = best
+        return self
+
+    def calculate_subject_averages(self):
+        """
+        Calculates the average grade for each subject, like calculate_subject_averages.
+
+        Returns:
+            dict: A dictionary where the keys are subject names, and the values
+                  are the average grades for those subjects.
+        """
+        return {subject: total / self.counts[subject] for subject, total in self.sums.items()}
+
+    def count_students_in_grade_ranges(self, boundaries=GRADE_BOUNDARIES, labels=None):
+        """
+        Counts the records in each grade range, like count_students_in_grade_ranges.
+
+        Args:
+            boundaries (sequence[int]): The lowest grade of each range after the first (see
+                                        grade_range_table).
+            labels (sequence[str]): The name of each range, lowest range first.
+
+        Returns:
+            dict: A dictionary where the keys are grade ranges (e.g., "90-100"), highest range
+                  first, followed by "invalid", and the values are the number of students in
+                  each range.
+        """
+        table, labels = grade_range_table(boundaries, labels)
+        counts = [0] * len(labels)
+        for grade, count in enumerate(self.histogram):
+            counts[table[grade]] += count
+        return grade_range_counts(counts, labels, self.invalid)
+
+    def highest_grade_per_subject(self):
+        """
+        Finds the student with the highest grade in each subject, like highest_grade_per_subject.
+
+        Returns:
+            dict: A dictionary where the keys are subject names, and the values
+                  are dictionaries containing the student's name and their grade.
+        """
+        return self.highest
+
+
+def grade_files(source):
+    """
+    Lists the grade files to ingest, in sorted order.
+
+    Args:
+        source (str): A directory, whose .txt files are ingested, or a glob pattern.
+
+    Returns:
+        list[str]: The file names.
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, '*.txt')
+    return sorted(glob.glob(source))
+
+
+def summarize_file(file_name):
+    """
+    Parses one grade file and reduces it to its GradeSummary.
+
+    Args:
+        file_name (str): The name of the file.
+
+    Returns:
+        GradeSummary: The summary of the file's records.
+    """
+    return GradeSummary().update(iter_records(file_name))
+
+
+def ingest(source, workers=None):
+    """
+    Summarizes every grade file of a directory or glob pattern with a pool of worker processes.
+
+    Args:
+        source (str): A directory, whose .txt files are ingested, or a glob pattern.
+        workers (int): The number of worker processes (the number of CPUs by default).
+                       With 1, the files are summarized in this process.
+
+    Returns:
+        GradeSummary: The merged summary of all the files.
+    """
+    files = grade_files(source)
+    workers = workers or os.cpu_count() or 1
+    summary = GradeSummary()
+    if workers == 1:
+        for file_name in files:
+            summary.merge(summarize_file(file_name))
+        return summary
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() returns the summaries in file order, which merge() relies on
+        for partial in pool.map(summarize_file, files, chunksize=max(len(files) // (workers * 4), 1)):
+            summary.merge(partial)
+    return summary
+
+
+def main():
+    """
+    Summarizes the grade files given on the command line and prints the results.
+
+    The first argument is a directory or glob pattern (the current directory by default), and
+    the optional second argument is the number of worker processes.
+    """
+    source = sys.argv[1] if len(sys.argv) > 1 else '.'
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    summary = ingest(source, workers)
+
+    # Exit if no records were read
+    if not summary.counts:
+        return
+
+    print("Average grades by subject:", summary.calculate_subject_averages())
+    print("Number of students in each grade range:", summary.count_students_in_grade_ranges())
+    print("Highest grade per subject:", summary.highest_grade_per_subject())
+
+
+# Entry point for the program
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
+import random
+import statistics
 import unittest
 from unittest.mock import mock_open, patch
 from grades_analysis import (
-    read_file, calculate_subject_averages, find_top_students,
-    count_students_in_grade_ranges, highest_grade_per_subject
+    read_file, iter_records, calculate_subject_averages, find_top_students,
+    count_students_in_grade_ranges, highest_grade_per_subject, grade_range_table,
+    SubjectStatistics, GradeStatistics, GradeBook
 )
 
 
@@ -70,6 +73,49 @@ class TestStudentGrades(unittest.TestCase):
         self.assertEqual(grade_ranges["60-69"], 0)  # No students in this range
         self.assertEqual(grade_ranges["0-59"], 0)  # No students in this range
 
+    def test_grade_range_schemes(self):
+        """
+        Test counting grades with the default ranges and with a plus/minus letter scheme.
+        """
+        data = [{"grade": grade} for grade in ["100", "93", "90", "89", "60", "59", "0"]]
+        self.assertEqual(list(count_students_in_grade_ranges(data).items()),
+                         [("90-100", 3), ("80-89", 1), ("70-79", 0), ("60-69", 1), ("0-59", 2), ("invalid", 0)])
+
+        letters = ["F", "D-", "D", "D+", "C-", "C", "C+", "B-", "B", "B+", "A-", "A"]
+        boundaries = [60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93]
+        grade_ranges = count_students_in_grade_ranges(data, boundaries, letters)
+        self.assertEqual(list(grade_ranges), letters[::-1] + ["invalid"])
+        self.assertEqual(grade_ranges["A"], 2)
+        self.assertEqual(grade_ranges["A-"], 1)
+        self.assertEqual(grade_ranges["B+"], 1)
+        self.assertEqual(grade_ranges["D-"], 1)
+        self.assertEqual(grade_ranges["F"], 2)
+
+    def test_invalid_grades(self):
+        """
+        Test that grades that are not whole numbers from 0 to 100 are counted separately.
+        """
+        data = [{"grade": grade} for grade in ["101", "-1", "abc", "", "75"]]
+        grade_ranges = count_students_in_grade_ranges(data)
+        self.assertEqual(grade_ranges["invalid"], 4)
+        self.assertEqual(grade_ranges["0-59"], 0)
+        self.assertEqual(grade_ranges["70-79"], 1)
+
+    def test_grade_range_table(self):
+        """
+        Test the grade lookup table and the validation of grading schemes.
+        """
+        table, labels = grade_range_table([50])
+        self.assertEqual(labels, ["0-49", "50-100"])
+        self.assertEqual((len(table), table[49], table[50]), (101, 0, 1))
+        for boundaries in ([0], [101], [70, 60], [60, 60]):
+            with self.assertRaises(ValueError):
+                grade_range_table(boundaries)
+        with self.assertRaises(ValueError):
+            grade_range_table([50], ["Fail"])
+        with self.assertRaises(ValueError):
+            grade_range_table([50], ["Fail", "Fail"])
+
     def test_highest_grade_per_subject(self):
         """
         Test finding the student with the highest grade in each subject.
@@ -81,5 +127,124 @@ class TestStudentGrades(unittest.TestCase):
         self.assertEqual(highest_grades["Science"]["grade"], 90)  # Alice's grade is 90
 
 
+class TestGradeStatistics(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up random grades for a few subjects.
+        """
+        rng = random.Random(0)
+        self.data = [{"name": f"Student {index}", "subject": rng.choice(["Math", "Science", "Art"]),
+                      "grade": str(rng.randint(0, 100))} for index in range(1001)]
+
+    def assertMatchesStatistics(self, subject_statistics, grades):
+        """
+        Checks streaming statistics against the statistics module.
+        """
+        deciles = statistics.quantiles(grades, n=10, method="inclusive")
+        self.assertEqual(subject_statistics.count, len(grades))
+        self.assertAlmostEqual(subject_statistics.mean, statistics.fmean(grades))
+        self.assertAlmostEqual(subject_statistics.stdev(), statistics.pstdev(grades))
+        self.assertEqual(subject_statistics.median(), statistics.median(grades))
+        self.assertAlmostEqual(subject_statistics.quantile(0.1), deciles[0])
+        self.assertAlmostEqual(subject_statistics.quantile(0.9), deciles[8])
+
+    def test_matches_statistics_module(self):
+        """
+        Test every subject's streaming statistics against exact ones.
+        """
+        grade_statistics = GradeStatistics().update(iter(self.data))
+        self.assertEqual(list(grade_statistics.subjects), list(calculate_subject_averages(self.data)))
+        for subject, subject_statistics in grade_statistics.subjects.items():
+            grades = [int(entry["grade"]) for entry in self.data if entry["subject"] == subject]
+            self.assertMatchesStatistics(subject_statistics, grades)
+            self.assertAlmostEqual(subject_statistics.mean, calculate_subject_averages(self.data)[subject])
+
+    def test_merge(self):
+        """
+        Test that merging the statistics of chunks equals a single pass.
+        """
+        merged = GradeStatistics()
+        for start in range(0, len(self.data), 300):
+            merged.merge(GradeStatistics().update(self.data[start:start + 300]))
+        merged.merge(GradeStatistics())
+        single = GradeStatistics().update(self.data)
+        self.assertEqual(list(merged.subjects), list(single.subjects))
+        for subject, subject_statistics in merged.subjects.items():
+            self.assertEqual(subject_statistics.histogram, single.subjects[subject].histogram)
+            self.assertMatchesStatistics(subject_statistics, [int(entry["grade"]) for entry in self.data
+                                                              if entry["subject"] == subject])
+
+    def test_edge_cases(self):
+        """
+        Test a single grade, no grades and invalid grades.
+        """
+        one = SubjectStatistics()
+        one.add(80)
+        self.assertEqual((one.median(), one.quantile(0.9), one.stdev()), (80, 80, 0.0))
+        with self.assertRaises(ValueError):
+            SubjectStatistics().median()
+        with self.assertRaises(ValueError):
+            one.add(101)
+        with self.assertRaises(ValueError):
+            one.quantile(1.5)
+        records = [{"subject": "Math", "grade": grade} for grade in ["x", "-3", "70"]]
+        grade_statistics = GradeStatistics().update(records)
+        self.assertEqual(grade_statistics.invalid, 2)
+        self.assertEqual(grade_statistics.summary()["Math"]["count"], 1)
+
+    def test_iter_records(self):
+        """
+        Test reading records one at a time.
+        """
+        with patch("builtins.open", mock_open(read_data="name,subject,grade\nAlice,Math,95\nBob,Math,85\n")):
+            self.assertEqual(list(iter_records("mock_grades.txt")), read_file("mock_grades.txt"))
+
+
+class TestGradeBook(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a grade book with tied grades.
+        """
+        self.data = [
+            {"name": "Alice", "subject": "Math", "grade": "95"},
+            {"name": "Bob", "subject": "Math", "grade": "85"},
+            {"name": "Charlie", "subject": "Science", "grade": "75"},
+            {"name": "Alice", "subject": "Science", "grade": "90"},
+            {"name": "Dana", "subject": "Math", "grade": "85"},
+            {"name": "Eve", "subject": "Math", "grade": "60"},
+        ]
+        self.book = GradeBook(self.data)
+
+    def test_transcript(self):
+        """
+        Test a student's transcript, with ranks and percentiles.
+        """
+        self.assertEqual(self.book.transcript("Alice"), [
+            {"subject": "Math", "grade": 95, "rank": 1, "percentile": 87.5},
+            {"subject": "Science", "grade": 90, "rank": 1, "percentile": 75.0},
+        ])
+        self.assertEqual(self.book.average("Alice"), 92.5)
+        with self.assertRaises(KeyError):
+            self.book.transcript("Zed")
+
+    def test_rank_and_percentile(self):
+        """
+        Test that tied grades share a rank, and agree with a scan of the records.
+        """
+        self.assertEqual(self.book.rank("Math", 85), 2)
+        self.assertEqual(self.book.rank("Math", 60), 4)
+        self.assertEqual(self.book.rank("Math", 100), 1)
+        self.assertEqual(self.book.percentile("Math", 85), 50.0)
+        self.assertEqual(self.book.percentile("Math", 0), 0.0)
+        for entry in self.data:
+            grades = [int(other["grade"]) for other in self.data if other["subject"] == entry["subject"]]
+            grade = int(entry["grade"])
+            self.assertEqual(self.book.rank(entry["subject"], grade), 1 + sum(other > grade for other in grades))
+        self.assertIn("Eve", self.book)
+        self.assertEqual(self.book.average("Bob"), 85)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
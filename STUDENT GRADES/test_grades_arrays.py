@@ -0,0 +1,82 @@
+import random
+import unittest
+from grades_analysis import calculate_subject_averages, count_students_in_grade_ranges, highest_grade_per_subject
+from grades_arrays import np, GradeArrays, factorize
+
+
+@unittest.skipUnless(np is not None, "NumPy is not installed")
+class TestGradeArrays(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up the mock data of the grade analysis tests and a larger random dataset.
+        """
+        self.data = [
+            {"name": "Alice", "subject": "Math", "grade": "95"},
+            {"name": "Bob", "subject": "Math", "grade": "85"},
+            {"name": "Charlie", "subject": "Science", "grade": "75"},
+            {"name": "Alice", "subject": "Science", "grade": "90"},
+        ]
+        rng = random.Random(0)
+        self.random_data = [{"name": f"Student {rng.randint(1, 300)}",
+                             "subject": rng.choice(["Math", "Science", "Art", "History", "Music"]),
+                             "grade": str(rng.choice([rng.randint(0, 100), rng.randint(-5, 110)]))}
+                            for _ in range(5000)]
+
+    def test_factorize_keeps_first_appearance_order(self):
+        """
+        Test that codes follow the order in which values first appear.
+        """
+        codes, uniques = factorize(["Science", "Math", "Science", "Art"])
+        self.assertEqual(uniques, ["Science", "Math", "Art"])
+        self.assertEqual(codes.tolist(), [0, 1, 0, 2])
+
+    def test_matches_grades_analysis(self):
+        """
+        Test that every aggregate matches the loop-based functions, including key order and ties.
+        """
+        for data in (self.data, self.random_data):
+            arrays = GradeArrays.from_records(data)
+            self.assertEqual(list(arrays.calculate_subject_averages().items()),
+                             list(calculate_subject_averages(data).items()))
+            self.assertEqual(list(arrays.count_students_in_grade_ranges().items()),
+                             list(count_students_in_grade_ranges(data).items()))
+            self.assertEqual(list(arrays.highest_grade_per_subject().items()),
+                             list(highest_grade_per_subject(data).items()))
+
+    def test_unparsed_grades_are_invalid(self):
+        """
+        Test that grades that are not whole numbers or do not fit in int16 count as invalid and are
+        left out of the other aggregates.
+        """
+        bad_rows = [{"name": "Dave", "subject": "Math", "grade": grade}
+                    for grade in ["abc", "40000", "-40000", "", "9.5"]]
+        data = self.data + bad_rows + [{"name": "Eve", "subject": "Art", "grade": "x"}]
+        arrays = GradeArrays.from_records(data)
+        self.assertEqual(list(arrays.count_students_in_grade_ranges().items()),
+                         list(count_students_in_grade_ranges(data).items()))
+        self.assertEqual(arrays.count_students_in_grade_ranges()["invalid"], 6)
+        self.assertEqual(arrays.calculate_subject_averages(), calculate_subject_averages(self.data))
+        self.assertEqual(arrays.highest_grade_per_subject(), highest_grade_per_subject(self.data))
+
+    def test_custom_grade_ranges(self):
+        """
+        Test a custom grading scheme against the loop-based function.
+        """
+        arrays = GradeArrays.from_records(self.random_data)
+        boundaries, labels = [50, 65, 80, 95], ["E", "D", "C", "B", "A"]
+        self.assertEqual(list(arrays.count_students_in_grade_ranges(boundaries, labels).items()),
+                         list(count_students_in_grade_ranges(self.random_data, boundaries, labels).items()))
+
+    def test_empty(self):
+        """
+        Test the aggregates of no records.
+        """
+        arrays = GradeArrays.from_records([])
+        self.assertEqual(arrays.calculate_subject_averages(), {})
+        self.assertEqual(arrays.highest_grade_per_subject(), {})
+        self.assertEqual(sum(arrays.count_students_in_grade_ranges().values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+from grades_analysis import (
+    read_file, calculate_subject_averages, count_students_in_grade_ranges, highest_grade_per_subject
+)
+from grades_ingest import GradeSummary, grade_files, ingest
+
+
+class TestGradesIngest(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Write a directory of grade files, one per school, with tied and out-of-range grades.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        rng = random.Random(0)
+        for school in range(6):
+            with open(os.path.join(self.directory, f"school{school:02}.txt"), "w") as file:
+                file.write("name,subject,grade\n")
+                for index in range(rng.randint(0, 40)):
+                    subject = rng.choice(["Math", "Science", "Art", f"Elective {school}"])
+                    file.write(f"Student {school}-{index},{subject},{rng.choice([rng.randint(0, 100), 100, 105])}\n")
+        with open(os.path.join(self.directory, "notes.md"), "w") as file:
+            file.write("Not a grade file\n")
+        self.data = [entry for file_name in grade_files(self.directory) for entry in read_file(file_name)]
+
+    def assertMatchesFunctions(self, summary):
+        """
+        Checks a summary against the single-file functions on the joined records.
+        """
+        self.assertEqual(list(summary.calculate_subject_averages().items()),
+                         list(calculate_subject_averages(self.data).items()))
+        self.assertEqual(list(summary.count_students_in_grade_ranges().items()),
+                         list(count_students_in_grade_ranges(self.data).items()))
+        self.assertEqual(summary.count_students_in_grade_ranges([50, 75], ["C", "B", "A"]),
+                         count_students_in_grade_ranges(self.data, [50, 75], ["C", "B", "A"]))
+        self.assertEqual(list(summary.highest_grade_per_subject().items()),
+                         list(highest_grade_per_subject(self.data).items()))
+
+    def test_grade_files(self):
+        """
+        Test listing the files of a directory or a glob pattern, in sorted order.
+        """
+        files = grade_files(self.directory)
+        self.assertEqual([os.path.basename(name) for name in files], [f"school{school:02}.txt" for school in range(6)])
+        self.assertEqual(grade_files(os.path.join(self.directory, "school0[12].txt")), files[1:3])
+
+    def test_ingest_matches_single_file_functions(self):
+        """
+        Test that the merged summaries match the single-file functions, in and out of process.
+        """
+        self.assertMatchesFunctions(ingest(self.directory, workers=1))
+        self.assertMatchesFunctions(ingest(self.directory, workers=2))
+
+    def test_empty(self):
+        """
+        Test ingesting no files.
+        """
+        summary = ingest(os.path.join(self.directory, "*.csv"), workers=2)
+        self.assertEqual(summary.calculate_subject_averages(), {})
+        self.assertEqual(summary.merge(GradeSummary()).highest_grade_per_subject(), {})
+
+    def test_non_numeric_grades_are_invalid(self):
+        """
+        Test that a non-numeric grade is counted as invalid instead of aborting the ingestion.
+        """
+        with open(os.path.join(self.directory, "school99.txt"), "w") as file:
+            file.write("name,subject,grade\nAda,Math,absent\nBo,Math,80\n")
+        expected = ingest(self.directory, workers=1)
+        summary = ingest(self.directory, workers=2)
+        self.assertEqual(summary.count_students_in_grade_ranges(), expected.count_students_in_grade_ranges())
+        self.assertEqual(summary.count_students_in_grade_ranges(),
+                         count_students_in_grade_ranges(self.data + read_file(os.path.join(self.directory, "school99.txt"))))
+        self.assertEqual(GradeSummary().update(read_file(os.path.join(self.directory, "school99.txt"))).sums,
+                         {"Math": 80})
+
+
+if __name__ == '__main__':
+    unittest.main()